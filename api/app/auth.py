@@ -4,8 +4,10 @@ from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from app.database import get_db, get_async_db
 from app.models.user import User
 from app.models.team import Team, TeamMember, TeamMemberRole
 from app.models.project import Project
@@ -46,36 +48,68 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login", auto_error=False)
 
 
 class TokenData(BaseModel):
     user_id: Optional[str] = None
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-):
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _user_id_from_token(token: str) -> uuid.UUID:
     try:
         payload = jwt.decode(token, NEXTAUTH_SECRET, algorithms=[ALGORITHM])
         user_id_str: str = payload.get("sub")
         if user_id_str is None:
-            raise credentials_exception
+            raise _credentials_exception()
         token_data = TokenData(user_id=user_id_str)
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    return uuid.UUID(token_data.user_id)
 
-    user_id_as_uuid = uuid.UUID(token_data.user_id)
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+):
+    user_id_as_uuid = _user_id_from_token(token)
     user = db.query(User).filter(User.id == user_id_as_uuid).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
 
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+):
+    """Async variant of get_current_user for endpoints running on the event loop."""
+    user_id_as_uuid = _user_id_from_token(token)
+    result = await db.execute(
+        select(User)
+        .options(selectinload(User.roles_association))
+        .where(User.id == user_id_as_uuid)
+    )
+    user = result.scalar_one_or_none()
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+def get_optional_user_id(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+) -> Optional[uuid.UUID]:
+    """User id from the bearer token, None without one. Does not hit the database."""
+    if not token:
+        return None
+    return _user_id_from_token(token)
+
+
 def get_current_user_or_admin_for_profile_update(
     user_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
@@ -0,0 +1,328 @@
+"""
+Live leaderboard / vote-tally push (GET /live/hackathons/{id}/events and the
+matching WebSocket), with one channel per hackathon.
+
+Writers never talk to subscribers directly. Score and vote writes queue a
+pg_notify on NOTIFY_CHANNEL in their own transaction (notify()), so the change
+is announced exactly when it commits and reaches every API worker. Each worker
+keeps one connection LISTENing (Broadcaster.listen) and merges the announced
+values (absolute, per project) into the channels that have local subscribers.
+
+Broadcaster.run ticks LIVE_UPDATES_PER_SECOND times a second. A channel with
+changes gets one "update" message per tick, serialized once and appended to a
+short shared history; subscribers only hold a sequence number into it, so the
+cost of a tick does not grow with the number of viewers. A subscriber that fell
+further behind than the history gets the channel's full state ("snapshot")
+instead, which is also what every new subscriber starts with. The state is
+loaded from the database when the first local subscriber of a hackathon joins
+and dropped when the last one leaves.
+"""
+
+import asyncio
+import json
+import os
+import uuid
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from app.database import AsyncSessionLocal, async_engine
+from app.logger import get_logger
+from app.models.hackathon import Hackathon
+from app.models.judging import LeaderboardEntry, VoteTally
+
+logger = get_logger("broadcast")
+
+NOTIFY_CHANNEL = "hackathon_live"
+LIVE_UPDATES_PER_SECOND = float(os.getenv("LIVE_UPDATES_PER_SECOND", "2"))
+LIVE_HISTORY = int(os.getenv("LIVE_HISTORY", "64"))
+LIVE_HEARTBEAT_S = float(os.getenv("LIVE_HEARTBEAT_S", "15"))
+# pg_notify payloads must stay below 8000 bytes
+NOTIFY_MAX_BYTES = 7500
+
+LEADERBOARD = "leaderboard"
+VOTES = "votes"
+RELOAD = "reload"  # the whole state changed, e.g. after a leaderboard rebuild
+KINDS = (LEADERBOARD, VOTES)
+
+State = Dict[str, Dict[str, object]]  # kind -> project id -> value
+StateLoader = Callable[[uuid.UUID], Awaitable[Optional[State]]]
+
+
+def _dumps(message: dict) -> str:
+    return json.dumps(message, separators=(",", ":"), default=str)
+
+
+def leaderboard_value(weighted_average, score_count) -> dict:
+    """A project's live leaderboard entry."""
+    if weighted_average is not None:
+        weighted_average = float(weighted_average)
+    return {"weighted_average": weighted_average, "score_count": score_count}
+
+
+def notify(hackathon_id, kind: str, values: Optional[dict] = None) -> list:
+    """
+    pg_notify statements announcing new absolute values (project id -> value) of
+    one kind. Execute them in the transaction that wrote the values.
+    """
+    values = {str(k): v for k, v in (values or {}).items()}
+    payloads, chunk = [], {}
+    for key, value in values.items():
+        chunk[key] = value
+        if len(_dumps(chunk)) > NOTIFY_MAX_BYTES and len(chunk) > 1:
+            del chunk[key]
+            payloads.append(chunk)
+            chunk = {key: value}
+    if chunk or not values:
+        payloads.append(chunk)
+    return [
+        select(
+            func.pg_notify(
+                NOTIFY_CHANNEL, _dumps({"h": str(hackathon_id), "k": kind, "v": p})
+            )
+        )
+        for p in payloads
+    ]
+
+
+class Channel:
+    def __init__(self):
+        self.state: State = {kind: {} for kind in KINDS}
+        self.pending: State = {kind: {} for kind in KINDS}
+        self.reload = False
+        self.subscribers = 0
+        self.loaded = asyncio.Event()
+        self.seq = 0
+        self.history: Deque[Tuple[int, str]] = deque(maxlen=LIVE_HISTORY)
+        self._snapshot: Tuple[int, str] = (-1, "")
+        self._tick = asyncio.Event()
+
+    def apply(self, kind: str, values: dict) -> None:
+        self.state[kind].update(values)
+        self.pending[kind].update(values)
+
+    def snapshot(self) -> Tuple[int, str]:
+        """The full state as of the current seq, serialized once per seq."""
+        if self._snapshot[0] != self.seq:
+            message = {"type": "snapshot", "seq": self.seq, **self.state}
+            self._snapshot = (self.seq, _dumps(message))
+        return self._snapshot
+
+    def publish(self) -> bool:
+        """Turn the pending changes into one message; False if there were none."""
+        if self.reload:
+            self.reload = False
+            self.pending = {kind: {} for kind in KINDS}
+            self.seq += 1
+            self.history.append((self.seq, self.snapshot()[1]))
+        elif any(self.pending.values()):
+            changes, self.pending = self.pending, {kind: {} for kind in KINDS}
+            self.seq += 1
+            message = {"type": "update", "seq": self.seq, **changes}
+            self.history.append((self.seq, _dumps(message)))
+        else:
+            return False
+        tick, self._tick = self._tick, asyncio.Event()
+        tick.set()
+        return True
+
+    async def wait(self, after_seq: int, timeout: float) -> bool:
+        if self.seq > after_seq:
+            return True
+        try:
+            await asyncio.wait_for(self._tick.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class Subscription:
+    def __init__(self, owner: "Broadcaster", hackathon_id, channel: Channel):
+        self._broadcaster = owner
+        self._hackathon_id = hackathon_id
+        self._channel = channel
+        self._closed = False
+
+    async def messages(
+        self, heartbeat_s: float = LIVE_HEARTBEAT_S
+    ) -> AsyncIterator[Optional[str]]:
+        """Serialized messages; None after heartbeat_s without any."""
+        channel = self._channel
+        seq, message = channel.snapshot()
+        yield message
+        while True:
+            if not await channel.wait(seq, heartbeat_s):
+                yield None
+                continue
+            if not channel.history or channel.history[0][0] > seq + 1:
+                # Fell behind the shared history: start over from the full state
+                seq, message = channel.snapshot()
+                yield message
+                continue
+            for message_seq, message in list(channel.history):
+                if message_seq > seq:
+                    seq = message_seq
+                    yield message
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._broadcaster._leave(self._hackathon_id)
+
+
+async def load_hackathon_state(
+    hackathon_id: uuid.UUID, session_factory=AsyncSessionLocal
+) -> Optional[State]:
+    """Current leaderboard and vote tallies of a hackathon; None if it is unknown."""
+    async with session_factory() as db:
+        exists = await db.scalar(
+            select(Hackathon.id).where(Hackathon.id == hackathon_id)
+        )
+        if not exists:
+            return None
+        leaderboard = await db.execute(
+            select(
+                LeaderboardEntry.project_id,
+                LeaderboardEntry.weighted_average,
+                LeaderboardEntry.score_count,
+            ).where(LeaderboardEntry.hackathon_id == hackathon_id)
+        )
+        votes = await db.execute(
+            select(VoteTally.project_id, VoteTally.votes).where(
+                VoteTally.hackathon_id == hackathon_id
+            )
+        )
+        return {
+            LEADERBOARD: {
+                str(project_id): leaderboard_value(average, count)
+                for project_id, average, count in leaderboard
+            },
+            VOTES: {str(project_id): n for project_id, n in votes},
+        }
+
+
+class Broadcaster:
+    def __init__(self, loader: StateLoader = load_hackathon_state):
+        self._loader = loader
+        self._channels: Dict[str, Channel] = {}
+
+    @property
+    def subscribers(self) -> int:
+        return sum(channel.subscribers for channel in self._channels.values())
+
+    async def subscribe(self, hackathon_id) -> Subscription:
+        """Join the hackathon's channel; LookupError if the hackathon is unknown."""
+        key = str(hackathon_id)
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = self._channels[key] = Channel()
+            channel.subscribers += 1
+            try:
+                state = await self._loader(hackathon_id)
+                if state is None:
+                    raise LookupError(key)
+            except BaseException:
+                # Waiting subscribers still count on the channel: drop it anyway,
+                # so that they fail as well
+                self._channels.pop(key, None)
+                channel.loaded.set()
+                raise
+            for kind in KINDS:
+                # Announcements that arrived while loading are newer
+                channel.state[kind] = {**state.get(kind, {}), **channel.state[kind]}
+            channel.loaded.set()
+        else:
+            channel.subscribers += 1
+            await channel.loaded.wait()
+            if self._channels.get(key) is not channel:
+                # The first subscriber's load failed
+                channel.subscribers -= 1
+                raise LookupError(key)
+        return Subscription(self, key, channel)
+
+    def _leave(self, key: str) -> None:
+        channel = self._channels.get(key)
+        if channel is None:
+            return
+        channel.subscribers -= 1
+        if channel.subscribers <= 0:
+            del self._channels[key]
+
+    def receive(self, payload: str) -> None:
+        """Merge one NOTIFY payload into the local channel, if anyone listens."""
+        try:
+            message = json.loads(payload)
+            hackathon, kind, values = message["h"], message["k"], message.get("v")
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed live update: {payload[:200]}")
+            return
+        channels = (
+            list(self._channels.values())
+            if hackathon == "*"
+            else [self._channels[hackathon]]
+            if hackathon in self._channels
+            else []
+        )
+        for channel in channels:
+            if kind == RELOAD:
+                channel.reload = True
+            elif kind in KINDS:
+                channel.apply(kind, values or {})
+
+    async def tick(self) -> None:
+        for key, channel in list(self._channels.items()):
+            if channel.reload and channel.loaded.is_set():
+                try:
+                    state = await self._loader(uuid.UUID(key))
+                except Exception as e:
+                    logger.error(f"Reloading live state of {key} failed: {e}")
+                    continue
+                if state is not None:
+                    channel.state = {kind: dict(state.get(kind, {})) for kind in KINDS}
+            channel.publish()
+
+    async def run(self, rate: float = LIVE_UPDATES_PER_SECOND):
+        while True:
+            await asyncio.sleep(1 / rate)
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"Live update tick failed: {e}")
+
+    async def listen(self, retry_s: float = 5.0):
+        """LISTEN on NOTIFY_CHANNEL over a dedicated connection, reconnecting."""
+
+        def on_notify(connection, pid, channel, payload):
+            self.receive(payload)
+
+        while True:
+            try:
+                async with async_engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    listener = raw.driver_connection
+                    if listener is None:
+                        raise RuntimeError("No asyncpg connection to listen on")
+                    await listener.add_listener(NOTIFY_CHANNEL, on_notify)
+                    logger.info(f"Listening for live updates on {NOTIFY_CHANNEL}")
+                    try:
+                        # Returns when the connection is lost
+                        closed = asyncio.get_running_loop().create_future()
+
+                        def on_terminate(connection):
+                            if not closed.done():
+                                closed.set_result(None)
+
+                        listener.add_termination_listener(on_terminate)
+                        await closed
+                    finally:
+                        if not listener.is_closed():
+                            await listener.remove_listener(NOTIFY_CHANNEL, on_notify)
+            except Exception as e:
+                logger.error(f"Live update listener failed: {e}")
+            # Changes announced while disconnected are lost: resync everything
+            self.receive(_dumps({"h": "*", "k": RELOAD}))
+            await asyncio.sleep(retry_s)
+
+
+broadcaster = Broadcaster()
@@ -0,0 +1,151 @@
+"""
+Denormalized counters: teams.member_count, hackathons.registration_count and
+projects.version_seq.
+
+member_count and registration_count follow every ORM insert and delete of a
+team member / hackathon registration (registrations only while their status is
+"registered", so waitlisted ones are not counted): mapper listeners add or
+subtract one in the flush that writes the row, so the counter commits or rolls
+back with it.
+The listeners also update the parent if it is loaded in the session, so a
+response built from it shows the new value. Rows removed by ON DELETE CASCADE
+belong to a parent that is gone too; bulk statements that bypass the ORM
+are caught by reconcile_counters (scripts/reconcile_counters.py).
+
+version_seq hands out project version numbers: next_version_number increments
+it with UPDATE ... RETURNING, which locks the project row until the transaction
+ends, so concurrent uploads get distinct, gap-free numbers without reading the
+versions.
+"""
+
+import uuid
+from typing import Any, Dict, List, Tuple, Type
+
+from sqlalchemy import ColumnElement, Select, event, func, inspect, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.logger import get_logger
+from app.models.hackathon import Hackathon
+from app.models.hackathon_registration import REGISTERED, HackathonRegistration
+from app.models.project import Project, ProjectVersion
+from app.models.team import Team, TeamMember
+
+logger = get_logger("counters")
+
+
+def _bump(connection, session: Session, model, pk, column: str, delta: int):
+    table = model.__table__
+    # A counter moving is not an edit of the row: keep its version (ETag)
+    stmt = (
+        update(table)
+        .where(table.c.id == pk)
+        .values({column: table.c[column] + delta, "version": table.c.version})
+        .returning(table.c[column], table.c.updated_at)
+    )
+    row = connection.execute(stmt).first()
+    parent = session.identity_map.get(
+        inspect(model).identity_key_from_primary_key((pk,))
+    )
+    if row is not None and parent is not None:
+        set_committed_value(parent, column, row[0])
+        set_committed_value(parent, "updated_at", row[1])
+
+
+def _counted(child, parent, foreign_key: str, column: str, status=None):
+    """Count the child rows per parent; only those with this status if given."""
+
+    def counted(target) -> bool:
+        return status is None or target.status == status
+
+    def listener(delta: int):
+        def bump(mapper, connection, target):
+            if counted(target):
+                parent_id = getattr(target, foreign_key)
+                session = inspect(target).session
+                _bump(connection, session, parent, parent_id, column, delta)
+
+        return bump
+
+    def status_changed(mapper, connection, target):
+        history = inspect(target).attrs.status.history
+        if not history.deleted:
+            return
+        delta = counted(target) - (history.deleted[0] == status)
+        if delta:
+            parent_id = getattr(target, foreign_key)
+            session = inspect(target).session
+            _bump(connection, session, parent, parent_id, column, delta)
+
+    event.listen(child, "after_insert", listener(1))
+    event.listen(child, "after_delete", listener(-1))
+    if status is not None:
+        event.listen(child, "after_update", status_changed)
+
+
+_counted(TeamMember, Team, "team_id", "member_count")
+_counted(
+    HackathonRegistration,
+    Hackathon,
+    "hackathon_id",
+    "registration_count",
+    status=REGISTERED,
+)
+
+
+def next_version_number(db: Session, project_id: uuid.UUID) -> int:
+    """Allocate the project's next version number (no commit)."""
+    table = Project.__table__
+    return db.execute(
+        update(table)
+        .where(table.c.id == project_id)
+        .values(version_seq=table.c.version_seq + 1, version=table.c.version)
+        .returning(table.c.version_seq)
+    ).scalar_one()
+
+
+def reconcile_counters(db: Session) -> Dict[str, int]:
+    """
+    Recompute every counter from the rows it counts (no commit). Returns the
+    number of rows corrected per counter; anything but zero is logged, as it
+    means some write bypassed the listeners.
+    """
+    fixed = {}
+    checks: List[Tuple[Type[Any], str, Select]] = [
+        (
+            Team,
+            "member_count",
+            select(func.count()).where(TeamMember.team_id == Team.id),
+        ),
+        (
+            Hackathon,
+            "registration_count",
+            select(func.count()).where(
+                HackathonRegistration.hackathon_id == Hackathon.id,
+                HackathonRegistration.status == REGISTERED,
+            ),
+        ),
+        (
+            Project,
+            "version_seq",
+            select(func.max(ProjectVersion.version_number)).where(
+                ProjectVersion.project_id == Project.id
+            ),
+        ),
+    ]
+    for model, column, query in checks:
+        table = model.__table__
+        actual = query.correlate(table).scalar_subquery()
+        expected: ColumnElement[Any] = func.coalesce(actual, 0)
+        if column == "version_seq":
+            # Never lower it: numbers of deleted versions are not handed out again
+            expected = func.greatest(table.c.version_seq, expected)
+        result = db.execute(
+            update(table)
+            .where(table.c[column] != expected)
+            .values({column: expected, "version": table.c.version})
+        )
+        fixed[column] = result.rowcount
+        if result.rowcount:
+            logger.warning(f"Corrected {column} of {result.rowcount} row(s)")
+    return fixed
@@ -2,7 +2,15 @@ import os
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, declarative_base as sa_declarative_base
-from sqlalchemy.engine.url import URL
+from sqlalchemy.engine.url import URL, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from app.query_stats import instrument_engine
 
 # dotenv-Handling: Automatisch die richtige .env laden
 try:
@@ -27,14 +35,139 @@ if os.getenv("PYTEST_CURRENT_TEST") and os.getenv("DB_HOST") in [
         "Tests dürfen nicht gegen die Produktionsdatenbank laufen! Bitte .env.test korrekt konfigurieren."
     )
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = sa_declarative_base()
+# Pool sizing. Every uvicorn worker holds its own pool, so the worst case on the
+# Postgres side is WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections,
+# which has to stay below the server's max_connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Server-side statement timeout in milliseconds (0 = no limit)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+
+def _connect_args() -> dict:
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        return {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return {}
+
+
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    pool_pre_ping=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    connect_args=_connect_args(),
+)
+instrument_engine(engine)
+# Objects stay loaded after commit: a write returns what it wrote instead of
+# reloading every row with a SELECT per object (the former commit + refresh)
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
+
+class _FetchServerValues:
+    # INSERT/UPDATE ... RETURNING the server-generated columns (server defaults,
+    # SQL onupdate expressions such as version + 1) as part of the flush
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = sa_declarative_base(cls=_FetchServerValues)
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync Postgres URL (psycopg2 or driverless) onto the asyncpg driver."""
+    return (
+        make_url(url)
+        .set(drivername="postgresql+asyncpg")
+        .render_as_string(hide_password=False)
+    )
+
+
+def _async_connect_args() -> dict:
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        return {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+    return {}
+
+
+# Async engine for the hot read paths. It shares the pool settings with the sync
+# engine, so each worker may hold up to twice the per-worker connection budget.
+# An unset DATABASE_URL has already failed in create_engine above
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(
+    DATABASE_URL or ""
+)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_pre_ping=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    connect_args=_async_connect_args(),
+)
+instrument_engine(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+def pool_settings() -> dict:
+    """Configured pool limits, used by the admin pool statistics endpoint."""
+    # Sync and async engine each hold their own pool
+    per_worker = 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout_s": DB_POOL_TIMEOUT,
+        "pool_recycle_s": DB_POOL_RECYCLE,
+        "statement_timeout_ms": DB_STATEMENT_TIMEOUT_MS,
+        "workers": WEB_CONCURRENCY,
+        "max_connections_per_worker": per_worker,
+        "max_connections_all_workers": per_worker * WEB_CONCURRENCY,
+    }
+
+
+class LazySession:
+    """
+    Session proxy that only creates the underlying Session on first use.
+    Routes that depend on get_db but never touch the database therefore never
+    build a Session nor check a connection out of the pool.
+    """
+
+    def __init__(self, factory=SessionLocal):
+        self._factory = factory
+        self._session = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name):
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
 
 def get_db():
-    db = SessionLocal()
+    db = LazySession(SessionLocal)
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """AsyncSession dependency for endpoints ported to native async."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,249 @@
+"""
+Read-replica routing for the async read paths.
+
+Replica engines are configured via DATABASE_REPLICA_URLS (comma separated). Read
+endpoints depend on get_async_read_db, which hands out a session on a healthy
+replica and falls back to the primary when
+
+  * no replica is configured or every replica lags more than REPLICA_MAX_LAG_S,
+  * the calling user wrote something within READ_YOUR_WRITES_WINDOW_S.
+
+The "recently wrote" state is kept per worker (RecentWriters) and additionally
+sent to the client as the DB_PIN_COOKIE cookie, so a follow-up read that lands on
+another worker is pinned to the primary as well.
+"""
+
+import asyncio
+import itertools
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from jose import JWTError, jwt
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.database import (
+    AsyncSessionLocal,
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    async_database_url,
+)
+from app.logger import get_logger
+from app.pool_metrics import InstrumentedAsyncQueuePool, pool_stats
+from app.query_stats import instrument_engine
+
+logger = get_logger("db_routing")
+
+REPLICA_URLS = [
+    url.strip()
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+REPLICA_MAX_LAG_S = float(os.getenv("REPLICA_MAX_LAG_S", "5"))
+REPLICA_LAG_CHECK_INTERVAL_S = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL_S", "2"))
+READ_YOUR_WRITES_WINDOW_S = float(os.getenv("READ_YOUR_WRITES_WINDOW_S", "5"))
+DB_PIN_COOKIE = "db_primary_until"
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+@dataclass
+class Replica:
+    name: str
+    url: str
+    engine: Optional[AsyncEngine] = None
+    sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+    lag_s: Optional[float] = None
+    healthy: bool = False
+    last_checked: Optional[float] = None
+    last_error: Optional[str] = None
+
+    def stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "lag_s": self.lag_s,
+            "last_checked_ago_s": (
+                time.monotonic() - self.last_checked if self.last_checked else None
+            ),
+            "last_error": self.last_error,
+            "pool": pool_stats(self.engine.pool) if self.engine is not None else None,
+        }
+
+
+class RecentWriters:
+    """Per-worker map of user keys that must read from the primary for a while."""
+
+    def __init__(self, window_s: float = READ_YOUR_WRITES_WINDOW_S):
+        self.window_s = window_s
+        self._until: Dict[str, float] = {}
+
+    def mark(self, user_key: str, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        until = now + self.window_s
+        self._until[user_key] = until
+        if len(self._until) > 10000:
+            self.prune(now)
+        return until
+
+    def is_pinned(self, user_key: Optional[str], now: Optional[float] = None) -> bool:
+        if not user_key:
+            return False
+        until = self._until.get(user_key)
+        return until is not None and until > (time.time() if now is None else now)
+
+    def prune(self, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        self._until = {k: v for k, v in self._until.items() if v > now}
+
+
+@dataclass
+class ReplicaRouter:
+    replicas: List[Replica] = field(default_factory=list)
+    max_lag_s: float = REPLICA_MAX_LAG_S
+    recent_writers: RecentWriters = field(default_factory=RecentWriters)
+
+    def __post_init__(self):
+        self._cycle = itertools.count()
+
+    def healthy_replicas(self) -> List[Replica]:
+        return [
+            r
+            for r in self.replicas
+            if r.healthy and r.lag_s is not None and r.lag_s <= self.max_lag_s
+        ]
+
+    def pick(
+        self, user_key: Optional[str], pinned_until: float = 0.0
+    ) -> Optional[Replica]:
+        """Replica to serve a read from, or None for the primary."""
+        if pinned_until > time.time() or self.recent_writers.is_pinned(user_key):
+            return None
+        candidates = self.healthy_replicas()
+        if not candidates:
+            return None
+        return candidates[next(self._cycle) % len(candidates)]
+
+    async def check_lag(self):
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    lag = (await conn.execute(LAG_QUERY)).scalar()
+                replica.lag_s = float(lag or 0)
+                replica.healthy = True
+                replica.last_error = None
+            except Exception as e:
+                replica.healthy = False
+                replica.last_error = str(e)
+                logger.warning(f"Replica {replica.name} lag check failed: {e}")
+            replica.last_checked = time.monotonic()
+
+    async def run_lag_monitor(self, interval_s: float = REPLICA_LAG_CHECK_INTERVAL_S):
+        while True:
+            await self.check_lag()
+            await asyncio.sleep(interval_s)
+
+    def stats(self) -> Dict:
+        return {
+            "max_lag_s": self.max_lag_s,
+            "read_your_writes_window_s": self.recent_writers.window_s,
+            "replicas": [r.stats() for r in self.replicas],
+        }
+
+
+def _build_replica(index: int, url: str) -> Replica:
+    engine = create_async_engine(
+        async_database_url(url),
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_pre_ping=True,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    instrument_engine(engine.sync_engine)
+    return Replica(
+        name=f"replica-{index}",
+        url=url,
+        engine=engine,
+        sessionmaker=async_sessionmaker(
+            engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        ),
+    )
+
+
+replica_router = ReplicaRouter(
+    replicas=[_build_replica(i, url) for i, url in enumerate(REPLICA_URLS)]
+)
+
+
+def request_user_key(request: Request) -> Optional[str]:
+    """User id from the bearer token, without touching the database."""
+    from app.auth import ALGORITHM, NEXTAUTH_SECRET
+
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, NEXTAUTH_SECRET, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
+def _pinned_until(request: Request) -> float:
+    try:
+        return float(request.cookies.get(DB_PIN_COOKIE, 0))
+    except ValueError:
+        return 0.0
+
+
+async def get_async_read_db(request: Request):
+    """AsyncSession for read-only endpoints, routed to a replica when safe."""
+    replica = replica_router.pick(request_user_key(request), _pinned_until(request))
+    request.state.db_target = replica.name if replica else "primary"
+    factory = AsyncSessionLocal
+    if replica is not None and replica.sessionmaker is not None:
+        factory = replica.sessionmaker
+    async with factory() as db:
+        yield db
+
+
+def record_write(request: Request, response) -> None:
+    """Pin the writing user's subsequent reads to the primary."""
+    if request.method not in WRITE_METHODS or response.status_code >= 400:
+        return
+    user_key = request_user_key(request)
+    if not user_key or not replica_router.replicas:
+        return
+    until = replica_router.recent_writers.mark(user_key)
+    response.set_cookie(
+        DB_PIN_COOKIE,
+        f"{until:.3f}",
+        max_age=int(READ_YOUR_WRITES_WINDOW_S) + 1,
+        httponly=True,
+        samesite="lax",
+    )
@@ -0,0 +1,129 @@
+"""
+Named relationship loading profiles.
+
+Relationships are declared with the default lazy loading; every query that renders
+or checks an entity picks one of these profiles so the SQL it emits matches the
+response shape:
+
+  card   - what list endpoints render (e.g. HackathonRead in GET /hackathons/)
+  detail - what single-object endpoints render
+  authz  - only the columns needed for status / permission checks
+
+Everything not named in a profile is raiseload'ed, so a schema change that starts
+touching an unloaded relationship fails loudly instead of adding lazy loads (which
+would also break on the async read path).
+
+EXPANSIONS holds the loader of each relationship field of a Read schema; the
+card/detail profiles load all of them, ?expand= (app.utils.fieldsets) picks.
+EMBEDDED lists, per relationship field, the relationship paths whose rows the
+field renders, for the ETag fingerprints of app.utils.http_cache.
+"""
+
+from typing import Tuple
+
+from sqlalchemy.orm import load_only, raiseload, selectinload
+
+from app.models.hackathon import Hackathon
+from app.models.project import Project
+from app.models.team import Team, TeamMember
+from app.models.user import User
+
+# UserRead.roles is computed from roles_association
+_USER_READ = (selectinload(User.roles_association),)
+
+EXPANSIONS = {
+    Team: {
+        "members": selectinload(Team.members)
+        .selectinload(TeamMember.user)
+        .options(*_USER_READ),
+        "join_requests": selectinload(Team.join_requests),
+        "invites": selectinload(Team.invites),
+    },
+    Hackathon: {
+        "organizer": selectinload(Hackathon.organizer).options(*_USER_READ),
+        "registrations": selectinload(Hackathon.registrations),
+    },
+}
+
+
+def _under(name: str, *paths: Tuple[str, ...]) -> Tuple[Tuple[str, ...], ...]:
+    return ((name,), *[(name, *path) for path in paths])
+
+
+# The rows behind UserRead.roles
+_USER_ROWS = (("roles_association",),)
+_TEAM_ROWS = {
+    "members": _under("members", *_under("user", *_USER_ROWS)),
+    "join_requests": _under("join_requests"),
+    "invites": _under("invites"),
+}
+
+EMBEDDED = {
+    Team: _TEAM_ROWS,
+    Hackathon: {
+        "organizer": _under("organizer", *_USER_ROWS),
+        "registrations": _under("registrations"),
+    },
+    Project: {
+        "template": _under("template"),
+        "team": _under("team", *[p for paths in _TEAM_ROWS.values() for p in paths]),
+    },
+}
+
+_TEAM_READ = (*EXPANSIONS[Team].values(), raiseload("*"))
+
+_HACKATHON_READ = (*EXPANSIONS[Hackathon].values(), raiseload("*"))
+
+_PROJECT_READ = (
+    selectinload(Project.template),
+    selectinload(Project.team).options(*_TEAM_READ),
+    raiseload("*"),
+)
+
+# The Read schemas are shared by list and detail responses, so card and detail
+# coincide for now; endpoints still ask for the one matching their shape.
+LOADER_PROFILES = {
+    Hackathon: {
+        "card": _HACKATHON_READ,
+        "detail": _HACKATHON_READ,
+        "authz": (
+            load_only(
+                Hackathon.id,
+                Hackathon.status,
+                Hackathon.organizer_id,
+                Hackathon.registration_deadline,
+            ),
+            raiseload("*"),
+        ),
+    },
+    Team: {
+        "card": _TEAM_READ,
+        "detail": _TEAM_READ,
+        "authz": (
+            load_only(Team.id, Team.hackathon_id, Team.status, Team.is_open),
+            raiseload("*"),
+        ),
+    },
+    Project: {
+        "card": _PROJECT_READ,
+        "detail": _PROJECT_READ,
+        "authz": (
+            load_only(
+                Project.id,
+                Project.owner_id,
+                Project.team_id,
+                Project.hackathon_id,
+                Project.status,
+            ),
+            raiseload("*"),
+        ),
+    },
+}
+
+
+def loader_options(model, profile: str) -> Tuple:
+    """Loader options of the given profile, for use with .options(*...)."""
+    try:
+        return LOADER_PROFILES[model][profile]
+    except KeyError:
+        raise ValueError(f"No loader profile '{profile}' for {model.__name__}")
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 # from fastapi.security import OAuth2PasswordBearer # No longer needed here if not defining scheme
 from fastapi.staticfiles import StaticFiles
+import asyncio
 import os
 import time
 from app.logger import get_logger
@@ -18,6 +19,11 @@ from app.middleware import (
 
 # Import app components
 from app.database import get_db
+from app.db_routing import record_write, replica_router
+from app import query_stats
+from app.slow_queries import route_template
+from app.write_latency import write_latency_log
+from app.broadcast import broadcaster
 from app.routers import (
     users_router,
     hackathons_router,
@@ -26,8 +32,12 @@ from app.routers import (
     judging_router,
     submissions_router,
     ping_router,
+    voting_router,
+    live_router,
+    search_router,
     system_metrics,
 )
+from app.services import voting_service
 
 app = FastAPI(
     title="Hackathon Platform API",
@@ -77,6 +87,43 @@ async def log_requests(request: Request, call_next):
         raise
 
 
+# Per-request SQL statement count / time and N+1 detection, write latency
+@app.middleware("http")
+async def collect_query_stats(request: Request, call_next):
+    token = query_stats.start_request(f"{request.method} {request.url.path}")
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        elapsed_s = time.perf_counter() - start
+        stats = query_stats.end_request(token, request.method, request.url.path)
+        # The router stores the matched route in the scope we share with it
+        route = request.scope.get("route")
+        write_latency_log.record(
+            request.method,
+            route.path if route else route_template(request.url.path),
+            elapsed_s,
+            status_code,
+            stats,
+        )
+    if query_stats.headers_enabled():
+        response.headers.update(stats.headers())
+    return response
+
+
+# Read-your-writes: pin a user's reads to the primary right after a write
+@app.middleware("http")
+async def route_replica_reads(request: Request, call_next):
+    response = await call_next(request)
+    record_write(request, response)
+    db_target = getattr(request.state, "db_target", None)
+    if db_target:
+        response.headers["X-DB-Target"] = db_target
+    return response
+
+
 static_dir = os.path.join(os.path.dirname(__file__), "static")
 if os.path.isdir(static_dir):
     app.mount("/static", StaticFiles(directory=static_dir), name="static")
@@ -95,6 +142,9 @@ app.include_router(teams_router, prefix="/teams", tags=["teams"])
 app.include_router(judging_router, prefix="/judging", tags=["judging"])
 app.include_router(submissions_router, prefix="/submissions", tags=["submissions"])
 app.include_router(ping_router, prefix="/ping", tags=["ping"])
+app.include_router(voting_router, prefix="/voting", tags=["voting"])
+app.include_router(live_router, prefix="/live", tags=["live"])
+app.include_router(search_router, prefix="/search", tags=["search"])
 app.include_router(system_metrics.router, prefix="/admin", tags=["admin"])
 
 
@@ -127,9 +177,29 @@ def get_error_log():
 async def startup_event():
     logger.info("Application startup")
     logger.info(f"FastAPI application '{app.title}' version {app.version} starting up")
+    if replica_router.replicas:
+        app.state.replica_lag_monitor = asyncio.create_task(
+            replica_router.run_lag_monitor()
+        )
+        logger.info(f"Routing reads to {len(replica_router.replicas)} replica(s)")
+    app.state.vote_flusher = asyncio.create_task(voting_service.buffer.run_flusher())
+    app.state.live_tasks = [
+        asyncio.create_task(broadcaster.run()),
+        asyncio.create_task(broadcaster.listen()),
+    ]
 
 
 # Log application shutdown
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Application shutdown")
+    monitor = getattr(app.state, "replica_lag_monitor", None)
+    if monitor is not None:
+        monitor.cancel()
+    flusher = getattr(app.state, "vote_flusher", None)
+    if flusher is not None:
+        flusher.cancel()
+    for task in getattr(app.state, "live_tasks", []):
+        task.cancel()
+    # Write the votes still buffered before the worker exits
+    await voting_service.buffer.flush()
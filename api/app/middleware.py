@@ -1,11 +1,9 @@
-from fastapi import Request, HTTPException, status, Depends
+from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import List, Optional, Callable
 from functools import wraps
-from app.models.user import UserRole
+from app.models.user import User, UserRole
 from app.auth import get_current_user
-from app.database import get_db
-from sqlalchemy.orm import Session
 from app.logger import get_logger
 
 logger = get_logger("middleware")
@@ -15,32 +13,22 @@ security = HTTPBearer()
 
 def require_roles(required_roles: List[UserRole]):
     """
-    Decorator to require specific roles for accessing an endpoint.
-    Usage: @require_roles([UserRole.ADMIN, UserRole.ORGANIZER])
+    Dependency requiring one of the given roles for accessing an endpoint.
+    Usage: dependencies=[require_roles([UserRole.ADMIN, UserRole.ORGANIZER])]
     """
-    async def dependency(request: Request, db: Session = Depends(get_db)):
-        logger.info(f"require_roles: called for roles {required_roles}")
-        
-        try:
-            user = await get_current_user(request, db)
-        except Exception as e:
-            logger.error(f"Error in get_current_user: {e}", exc_info=True)
-            raise
-
-        # Check if user has any of the required roles
-        try:
-            user_roles = [UserRole(role.role) for role in user.roles_association]
-            if not any(role in required_roles for role in user_roles):
-                logger.error(f"User lacks required roles: {user_roles} vs {required_roles}")
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Required roles: {[role.value for role in required_roles]}",
-                )
-        except Exception as e:
-            logger.error(f"Error checking user roles: {e}", exc_info=True)
-            raise
-
-        return user
+
+    def dependency(current_user: User = Depends(get_current_user)) -> User:
+        user_roles = {role.role for role in current_user.roles_association}
+        if not any(role.value in user_roles for role in required_roles):
+            logger.warning(
+                f"User {current_user.id} lacks required roles: "
+                f"{sorted(user_roles)} vs {[role.value for role in required_roles]}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Required roles: {[role.value for role in required_roles]}",
+            )
+        return current_user
 
     return Depends(dependency)
 
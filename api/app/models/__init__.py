@@ -7,9 +7,20 @@ from .project import Project, ProjectTemplate, ProjectVersion
 from .team import Team, TeamMember, TeamHistory, MemberHistory, JoinRequest, TeamInvite
 from .hackathon import Hackathon
 from .hackathon_registration import HackathonRegistration
-from .judging import Criterion, Score
+from .judging import (
+    Criterion,
+    Score,
+    LeaderboardEntry,
+    PairwiseComparison,
+    JudgeAssignment,
+    Vote,
+    VoteTally,
+)
 from .submission import Submission
 
+# Listeners keeping the member / registration counters current
+from app import counters  # noqa: E402,F401
+
 __all__ = [
     "User",
     "Session",
@@ -26,5 +37,10 @@ __all__ = [
     "HackathonRegistration",
     "Criterion",
     "Score",
+    "LeaderboardEntry",
+    "PairwiseComparison",
+    "JudgeAssignment",
+    "Vote",
+    "VoteTally",
     "Submission",
 ]
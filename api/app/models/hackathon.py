@@ -1,5 +1,4 @@
 import uuid
-import enum
 
 # import enum # No longer needed here directly if HackathonStatus is the only enum from this model's perspective
 from datetime import datetime, timezone
@@ -12,14 +11,22 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Enum as SQLEnum,
-    JSON,
     Boolean,
+    Computed,
+    Index,
+    Integer,
+    literal_column,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.database import Base
-from app.schemas.hackathon import HackathonStatus, HackathonMode  # Import HackathonMode
+from app.utils.ids import uuid7
+from app.schemas.hackathon import (  # VotingType re-exported for existing imports
+    HackathonMode,
+    HackathonStatus,
+    VotingType,
+)
 
 # from .team import Team # This will cause circular import if Team also imports Hackathon.
 if TYPE_CHECKING:
@@ -27,19 +34,34 @@ if TYPE_CHECKING:
     from .team import Team
 
 
-class VotingType(str, enum.Enum):
-    judges_only = "judges_only"
-    users = "users"
-    public = "public"
-    mixed = "mixed"
-
-
 class Hackathon(Base):
     __tablename__ = "hackathons"
-    __table_args__ = {"schema": "hackathons"}
+    __table_args__ = (
+        # Keyset pagination of GET /hackathons/ (optionally filtered by status)
+        Index("idx_hackathons_start_date_id", "start_date", "id"),
+        Index("idx_hackathons_status_start_date_id", "status", "start_date", "id"),
+        # Full-text search (app.routers.search)
+        Index("idx_hackathons_search", "search_vector", postgresql_using="gin"),
+        # List filters: tags / requirements containment (@>) and category
+        Index(
+            "idx_hackathons_tags",
+            "tags",
+            postgresql_using="gin",
+            postgresql_ops={"tags": "jsonb_path_ops"},
+        ),
+        Index(
+            "idx_hackathons_requirements",
+            "requirements",
+            postgresql_using="gin",
+            postgresql_ops={"requirements": "jsonb_path_ops"},
+        ),
+        Index("idx_hackathons_category_start_date_id", "category", "start_date", "id"),
+        {"schema": "hackathons"},
+    )
+    __mapper_args__ = {**Base.__mapper_args__, "exclude_properties": ["search_vector"]}
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     name: Mapped[str] = mapped_column(
         String(255), unique=True, nullable=False, index=True
@@ -50,7 +72,12 @@ class Hackathon(Base):
     )
     end_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     status: Mapped[HackathonStatus] = mapped_column(
-        SQLEnum(HackathonStatus, name="hackathon_status_enum", create_type=False),
+        SQLEnum(
+            HackathonStatus,
+            name="hackathon_status_enum",
+            native_enum=False,
+            create_type=False,
+        ),
         nullable=False,
         default=HackathonStatus.UPCOMING,
     )
@@ -66,16 +93,31 @@ class Hackathon(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+    # Optimistic concurrency (app.utils.concurrency): bumped by every UPDATE
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, onupdate=literal_column("version") + 1
+    )
+    # Maintained by app.counters
+    registration_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
     mode: Mapped[HackathonMode] = mapped_column(
-        SQLEnum(HackathonMode, name="hackathon_mode_enum", create_type=False),
+        SQLEnum(
+            HackathonMode,
+            name="hackathon_mode_enum",
+            native_enum=False,
+            create_type=False,
+        ),
         nullable=False,
         default=HackathonMode.SOLO_ONLY,
     )
-    requirements: Mapped[List[str]] = mapped_column(JSON, default=list)
+    requirements: Mapped[List[str]] = mapped_column(JSONB, default=list)
     category: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
-    tags: Mapped[Optional[List[str]]] = mapped_column(JSON, default=list)
+    tags: Mapped[Optional[List[str]]] = mapped_column(JSONB, default=list)
     max_team_size: Mapped[Optional[int]] = mapped_column(nullable=True)
     min_team_size: Mapped[Optional[int]] = mapped_column(nullable=True)
+    # Registrations (a team counts once) beyond this are waitlisted
+    max_participants: Mapped[Optional[int]] = mapped_column(nullable=True)
     registration_deadline: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
@@ -89,14 +131,27 @@ class Hackathon(Base):
     allow_multiple_projects_per_team: Mapped[bool] = mapped_column(
         nullable=False, default=False
     )
-    custom_fields: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    custom_fields: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    # Full-text document (app.routers.search), generated by Postgres. Kept out of the
+    # mapper: the ORM neither writes it nor reads it back with the row.
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(category, '')), 'B') || "
+            "setweight(jsonb_to_tsvector('english', coalesce(tags, '[]'::jsonb), "
+            "'[\"string\"]'), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+            persisted=True,
+        ),
+    )
 
     # --- Judging/Voting Config ---
     voting_type: Mapped[str] = mapped_column(
         String(32), nullable=False, default="judges_only"
     )
     judging_criteria: Mapped[Optional[list]] = mapped_column(
-        JSON, nullable=True
+        JSONB, nullable=True
     )  # List of criteria dicts
     voting_start: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -109,13 +164,13 @@ class Hackathon(Base):
         Boolean, nullable=False, default=False
     )
 
-    organizer = relationship("User", lazy="selectin")
+    organizer = relationship("User")
     # Relationship to the new HackathonRegistration table
     registrations: Mapped[List["HackathonRegistration"]] = relationship(
-        back_populates="hackathon", cascade="all, delete-orphan", lazy="selectin"
+        back_populates="hackathon", cascade="all, delete-orphan"
     )
     teams: Mapped[List["Team"]] = relationship(
-        back_populates="hackathon", cascade="all, delete-orphan", lazy="selectin"
+        back_populates="hackathon", cascade="all, delete-orphan"
     )
     projects = relationship("Project", back_populates="hackathon")
 
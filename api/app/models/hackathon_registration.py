@@ -3,11 +3,12 @@ import uuid
 from datetime import datetime, timezone
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import String, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import String, DateTime, ForeignKey, CheckConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.database import Base
+from app.utils.ids import uuid7
 
 if TYPE_CHECKING:
     from .hackathon import Hackathon
@@ -15,6 +16,10 @@ if TYPE_CHECKING:
     from .user import User
     from .team import Team
 
+# Registration statuses; waitlisted ones wait for a seat of max_participants
+REGISTERED = "registered"
+WAITLISTED = "waitlisted"
+
 
 class HackathonRegistration(Base):
     __tablename__ = "hackathon_registrations"
@@ -23,11 +28,35 @@ class HackathonRegistration(Base):
             "(user_id IS NOT NULL AND team_id IS NULL) OR (user_id IS NULL AND team_id IS NOT NULL)",
             name="chk_participant_type",
         ),
+        # One registration per user / team and hackathon (app.services
+        # .registration_service checks this under advisory locks first)
+        Index(
+            "uq_registrations_hackathon_user",
+            "hackathon_id",
+            "user_id",
+            unique=True,
+            postgresql_where=text("user_id IS NOT NULL"),
+        ),
+        Index(
+            "uq_registrations_hackathon_team",
+            "hackathon_id",
+            "team_id",
+            unique=True,
+            postgresql_where=text("team_id IS NOT NULL"),
+        ),
+        # Waitlist in promotion order
+        Index(
+            "idx_registrations_waitlist",
+            "hackathon_id",
+            "registered_at",
+            "id",
+            postgresql_where=text("status = 'waitlisted'"),
+        ),
         {"schema": "hackathons"},
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     hackathon_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("hackathons.hackathons.id", ondelete="CASCADE"), nullable=False
@@ -51,8 +80,8 @@ class HackathonRegistration(Base):
         nullable=False,
     )
     status: Mapped[str] = mapped_column(
-        String(50), default="registered", nullable=False
-    )  # e.g., registered, withdrawn
+        String(50), default=REGISTERED, nullable=False
+    )  # e.g., registered, waitlisted, withdrawn
 
     # Relationships
     hackathon: Mapped["Hackathon"] = relationship(back_populates="registrations")
@@ -15,19 +15,28 @@ from sqlalchemy import (
     Text,
     Numeric,
     UniqueConstraint,
+    Index,
+    Computed,
+    CheckConstraint,
+    text,
+    literal_column,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.database import Base  # Import Base from your database setup
+from app.utils.ids import uuid7
 
 
 class Criterion(Base):
     __tablename__ = "criteria"
-    __table_args__ = {"schema": "judging"}
+    __table_args__ = (
+        Index("idx_criteria_created_at_id", "created_at", "id"),
+        {"schema": "judging"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     name: Mapped[str] = mapped_column(
         String(255), nullable=False, unique=True, index=True
@@ -55,11 +64,12 @@ class Score(Base):
         UniqueConstraint(
             "project_id", "criteria_id", "judge_id", name="uq_project_criterion_judge"
         ),
+        Index("idx_scores_judge_id_id", "judge_id", "id"),
         {"schema": "judging"},
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     project_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("projects.projects.id"), nullable=False
@@ -80,10 +90,192 @@ class Score(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+    # Optimistic concurrency (app.utils.concurrency): bumped by every UPDATE
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, onupdate=literal_column("version") + 1
+    )
 
     project = relationship("Project")  # Basic relationship, could be configured more
     criterion = relationship("Criterion", back_populates="scores")
     judge = relationship("User")  # Basic relationship
 
 
+class LeaderboardEntry(Base):
+    """
+    Materialized per-project judging totals, maintained incrementally by the
+    score endpoints (app.services.leaderboard_service) so the ranking is read
+    without scanning judging.scores.
+    """
+
+    __tablename__ = "leaderboard"
+    __table_args__ = (
+        # Keyset pagination of GET /judging/results/hackathon/{id}
+        Index(
+            "idx_leaderboard_hackathon_average_project",
+            "hackathon_id",
+            "weighted_average",
+            "project_id",
+        ),
+        {"schema": "judging"},
+    )
+
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    hackathon_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("hackathons.hackathons.id", ondelete="CASCADE"), nullable=False
+    )
+    # sum(score * criterion.weight) and sum(criterion.weight) over all scores
+    weighted_total: Mapped[Decimal] = mapped_column(Numeric, nullable=False, default=0)
+    weight_sum: Mapped[Decimal] = mapped_column(Numeric, nullable=False, default=0)
+    weighted_average: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric, Computed("weighted_total / NULLIF(weight_sum, 0)", persisted=True)
+    )
+    score_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+    project = relationship("Project")
+
+    @property
+    def project_name(self) -> str:
+        return self.project.name
+
+
+class PairwiseComparison(Base):
+    """One judge's verdict between two projects (voting_type == "pairwise")."""
+
+    __tablename__ = "pairwise_comparisons"
+    __table_args__ = (
+        CheckConstraint("winner_id <> loser_id", name="chk_pairwise_distinct"),
+        # A judge answers each unordered pair at most once
+        Index(
+            "uq_pairwise_judge_pair",
+            "hackathon_id",
+            "judge_id",
+            text("LEAST(winner_id, loser_id)"),
+            text("GREATEST(winner_id, loser_id)"),
+            unique=True,
+        ),
+        {"schema": "judging"},
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid7
+    )
+    hackathon_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("hackathons.hackathons.id", ondelete="CASCADE"), nullable=False
+    )
+    judge_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("auth.users.id", ondelete="CASCADE"), nullable=False
+    )
+    winner_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.projects.id", ondelete="CASCADE"), nullable=False
+    )
+    loser_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.projects.id", ondelete="CASCADE"), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class JudgeAssignment(Base):
+    """A project in a judge's review queue (app.services.judge_assignment)."""
+
+    __tablename__ = "judge_assignments"
+    __table_args__ = (
+        UniqueConstraint("judge_id", "project_id", name="uq_judge_assignment"),
+        # GET /judging/assignments/{hackathon_id}/my-queue
+        Index(
+            "idx_judge_assignments_hackathon_judge_position",
+            "hackathon_id",
+            "judge_id",
+            "position",
+        ),
+        {"schema": "judging"},
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid7
+    )
+    hackathon_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("hackathons.hackathons.id", ondelete="CASCADE"), nullable=False
+    )
+    judge_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("auth.users.id", ondelete="CASCADE"), nullable=False
+    )
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.projects.id", ondelete="CASCADE"), nullable=False
+    )
+    # Order within the judge's queue
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class Vote(Base):
+    """
+    One audience vote (voting_type users / public / mixed). Written in batches by
+    app.services.voting_service; duplicates are dropped by uq_vote_ballot.
+    """
+
+    __tablename__ = "votes"
+    __table_args__ = (
+        UniqueConstraint(
+            "hackathon_id", "voter_key", "ballot_id", name="uq_vote_ballot"
+        ),
+        {"schema": "judging"},
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid7
+    )
+    hackathon_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("hackathons.hackathons.id", ondelete="CASCADE"), nullable=False
+    )
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.projects.id", ondelete="CASCADE"), nullable=False
+    )
+    # Hash of the voter's identity (user id or anonymous voter cookie)
+    voter_key: Mapped[str] = mapped_column(String(64), nullable=False)
+    # project_id if the hackathon allows voting for several projects, otherwise
+    # hackathon_id, so uq_vote_ballot allows one vote per project or per hackathon
+    ballot_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    # Only kept when the hackathon does not use anonymous votes
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        ForeignKey("auth.users.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class VoteTally(Base):
+    """Per-project vote counts, incremented by every batch of inserted votes."""
+
+    __tablename__ = "vote_tallies"
+    __table_args__ = (
+        Index("idx_vote_tallies_hackathon_votes", "hackathon_id", "votes"),
+        {"schema": "judging"},
+    )
+
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    hackathon_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("hackathons.hackathons.id", ondelete="CASCADE"), nullable=False
+    )
+    votes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+
 # Pydantic Schemas for Criterion and Score have been moved to app.schemas.judging
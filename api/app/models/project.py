@@ -4,11 +4,25 @@ import enum
 from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any  # TYPE_CHECKING removed
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum, JSON, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Column,
+    String,
+    DateTime,
+    ForeignKey,
+    Enum as SQLEnum,
+    JSON,
+    Text,
+    Computed,
+    Index,
+    text,
+    Integer,
+    literal_column,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.database import Base
+from app.utils.ids import uuid7
 from .submission import (
     Submission,
 )  # Assuming submission.py exists in the same models directory
@@ -22,10 +36,13 @@ from app.schemas.project import (
 
 class ProjectTemplate(Base):
     __tablename__ = "templates"
-    __table_args__ = {"schema": "projects"}
+    __table_args__ = (
+        Index("idx_project_templates_created_at_id", "created_at", "id"),
+        {"schema": "projects"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     name: Mapped[str] = mapped_column(
         String(255), unique=True, nullable=False, index=True
@@ -48,23 +65,51 @@ class ProjectTemplate(Base):
 
 class Project(Base):
     __tablename__ = "projects"
-    __table_args__ = {"schema": "projects"}
+    __table_args__ = (
+        # Keyset pagination of GET /projects/ (optionally filtered by hackathon)
+        Index("idx_projects_created_at_id", "created_at", "id"),
+        Index(
+            "idx_projects_hackathon_created_at_id", "hackathon_id", "created_at", "id"
+        ),
+        Index(
+            "idx_projects_team_id",
+            "team_id",
+            postgresql_where=text("team_id IS NOT NULL"),
+        ),
+        # Full-text search (app.routers.search)
+        Index("idx_projects_search", "search_vector", postgresql_using="gin"),
+        {"schema": "projects"},
+    )
+    __mapper_args__ = {**Base.__mapper_args__, "exclude_properties": ["search_vector"]}
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     project_template_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         ForeignKey("projects.templates.id"), nullable=True
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     description: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Generated search document, not mapped (see Hackathon.search_vector)
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    )
     status: Mapped[ProjectStatus] = mapped_column(
-        SQLEnum(ProjectStatus), nullable=False, default=ProjectStatus.DRAFT
+        SQLEnum(ProjectStatus, native_enum=False),
+        nullable=False,
+        default=ProjectStatus.DRAFT,
     )
 
     # Neue Felder für Storage und Deployment
     storage_type: Mapped[ProjectStorageType] = mapped_column(
-        SQLEnum(ProjectStorageType), nullable=False, default=ProjectStorageType.GITHUB
+        SQLEnum(ProjectStorageType, native_enum=False),
+        nullable=False,
+        default=ProjectStorageType.GITHUB,
     )
 
     # Repository URLs
@@ -115,6 +160,12 @@ class Project(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+    # Optimistic concurrency (app.utils.concurrency): bumped by every UPDATE
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, onupdate=literal_column("version") + 1
+    )
+    # Last version number handed out, see app.counters.next_version_number
+    version_seq: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     # Relationships
     template = relationship("ProjectTemplate", back_populates="projects")
@@ -140,10 +191,18 @@ class ProjectVersionStatus(str, enum.Enum):
 
 class ProjectVersion(Base):
     __tablename__ = "project_versions"
-    __table_args__ = {"schema": "projects"}
+    __table_args__ = (
+        Index(
+            "idx_project_versions_project_created_at_id",
+            "project_id",
+            "created_at",
+            "id",
+        ),
+        {"schema": "projects"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     project_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("projects.projects.id"), nullable=False
@@ -155,7 +214,8 @@ class ProjectVersion(Base):
         ForeignKey("auth.users.id"), nullable=False
     )
     status: Mapped[ProjectVersionStatus] = mapped_column(
-        SQLEnum(ProjectVersionStatus), default=ProjectVersionStatus.PENDING
+        SQLEnum(ProjectVersionStatus, native_enum=False),
+        default=ProjectVersionStatus.PENDING,
     )
     build_logs: Mapped[Optional[str]] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(
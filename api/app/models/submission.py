@@ -3,20 +3,24 @@ import enum
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.database import Base
+from app.utils.ids import uuid7
 from app.schemas.submission import SubmissionContentType  # Import for model usage
 
 
 class Submission(Base):
     __tablename__ = "submissions"
-    __table_args__ = {"schema": "projects"}
+    __table_args__ = (
+        Index("idx_submissions_project_id_id", "project_id", "id"),
+        {"schema": "projects"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     project_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("projects.projects.id"), nullable=False
@@ -29,6 +33,7 @@ class Submission(Base):
         SQLEnum(
             SubmissionContentType,
             name="submission_content_type_enum",
+            native_enum=False,
             create_type=False,
         ),
         nullable=False,
@@ -4,11 +4,23 @@ from datetime import datetime, timezone
 from typing import List, Optional
 import enum
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Column,
+    String,
+    DateTime,
+    ForeignKey,
+    Enum as SQLEnum,
+    Computed,
+    Index,
+    text,
+    Integer,
+    literal_column,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.database import Base
+from app.utils.ids import uuid7
 from app.schemas.team import TeamMemberRole
 
 
@@ -20,19 +32,43 @@ class TeamStatus(str, enum.Enum):
 
 class Team(Base):
     __tablename__ = "teams"
-    __table_args__ = {"schema": "teams"}
+    __table_args__ = (
+        # Keyset pagination of GET /teams/?hackathon_id=... (active teams only)
+        Index(
+            "idx_teams_hackathon_status_created_at_id",
+            "hackathon_id",
+            "status",
+            "created_at",
+            "id",
+        ),
+        # Full-text search (app.routers.search)
+        Index("idx_teams_search", "search_vector", postgresql_using="gin"),
+        {"schema": "teams"},
+    )
+    __mapper_args__ = {**Base.__mapper_args__, "exclude_properties": ["search_vector"]}
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     hackathon_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("hackathons.hackathons.id", ondelete="CASCADE"), nullable=False
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     description: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Generated search document, not mapped (see Hackathon.search_vector)
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    )
     is_open: Mapped[bool] = mapped_column(default=True, nullable=False)
     status: Mapped[TeamStatus] = mapped_column(
-        SQLEnum(TeamStatus), default=TeamStatus.active, nullable=False
+        SQLEnum(TeamStatus, native_enum=False),
+        default=TeamStatus.active,
+        nullable=False,
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(timezone.utc)
@@ -42,6 +78,12 @@ class Team(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+    # Optimistic concurrency (app.utils.concurrency): bumped by every UPDATE
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, onupdate=literal_column("version") + 1
+    )
+    # Maintained by app.counters
+    member_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     # Relationships
     hackathon = relationship("Hackathon", back_populates="teams")
@@ -49,7 +91,6 @@ class Team(Base):
         "TeamMember",
         back_populates="team",
         cascade="all, delete-orphan",
-        lazy="selectin",
     )
     users = relationship(
         "User", secondary="teams.members", back_populates="teams", viewonly=True
@@ -58,31 +99,31 @@ class Team(Base):
         "JoinRequest",
         back_populates="team",
         cascade="all, delete-orphan",
-        lazy="selectin",
     )
     invites = relationship(
         "TeamInvite",
         back_populates="team",
         cascade="all, delete-orphan",
-        lazy="selectin",
     )
     history = relationship(
         "TeamHistory",
         back_populates="team",
         cascade="all, delete-orphan",
-        lazy="selectin",
     )
     hackathon_registrations = relationship(
         "HackathonRegistration",
         back_populates="team",
         cascade="all, delete-orphan",
-        lazy="selectin",
     )
 
 
 class TeamMember(Base):
     __tablename__ = "members"
-    __table_args__ = {"schema": "teams"}
+    # The primary key (team_id, user_id) does not serve "teams of a user"
+    __table_args__ = (
+        Index("idx_members_user_id", "user_id"),
+        {"schema": "teams"},
+    )
 
     team_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("teams.teams.id"), primary_key=True
@@ -91,7 +132,9 @@ class TeamMember(Base):
         ForeignKey("auth.users.id"), primary_key=True
     )
     role: Mapped[TeamMemberRole] = mapped_column(
-        SQLEnum(TeamMemberRole), default=TeamMemberRole.member, nullable=False
+        SQLEnum(TeamMemberRole, native_enum=False),
+        default=TeamMemberRole.member,
+        nullable=False,
     )
     joined_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(timezone.utc)
@@ -106,7 +149,7 @@ class TeamHistory(Base):
     __table_args__ = {"schema": "teams"}
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     team_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("teams.teams.id", ondelete="CASCADE")
@@ -116,7 +159,9 @@ class TeamHistory(Base):
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    status: Mapped[TeamStatus] = mapped_column(SQLEnum(TeamStatus), nullable=False)
+    status: Mapped[TeamStatus] = mapped_column(
+        SQLEnum(TeamStatus, native_enum=False), nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(timezone.utc)
     )
@@ -136,7 +181,7 @@ class MemberHistory(Base):
     __table_args__ = {"schema": "teams"}
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     team_history_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("teams.team_history.id", ondelete="CASCADE")
@@ -145,7 +190,7 @@ class MemberHistory(Base):
         ForeignKey("auth.users.id", ondelete="CASCADE")
     )
     role: Mapped[TeamMemberRole] = mapped_column(
-        SQLEnum(TeamMemberRole), nullable=False
+        SQLEnum(TeamMemberRole, native_enum=False), nullable=False
     )
     joined_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     left_at: Mapped[datetime] = mapped_column(
@@ -164,7 +209,15 @@ class JoinRequestStatus(str, enum.Enum):
 
 class JoinRequest(Base):
     __tablename__ = "join_requests"
-    __table_args__ = {"schema": "teams"}
+    __table_args__ = (
+        Index("idx_join_requests_sender_id", "sender_id"),
+        Index(
+            "idx_join_requests_team_pending",
+            "team_id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        {"schema": "teams"},
+    )
 
     team_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("teams.teams.id"), primary_key=True
@@ -176,7 +229,9 @@ class JoinRequest(Base):
         ForeignKey("auth.users.id"), nullable=False
     )
     status: Mapped[JoinRequestStatus] = mapped_column(
-        SQLEnum(JoinRequestStatus), default=JoinRequestStatus.pending, nullable=False
+        SQLEnum(JoinRequestStatus, native_enum=False),
+        default=JoinRequestStatus.pending,
+        nullable=False,
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(timezone.utc)
@@ -213,7 +268,9 @@ class TeamInvite(Base):
         ForeignKey("auth.users.id"), nullable=True
     )
     status: Mapped[TeamInviteStatus] = mapped_column(
-        SQLEnum(TeamInviteStatus), default=TeamInviteStatus.pending, nullable=False
+        SQLEnum(TeamInviteStatus, native_enum=False),
+        default=TeamInviteStatus.pending,
+        nullable=False,
     )
     token: Mapped[str] = mapped_column(String(255), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
@@ -0,0 +1,167 @@
+"""
+Connection pool instrumentation.
+
+InstrumentedQueuePool (sync engine) and InstrumentedAsyncQueuePool (async
+engine) are drop-in pools that record how long callers wait for a connection,
+how long connections stay checked out and how old the pooled connections are.
+The numbers are exposed via the admin endpoint
+GET /admin/db-pool so the pool can be sized for N uvicorn workers against the
+Postgres max_connections limit.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Number of recent samples kept for percentile calculations
+SAMPLE_WINDOW = 1000
+
+
+def _percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class PoolMetrics:
+    """Thread-safe counters for a single connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.closes = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_samples: deque = deque(maxlen=SAMPLE_WINDOW)
+        self.hold_samples: deque = deque(maxlen=SAMPLE_WINDOW)
+        # id(connection_record) -> monotonic time the DBAPI connection was opened
+        self.connected_at: Dict[int, float] = {}
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.wait_samples.append(seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self, record_id: int):
+        with self._lock:
+            self.connects += 1
+            self.connected_at[record_id] = time.monotonic()
+
+    def record_close(self, record_id: int):
+        with self._lock:
+            self.closes += 1
+            self.connected_at.pop(record_id, None)
+
+    def record_hold(self, seconds: float):
+        with self._lock:
+            self.hold_samples.append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            waits = list(self.wait_samples)
+            holds = list(self.hold_samples)
+            ages = [now - opened for opened in self.connected_at.values()]
+            checkouts = self.checkouts
+            return {
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "closes": self.closes,
+                "wait_ms": {
+                    "avg": (self.wait_total / checkouts * 1000) if checkouts else 0.0,
+                    "p95": _percentile(waits, 95) * 1000,
+                    "p99": _percentile(waits, 99) * 1000,
+                    "max": self.wait_max * 1000,
+                },
+                "checkout_duration_ms": {
+                    "p50": _percentile(holds, 50) * 1000,
+                    "p95": _percentile(holds, 95) * 1000,
+                    "max": max(holds) * 1000 if holds else 0.0,
+                },
+                "connection_age_s": {
+                    "count": len(ages),
+                    "min": min(ages) if ages else 0.0,
+                    "avg": sum(ages) / len(ages) if ages else 0.0,
+                    "max": max(ages) if ages else 0.0,
+                },
+            }
+
+
+class _InstrumentedPoolMixin(QueuePool):
+    """Keeps a PoolMetrics instance up to date for a QueuePool subclass."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        metrics = self.metrics
+
+        @event.listens_for(self, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            metrics.record_connect(id(connection_record))
+
+        @event.listens_for(self, "close")
+        def _on_close(dbapi_connection, connection_record):
+            metrics.record_close(id(connection_record))
+
+        @event.listens_for(self, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            connection_record.info["checked_out_at"] = time.monotonic()
+
+        @event.listens_for(self, "checkin")
+        def _on_checkin(dbapi_connection, connection_record):
+            started = connection_record.info.pop("checked_out_at", None)
+            if started is not None:
+                metrics.record_hold(time.monotonic() - started)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def stats(self) -> Dict[str, Any]:
+        """Current pool occupancy merged with the collected metrics."""
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "timeout_s": self._timeout,
+            **self.metrics.snapshot(),
+        }
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin):
+    """Instrumented pool for the sync (psycopg2) engine."""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """Instrumented pool for the async (asyncpg) engine."""
+
+
+def pool_stats(pool: Pool) -> Optional[Dict[str, Any]]:
+    """stats() of an instrumented pool; None for any other pool class."""
+    if isinstance(pool, _InstrumentedPoolMixin):
+        return pool.stats()
+    return None
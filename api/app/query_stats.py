@@ -0,0 +1,124 @@
+"""
+Per-request SQL statistics and N+1 detection.
+
+The engines are instrumented with before/after_cursor_execute listeners that add
+every statement to the RequestQueryStats of the request currently being served
+(held in a ContextVar, set by the query stats middleware in app.main). Statements
+are grouped by their SQL text, which SQLAlchemy emits with bound parameters, so
+the same shape running N_PLUS_ONE_THRESHOLD times or more within one request is
+reported as a suspected N+1.
+
+Outside production the totals are returned in the X-DB-Queries / X-DB-Time
+headers, which the test suite uses to enforce per-endpoint query budgets.
+"""
+
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.logger import get_logger
+
+logger = get_logger("query_stats")
+
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+QUERY_COUNT_HEADER = "X-DB-Queries"
+QUERY_TIME_HEADER = "X-DB-Time"
+N_PLUS_ONE_HEADER = "X-DB-Suspected-N-Plus-One"
+
+
+@dataclass
+class RequestQueryStats:
+    count: int = 0
+    rows: int = 0
+    time_s: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    route: Optional[str] = None
+
+    def record(self, statement: str, elapsed_s: float, rowcount: int):
+        self.count += 1
+        self.time_s += elapsed_s
+        if rowcount and rowcount > 0:
+            self.rows += rowcount
+        self.shapes[statement] += 1
+
+    def suspected_n_plus_one(
+        self, threshold: int = N_PLUS_ONE_THRESHOLD
+    ) -> List[Tuple[str, int]]:
+        return [(s, n) for s, n in self.shapes.most_common() if n >= threshold]
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            QUERY_COUNT_HEADER: str(self.count),
+            QUERY_TIME_HEADER: f"{self.time_s * 1000:.2f}ms",
+        }
+        repeated = self.suspected_n_plus_one()
+        if repeated:
+            headers[N_PLUS_ONE_HEADER] = str(len(repeated))
+        return headers
+
+
+# Called as observer(statement, parameters, elapsed_s, executemany, stats) after
+# every statement; stats is None outside a request.
+_observers: List[Callable] = []
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def headers_enabled() -> bool:
+    """The X-DB-* headers are only sent outside production (APP_ENV)."""
+    return os.getenv("APP_ENV", "development") != "production"
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+
+def start_request(route: Optional[str] = None):
+    """Begin collecting for the current request; returns a token for end_request."""
+    return _current_stats.set(RequestQueryStats(route=route))
+
+
+def end_request(token, method: str, path: str) -> RequestQueryStats:
+    # Always set here, by the start_request that returned token
+    stats = _current_stats.get() or RequestQueryStats()
+    _current_stats.reset(token)
+    for statement, n in stats.suspected_n_plus_one():
+        logger.warning(
+            f"Suspected N+1 in {method} {path}: statement ran {n} times: "
+            f"{' '.join(statement.split())[:300]}"
+        )
+    return stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start_time
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed, cursor.rowcount)
+    for observer in _observers:
+        observer(statement, parameters, elapsed, executemany, stats)
+
+
+def add_observer(observer: Callable):
+    """Register a callback that sees every statement with its duration."""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def instrument_engine(engine):
+    """Attach the listeners to a sync Engine (async engines: pass .sync_engine)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
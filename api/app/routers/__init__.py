@@ -5,6 +5,9 @@ from .judging import router as judging_router
 from .hackathons import router as hackathons_router
 from .submissions import router as submissions_router
 from .ping import router as ping_router
+from .voting import router as voting_router
+from .live import router as live_router
+from .search import router as search_router
 
 __all__ = [
     "users_router",
@@ -14,4 +17,7 @@ __all__ = [
     "hackathons_router",
     "submissions_router",
     "ping_router",
+    "voting_router",
+    "live_router",
+    "search_router",
 ]
@@ -1,27 +1,54 @@
 import uuid
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query, Response
+from sqlalchemy import func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.database import get_db
-from datetime import datetime, timezone  # Added timezone
+from app.db_routing import get_async_read_db
+from app.utils.concurrency import (
+    check_update_conflict,
+    fetch_updated,
+    if_match_version,
+    set_etag,
+    versioned_update,
+)
+from app.utils.fieldsets import Fieldset, fieldset
+from app.utils.http_cache import (
+    Conditional,
+    conditional,
+    embedded_paths,
+    entity_etag,
+    page_etag,
+)
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    finish_page,
+    paginate,
+)
 from app.models.user import User, UserRole
 from app.models.hackathon import Hackathon  # hackathon_teams_table removed
-from app.models.hackathon_registration import HackathonRegistration  # Added
-from app.models.team import Team, TeamMember, TeamMemberRole  # Team models
-from app.models.project import Project  # Project model
-from app.schemas.project import ProjectStatus  # ProjectStatus enum
+from app.models.hackathon_registration import (
+    REGISTERED,
+    WAITLISTED,
+    HackathonRegistration,
+)
+from app.models.team import Team
 from app.schemas.hackathon import (
     HackathonCreate,
     HackathonRead,
     HackathonUpdate,
     HackathonStatus,
     HackathonRegistrationRead,
+    HackathonSummary,
     ParticipantRegistrationCreate,  # Added ParticipantRegistrationCreate
 )  # Pydantic schemas
 from app.auth import get_current_user
 from app.middleware import require_roles, require_admin, require_organizer
+from app.services import registration_service, voting_service
 
 # from app.static import banner_url # This was unused
 # If you have a specific get_current_active_admin_user, import that instead for admin routes
@@ -72,7 +99,6 @@ def create_hackathon(hackathon_in: HackathonCreate, db: Session = Depends(get_db
     try:
         db.add(db_hackathon)
         db.commit()
-        db.refresh(db_hackathon)
         return db_hackathon
     except IntegrityError:  # Handles unique constraint violation for hackathon name
         db.rollback()
@@ -82,36 +108,155 @@ def create_hackathon(hackathon_in: HackathonCreate, db: Session = Depends(get_db
         )
 
 
+def hackathon_filters(
+    status_filter: Optional[HackathonStatus] = None,
+    tag: Optional[List[str]] = Query(None, description="Has all of these tags"),
+    requirement: Optional[List[str]] = Query(
+        None, description="Has all of these requirements"
+    ),
+    category: Optional[str] = None,
+) -> list:
+    """
+    WHERE conditions of the hackathon list filters. Tags and requirements are
+    matched by JSONB containment (@>), which the GIN indexes on them serve.
+    """
+    conditions = []
+    if status_filter:
+        conditions.append(Hackathon.status == status_filter)
+    if tag:
+        conditions.append(Hackathon.tags.contains(tag))
+    if requirement:
+        conditions.append(Hackathon.requirements.contains(requirement))
+    if category:
+        conditions.append(Hackathon.category == category)
+    return conditions
+
+
 @router.get("/", response_model=List[HackathonRead])
-def list_hackathons(
-    skip: int = 0,
-    limit: int = 100,
-    status_filter: Optional[HackathonStatus] = None,  # Example filter
-    db: Session = Depends(get_db),
+async def list_hackathons(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
+    filters: list = Depends(hackathon_filters),
+    fields: Fieldset = Depends(fieldset(Hackathon, HackathonRead)),
+    cache: Conditional = Depends(conditional()),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """
-    List all hackathons. Can be filtered by status.
+    List hackathons, latest start date first. Can be filtered by status,
+    category, tags and requirements (repeat `tag` / `requirement` to require
+    several).
+    Pass the X-Next-Cursor header of a page as `cursor` to fetch the next page.
+    `fields` / `expand` return (and load) only the given fields.
+    Answers 304 to an If-None-Match naming the page's current ETag.
     """
-    query = db.query(Hackathon)
-    if status_filter:
-        query = query.filter(Hackathon.status == status_filter)
-    hackathons = (
-        query.order_by(Hackathon.start_date.desc()).offset(skip).limit(limit).all()
+    key = (Hackathon.start_date, Hackathon.id)
+    ids = paginate(select(Hackathon.id).where(*filters), key, limit, cursor, skip=skip)
+    paths = embedded_paths(Hackathon, fields.embedded)
+    cache.check(await db.scalar(page_etag(Hackathon, ids, paths)))
+    stmt = select(Hackathon).options(*fields.options("card", *key)).where(*filters)
+    result = await db.execute(paginate(stmt, key, limit, cursor, skip=skip))
+    page = finish_page(result.scalars().all(), key, limit, response)
+    return fields.render(page, response)
+
+
+# Card fields of HackathonSummary
+SUMMARY_COLUMNS = (
+    Hackathon.id,
+    Hackathon.name,
+    Hackathon.description,
+    Hackathon.start_date,
+    Hackathon.end_date,
+    Hackathon.status,
+    Hackathon.mode,
+    Hackathon.location,
+    Hackathon.category,
+    Hackathon.tags,
+    Hackathon.banner_image_url,
+    Hackathon.registration_deadline,
+    Hackathon.max_participants,
+)
+
+
+@router.get("/summary", response_model=List[HackathonSummary])
+async def list_hackathon_summaries(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    filters: list = Depends(hackathon_filters),
+    cache: Conditional = Depends(conditional()),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    List public hackathons as cards with their registration counts, in the
+    order of GET /hackathons/ (same cursor and filters). One query: the page
+    of hackathons is picked first, then only its registrations are counted.
+    """
+    key = (Hackathon.start_date, Hackathon.id)
+    page = select(Hackathon.id).where(Hackathon.is_public.is_(True), *filters)
+    page = paginate(page, key, limit, cursor)
+    # The counts come from the registrations and their teams' member_count
+    counted = (("registrations",), ("registrations", "team"))
+    cache.check(await db.scalar(page_etag(Hackathon, page, counted)))
+    page = page.subquery()
+
+    registered = HackathonRegistration.status == REGISTERED
+    stmt = (
+        select(
+            *SUMMARY_COLUMNS,
+            func.count(HackathonRegistration.id)
+            .filter(registered)
+            .label("registration_count"),
+            func.count(HackathonRegistration.team_id)
+            .filter(registered)
+            .label("team_count"),
+            (
+                func.count(HackathonRegistration.user_id).filter(registered)
+                + func.coalesce(func.sum(Team.member_count).filter(registered), 0)
+            ).label("participant_count"),
+            func.count(HackathonRegistration.id)
+            .filter(HackathonRegistration.status == WAITLISTED)
+            .label("waitlist_count"),
+        )
+        .join(page, page.c.id == Hackathon.id)
+        .outerjoin(
+            HackathonRegistration, HackathonRegistration.hackathon_id == Hackathon.id
+        )
+        .outerjoin(Team, Team.id == HackathonRegistration.team_id)
+        .group_by(Hackathon.id)
+        .order_by(*[column.desc() for column in key])
     )
-    return hackathons
+    result = await db.execute(stmt)
+    return finish_page(result.all(), key, limit, response)
 
 
 @router.get("/{hackathon_id}", response_model=HackathonRead)
-def get_hackathon(hackathon_id: uuid.UUID, db: Session = Depends(get_db)):
+async def get_hackathon(
+    hackathon_id: uuid.UUID,
+    response: Response,
+    fields: Fieldset = Depends(fieldset(Hackathon, HackathonRead)),
+    cache: Conditional = Depends(conditional()),
+    db: AsyncSession = Depends(get_async_read_db),
+):
     """
     Get details of a specific hackathon by ID.
+    `fields` / `expand` return (and load) only the given fields.
+    Answers 304 to an If-None-Match naming the hackathon's current ETag.
     """
-    hackathon = db.query(Hackathon).filter(Hackathon.id == hackathon_id).first()
+    paths = embedded_paths(Hackathon, fields.embedded)
+    cache.check(await db.scalar(entity_etag(Hackathon, hackathon_id, paths)))
+    result = await db.execute(
+        select(Hackathon)
+        .options(*fields.options("detail"))
+        .where(Hackathon.id == hackathon_id)
+    )
+    hackathon = result.scalar_one_or_none()
     if not hackathon:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
         )
-    return hackathon
+    return fields.render(hackathon, response)
 
 
 @router.put(
@@ -122,23 +267,22 @@ def get_hackathon(hackathon_id: uuid.UUID, db: Session = Depends(get_db)):
 def update_hackathon(
     hackathon_id: uuid.UUID,
     hackathon_in: HackathonUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(if_match_version),
     db: Session = Depends(get_db),
 ):
     """
     Update an existing hackathon. Only accessible by admin users.
+    Send the hackathon's ETag as If-Match to get 409 instead of overwriting a
+    concurrent change.
     """
-    db_hackathon = db.query(Hackathon).filter(Hackathon.id == hackathon_id).first()
-    if not db_hackathon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
-        )
-
     update_data = hackathon_in.model_dump(exclude_unset=True)
 
-    # Validate dates if both are provided in the update
-    new_start_date = update_data.get("start_date", db_hackathon.start_date)
-    new_end_date = update_data.get("end_date", db_hackathon.end_date)
-    if new_start_date >= new_end_date:
+    # Start must stay before end; checked against the stored dates in the UPDATE
+    # itself when only one of them changes
+    start = update_data.get("start_date")
+    end = update_data.get("end_date")
+    if start is not None and end is not None and start >= end:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Start date must be before end date.",
@@ -155,20 +299,37 @@ def update_hackathon(
                 detail=f"Organizer with id {update_data['organizer_id']} not found.",
             )
 
-    for key, value in update_data.items():
-        setattr(db_hackathon, key, value)
+    stmt = versioned_update(Hackathon, hackathon_id, update_data, expected_version)
+    if (start is None) != (end is None):
+        new_start = Hackathon.start_date if start is None else literal(start)
+        new_end = Hackathon.end_date if end is None else literal(end)
+        stmt = stmt.where(new_start < new_end)
 
     try:
-        db.add(db_hackathon)
+        row = fetch_updated(db, Hackathon, stmt)
+        if row is None:
+            db.rollback()
+            check_update_conflict(
+                db, Hackathon, hackathon_id, expected_version, "Hackathon not found"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Start date must be before end date.",
+            )
+        if "max_participants" in update_data:
+            # Seats added (or the limit lifted): move the waitlist up
+            registration_service.promote_waitlisted(db, hackathon_id)
         db.commit()
-        db.refresh(db_hackathon)
-        return db_hackathon
     except IntegrityError:
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Hackathon name already exists or other integrity violation during update.",
         )
+    # The voting window / settings may have changed
+    voting_service.buffer.invalidate(hackathon_id)
+    set_etag(response, row.Hackathon.version)
+    return row.Hackathon
 
 
 @router.delete(
@@ -214,62 +375,9 @@ def withdraw_registration(
 ):
     """
     Withdraw registration from a hackathon. Only accessible by participants.
+    A freed seat goes to the oldest waitlisted registration.
     """
-    db_hackathon = db.query(Hackathon).filter(Hackathon.id == hackathon_id).first()
-    if not db_hackathon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
-        )
-
-    # Check deadline
-    if (
-        db_hackathon.registration_deadline
-        and db_hackathon.registration_deadline < datetime.now(timezone.utc)
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Registration deadline has passed.",
-        )
-
-    # Try to find solo registration
-    reg = (
-        db.query(HackathonRegistration)
-        .filter(
-            HackathonRegistration.hackathon_id == hackathon_id,
-            HackathonRegistration.user_id == current_user.id,
-        )
-        .first()
-    )
-
-    # If not found, try to find team registration where user is owner/admin
-    if not reg:
-        user_team_ids = [
-            m.team_id
-            for m in db.query(TeamMember)
-            .filter(
-                TeamMember.user_id == current_user.id,
-                TeamMember.role.in_([TeamMemberRole.owner, TeamMemberRole.admin]),
-            )
-            .all()
-        ]
-        if user_team_ids:
-            reg = (
-                db.query(HackathonRegistration)
-                .filter(
-                    HackathonRegistration.hackathon_id == hackathon_id,
-                    HackathonRegistration.team_id.in_(user_team_ids),
-                )
-                .first()
-            )
-
-    if not reg:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No registration found for user or their teams.",
-        )
-
-    db.delete(reg)
-    db.commit()
+    registration_service.withdraw(db, hackathon_id, current_user)
     return
 
 
@@ -287,231 +395,8 @@ def register_participant_for_hackathon(
 ):
     """
     Register a participant for a hackathon. Only accessible by participants.
+    Once max_participants registrations are in, new ones are waitlisted.
     """
-    db_hackathon = db.query(Hackathon).filter(Hackathon.id == hackathon_id).first()
-    if not db_hackathon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
-        )
-
-    # --- Validation Checks for Hackathon ---
-    if db_hackathon.status not in [HackathonStatus.UPCOMING, HackathonStatus.ACTIVE]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Hackathon is not open for registration.",
-        )
-    if (
-        db_hackathon.registration_deadline
-        and db_hackathon.registration_deadline < datetime.now(timezone.utc)
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Registration deadline has passed.",
-        )
-
-    participant_name_for_project = ""
-    db_user_to_register = None
-    db_team_to_register = None
-
-    if registration_in.user_id:
-        # --- SOLO REGISTRATION ---
-        if not db_hackathon.allow_individuals:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Solo participation is not allowed for this hackathon.",
-            )
-
-        db_user_to_register = (
-            db.query(User).filter(User.id == registration_in.user_id).first()
-        )
-        if not db_user_to_register:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User to register not found.",
-            )
-
-        # Authorization: Current user must be the user being registered or an admin
-        if current_user.id != db_user_to_register.id and not any(
-            r.role == "admin" for r in getattr(current_user, "roles_association", [])
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to register this user.",
-            )
-
-        # Check if user is already registered (solo)
-        existing_solo_registration = (
-            db.query(HackathonRegistration)
-            .filter(
-                HackathonRegistration.hackathon_id == hackathon_id,
-                HackathonRegistration.user_id == db_user_to_register.id,
-            )
-            .first()
-        )
-        if existing_solo_registration:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="User is already registered solo for this hackathon.",
-            )
-
-        # Check if user is part of any team already registered for this hackathon
-        user_teams = (
-            db.query(TeamMember)
-            .filter(TeamMember.user_id == db_user_to_register.id)
-            .all()
-        )
-        user_team_ids = [ut.team_id for ut in user_teams]
-        if user_team_ids:
-            existing_team_registration_for_user = (
-                db.query(HackathonRegistration)
-                .filter(
-                    HackathonRegistration.hackathon_id == hackathon_id,
-                    HackathonRegistration.team_id.in_(user_team_ids),
-                )
-                .first()
-            )
-            if existing_team_registration_for_user:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="User is already participating in this hackathon with a team.",
-                )
-
-        participant_name_for_project = db_user_to_register.username
-
-    elif registration_in.team_id:
-        # --- TEAM REGISTRATION ---
-        db_team_to_register = (
-            db.query(Team).filter(Team.id == registration_in.team_id).first()
-        )
-        if not db_team_to_register:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Team to register not found.",
-            )
-
-        # Authorization: Check if current_user is an owner of the team or a platform admin
-        team_membership = (
-            db.query(TeamMember)
-            .filter(
-                TeamMember.team_id == db_team_to_register.id,
-                TeamMember.user_id == current_user.id,
-            )
-            .first()
-        )
-
-        is_team_owner = team_membership and team_membership.role == TeamMemberRole.owner
-        is_platform_admin = any(
-            r.role == "admin" for r in getattr(current_user, "roles_association", [])
-        )
-
-        if not (is_team_owner or is_platform_admin):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User must be an owner of the team or a platform admin to register it.",
-            )
-
-        # Team size constraints
-        if (
-            db_hackathon.min_team_size
-            and len(db_team_to_register.members) < db_hackathon.min_team_size
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Team size is less than the minimum of {db_hackathon.min_team_size}.",
-            )
-        if (
-            db_hackathon.max_team_size
-            and len(db_team_to_register.members) > db_hackathon.max_team_size
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Team size exceeds the maximum of {db_hackathon.max_team_size}.",
-            )
-
-        # Check if team is already registered
-        existing_team_registration = (
-            db.query(HackathonRegistration)
-            .filter(
-                HackathonRegistration.hackathon_id == hackathon_id,
-                HackathonRegistration.team_id == db_team_to_register.id,
-            )
-            .first()
-        )
-        if existing_team_registration:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Team is already registered for this hackathon.",
-            )
-
-        # Check if any member of this team is already registered solo for this hackathon
-        team_member_user_ids = [
-            member.user_id for member in db_team_to_register.members
-        ]
-        if team_member_user_ids:
-            existing_solo_registration_for_member = (
-                db.query(HackathonRegistration)
-                .filter(
-                    HackathonRegistration.hackathon_id == hackathon_id,
-                    HackathonRegistration.user_id.in_(team_member_user_ids),
-                )
-                .first()
-            )
-            if existing_solo_registration_for_member:
-                # Find which user to include in the error message
-                offending_user = (
-                    db.query(User)
-                    .filter(User.id == existing_solo_registration_for_member.user_id)
-                    .first()
-                )
-                offending_username = (
-                    offending_user.username if offending_user else "A team member"
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"{offending_username} is already registered solo for this hackathon. Cannot register team.",
-                )
-
-        participant_name_for_project = db_team_to_register.name
-
-    else:
-        # Should be caught by Pydantic model_validator, but as a safeguard:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid registration data: user_id or team_id must be provided.",
-        )
-
-    # --- Create Project and Registration ---
-    project_name = f"{participant_name_for_project}'s entry for {db_hackathon.name}"
-    db_project = Project(name=project_name, status=ProjectStatus.DRAFT)
-
-    try:
-        db.add(db_project)
-        db.flush()
-
-        db_registration = HackathonRegistration(
-            hackathon_id=hackathon_id,
-            user_id=db_user_to_register.id if db_user_to_register else None,
-            team_id=db_team_to_register.id if db_team_to_register else None,
-            project_id=db_project.id,
-            status="registered",
-        )
-        db.add(db_registration)
-
-        db.commit()
-        db.refresh(db_registration)
-        return db_registration
-
-    except IntegrityError as e:
-        db.rollback()
-        # This could happen if the project name isn't unique (if we add such a constraint per hackathon)
-        # or other DB integrity issues.
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Database integrity error during registration: {e}",
-        )
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"An unexpected error occurred: {e}",
-        )
+    return registration_service.register(
+        db, hackathon_id, registration_in, current_user
+    )
@@ -1,17 +1,41 @@
 # routers/judging.py
 import uuid
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 
 from app.database import get_db
+from app.db_routing import get_async_read_db
+from app.utils.concurrency import if_match_version, set_etag
+from app.utils.http_cache import Conditional, conditional, page_etag
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    finish_page,
+    paginate,
+)
 from app.models.user import User, UserRole
 from app.models.project import Project  # To check if project exists
-from app.models.judging import Criterion, Score  # SQLAlchemy models
+from app.models.hackathon import Hackathon
+from app.schemas.hackathon import VotingType
+from app.models.judging import Criterion, LeaderboardEntry, Score  # SQLAlchemy models
 from app.schemas.judging import (
+    AgreementReportRead,
+    AggregatedResultRead,
+    AssignmentPlanRequest,
+    AssignmentPlanSummary,
     CriterionCreate,
     CriterionRead,
+    LeaderboardEntryRead,
+    PairwiseComparisonCreate,
+    PairwiseComparisonRead,
+    PairwiseNextPair,
+    PairwiseRankingEntry,
+    QueueItem,
     ScoreCreate,
     ScoreRead,
     ScoreUpdate,
@@ -26,10 +50,20 @@ from app.services.judging_service import (
     update_score,
     list_scores_for_project,
     list_scores_by_judge,
+    SCORES_BY_JUDGE_KEY,
+)
+from app.services import assignment_service, judge_agreement, pairwise_service
+from app.services.score_aggregation import (
+    NORMALIZATION_METHODS,
+    rank_projects,
+    score_rows_query,
 )
 
 router = APIRouter(tags=["judging"])
 
+# Criteria are public and rarely edited: clients may reuse a page for a minute
+CRITERIA_CACHE_CONTROL = "public, max-age=60"
+
 
 # --- Criterion Endpoints (Admin-focused) ---
 @router.post(
@@ -48,10 +82,27 @@ def create_criterion_endpoint(
 
 
 @router.get("/criteria/", response_model=List[CriterionRead])
-def list_criteria(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List all judging criteria. Public endpoint."""
-    criteria = db.query(Criterion).offset(skip).limit(limit).all()
-    return criteria
+def list_criteria(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
+    cache: Conditional = Depends(conditional(CRITERIA_CACHE_CONTROL)),
+    db: Session = Depends(get_db),
+):
+    """
+    List judging criteria in creation order. Public endpoint.
+    Answers 304 to an If-None-Match naming the page's current ETag.
+    """
+    key = (Criterion.created_at, Criterion.id)
+    ids = paginate(
+        select(Criterion.id), key, limit, cursor, descending=False, skip=skip
+    )
+    cache.check(db.scalar(page_etag(Criterion, ids)))
+    criteria = paginate(
+        db.query(Criterion), key, limit, cursor, descending=False, skip=skip
+    ).all()
+    return finish_page(criteria, key, limit, response)
 
 
 @router.get("/criteria/{criterion_id}", response_model=CriterionRead)
@@ -119,19 +170,26 @@ def submit_score_endpoint(
 def update_score_endpoint(
     score_id: uuid.UUID,
     score_in: ScoreUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(if_match_version),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Update a score. Only accessible by judges or admins."""
-    return update_score(db, score_id, score_in, current_user)
+    """
+    Update a score. Only accessible by judges or admins. Send the score's
+    version as If-Match ("3") to get 409 instead of overwriting a concurrent change.
+    """
+    score = update_score(db, score_id, score_in, current_user, expected_version)
+    set_etag(response, score.version)
+    return score
 
 
 @router.get("/scores/project/{project_id}", response_model=List[ScoreRead])
-def list_scores_for_project_endpoint(
-    project_id: uuid.UUID, db: Session = Depends(get_db)
+async def list_scores_for_project_endpoint(
+    project_id: uuid.UUID, db: AsyncSession = Depends(get_async_read_db)
 ):
     """List all scores for a project. Public endpoint."""
-    return list_scores_for_project(db, project_id)
+    return await list_scores_for_project(db, project_id)
 
 
 @router.get(
@@ -141,15 +199,226 @@ def list_scores_for_project_endpoint(
 )
 def list_scores_by_judge_endpoint(
     judge_id: uuid.UUID,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """List all scores submitted by a judge. Only accessible by the judge themselves or admins."""
-    return list_scores_by_judge(db, judge_id, current_user)
+    scores = list_scores_by_judge(db, judge_id, current_user, limit, cursor)
+    return finish_page(scores, SCORES_BY_JUDGE_KEY, limit, response)
+
+
+# --- Results ---
+@router.get(
+    "/results/hackathon/{hackathon_id}", response_model=List[LeaderboardEntryRead]
+)
+async def hackathon_results(
+    hackathon_id: uuid.UUID,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Ranking of a hackathon's scored projects by weighted average score, best
+    first. Served from the materialized leaderboard. Public endpoint.
+    """
+    exists = await db.scalar(select(Hackathon.id).where(Hackathon.id == hackathon_id))
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
+        )
+    key = (LeaderboardEntry.weighted_average, LeaderboardEntry.project_id)
+    stmt = (
+        select(LeaderboardEntry)
+        .options(joinedload(LeaderboardEntry.project).load_only(Project.name))
+        .where(
+            LeaderboardEntry.hackathon_id == hackathon_id,
+            LeaderboardEntry.weighted_average.is_not(None),
+        )
+    )
+    result = await db.execute(paginate(stmt, key, limit, cursor))
+    return finish_page(result.scalars().all(), key, limit, response)
+
+
+@router.get(
+    "/results/hackathon/{hackathon_id}/normalized",
+    response_model=List[AggregatedResultRead],
+)
+async def hackathon_normalized_results(
+    hackathon_id: uuid.UUID,
+    method: str = Query("zscore", description="zscore, minmax or none"),
+    confidence: float = Query(0.95, gt=0, lt=1),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Ranking with every judge's scores normalized (per-judge z-score or min-max)
+    and a confidence interval from the agreement between judges. Public endpoint.
+    """
+    if method not in NORMALIZATION_METHODS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"method must be one of {', '.join(NORMALIZATION_METHODS)}",
+        )
+    exists = await db.scalar(select(Hackathon.id).where(Hackathon.id == hackathon_id))
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
+        )
+    rows = (await db.execute(score_rows_query(hackathon_id))).all()
+    # The NumPy work is CPU bound; keep it off the event loop
+    return await run_in_threadpool(rank_projects, rows, method, confidence)
+
+
+@router.get(
+    "/results/hackathon/{hackathon_id}/agreement",
+    response_model=AgreementReportRead,
+    dependencies=[require_roles([UserRole.ADMIN, UserRole.ORGANIZER])],
+)
+async def hackathon_judge_agreement(
+    hackathon_id: uuid.UUID, db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Inter-rater agreement (ICC, Kendall's W) and per-judge bias / variance, to
+    spot outlier judges before publishing results. Recomputed only when the
+    hackathon's scores or criteria changed since the last request.
+    """
+    exists = await db.scalar(select(Hackathon.id).where(Hackathon.id == hackathon_id))
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
+        )
+    version = tuple(
+        (await db.execute(judge_agreement.score_version_query(hackathon_id))).one()
+    )
+    report = judge_agreement.cached_report(hackathon_id, version)
+    if report is not None:
+        return report
+    rows = (await db.execute(score_rows_query(hackathon_id))).all()
+    return await run_in_threadpool(
+        judge_agreement.compute_report, hackathon_id, version, rows
+    )
+
+
+# --- Pairwise judging (voting_type "pairwise") ---
+@router.get(
+    "/pairwise/{hackathon_id}/next-pair",
+    response_model=PairwiseNextPair,
+    dependencies=[require_roles([UserRole.JUDGE, UserRole.ADMIN])],
+)
+def pairwise_next_pair(
+    hackathon_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """The most informative pair of projects for the current judge to compare."""
+    return pairwise_service.next_pair(db, hackathon_id, current_user)
 
 
-# Consider adding an endpoint to get aggregated results for a project
-# e.g., /results/project/{project_id}
+@router.post(
+    "/pairwise/{hackathon_id}/comparisons",
+    response_model=PairwiseComparisonRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[require_roles([UserRole.JUDGE, UserRole.ADMIN])],
+)
+def submit_pairwise_comparison(
+    hackathon_id: uuid.UUID,
+    comparison_in: PairwiseComparisonCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Record which of two projects the current judge prefers."""
+    return pairwise_service.record_comparison(
+        db, hackathon_id, comparison_in, current_user
+    )
+
+
+@router.get(
+    "/pairwise/{hackathon_id}/ranking", response_model=List[PairwiseRankingEntry]
+)
+async def pairwise_ranking(
+    hackathon_id: uuid.UUID, db: AsyncSession = Depends(get_async_read_db)
+):
+    """Bradley-Terry ranking of the hackathon's projects. Public endpoint."""
+    voting_type = await db.scalar(
+        select(Hackathon.voting_type).where(Hackathon.id == hackathon_id)
+    )
+    if voting_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
+        )
+    if voting_type != VotingType.pairwise.value:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This hackathon does not use pairwise judging.",
+        )
+    project_ids = (
+        await db.scalars(pairwise_service.project_ids_query(hackathon_id))
+    ).all()
+    comparisons = pairwise_service.comparison_rows_query(hackathon_id)
+    rows = (await db.execute(comparisons)).all()
+    return await run_in_threadpool(
+        pairwise_service.ranking, hackathon_id, project_ids, rows
+    )
+
+
+# --- Judge assignment (review queues) ---
+@router.post(
+    "/assignments/{hackathon_id}/plan",
+    response_model=AssignmentPlanSummary,
+    dependencies=[require_roles([UserRole.ADMIN, UserRole.ORGANIZER])],
+)
+def plan_judge_assignments(
+    hackathon_id: uuid.UUID,
+    plan_in: AssignmentPlanRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Fill every project of the hackathon up to reviews_per_project judges,
+    balancing load and skipping judges with a conflict of interest. Existing
+    assignments are kept, so calling it again only fills the gaps.
+    """
+    return assignment_service.plan_hackathon(
+        db,
+        hackathon_id,
+        plan_in.reviews_per_project,
+        plan_in.judge_ids,
+        plan_in.max_per_judge,
+    )
+
+
+@router.delete(
+    "/assignments/{hackathon_id}/judges/{judge_id}",
+    response_model=AssignmentPlanSummary,
+    dependencies=[require_roles([UserRole.ADMIN, UserRole.ORGANIZER])],
+)
+def drop_judge_from_assignments(
+    hackathon_id: uuid.UUID,
+    judge_id: uuid.UUID,
+    reviews_per_project: int = Query(3, ge=1, le=50),
+    max_per_judge: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+):
+    """Release a judge's unreviewed projects and reassign them to the others."""
+    return assignment_service.drop_judge(
+        db, hackathon_id, judge_id, reviews_per_project, max_per_judge
+    )
+
+
+@router.get(
+    "/assignments/{hackathon_id}/my-queue",
+    response_model=List[QueueItem],
+    dependencies=[require_roles([UserRole.JUDGE, UserRole.ADMIN])],
+)
+def my_review_queue(
+    hackathon_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """The current judge's assigned projects in review order."""
+    return assignment_service.judge_queue(db, hackathon_id, current_user.id)
 
 
 @router.get("/check-judge", dependencies=[require_judge()])
@@ -0,0 +1,69 @@
+# routers/live.py
+import uuid
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app.broadcast import broadcaster
+from app.logger import get_logger
+
+logger = get_logger("live")
+
+router = APIRouter(tags=["live"])
+
+# Sent instead of a message when nothing changed for LIVE_HEARTBEAT_S, so
+# proxies keep the connection open and dead clients are noticed
+SSE_HEARTBEAT = ": heartbeat\n\n"
+WS_HEARTBEAT = '{"type":"heartbeat"}'
+
+
+async def _subscribe(hackathon_id: uuid.UUID):
+    try:
+        return await broadcaster.subscribe(hackathon_id)
+    except LookupError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
+        )
+
+
+@router.get("/hackathons/{hackathon_id}/events")
+async def hackathon_events(hackathon_id: uuid.UUID):
+    """
+    Server-sent events with the hackathon's leaderboard and vote tallies: a
+    "snapshot" with the full state first, then coalesced "update" messages with
+    the projects that changed. Public endpoint.
+    """
+    subscription = await _subscribe(hackathon_id)
+
+    async def events():
+        try:
+            async for message in subscription.messages():
+                yield SSE_HEARTBEAT if message is None else f"data: {message}\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/hackathons/{hackathon_id}/ws")
+async def hackathon_socket(websocket: WebSocket, hackathon_id: uuid.UUID):
+    """The messages of GET /live/hackathons/{id}/events over a WebSocket."""
+    try:
+        subscription = await broadcaster.subscribe(hackathon_id)
+    except LookupError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    try:
+        await websocket.accept()
+        async for message in subscription.messages():
+            await websocket.send_text(WS_HEARTBEAT if message is None else message)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.warning(f"Live socket for hackathon {hackathon_id} closed: {e}")
+    finally:
+        subscription.close()
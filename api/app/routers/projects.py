@@ -11,7 +11,10 @@ from fastapi import (
     File,
     Query,
     Form,
+    Response,
 )
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 import os
@@ -22,6 +25,28 @@ import shutil
 import sys
 import logging
 from app.database import get_db
+from app.db_routing import get_async_read_db
+from app.loaders import loader_options
+from app.utils.concurrency import (
+    check_update_conflict,
+    fetch_updated,
+    if_match_version,
+    set_etag,
+    versioned_update,
+)
+from app.utils.http_cache import (
+    Conditional,
+    conditional,
+    embedded_paths,
+    entity_etag,
+    page_etag,
+)
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    finish_page,
+    paginate,
+)
 from datetime import datetime, timezone  # Added datetime, timezone
 from app.models.user import User, UserRole
 from app.models.team import Team, TeamMember, TeamMemberRole
@@ -186,7 +211,6 @@ def create_project_template(
         db_template = ProjectTemplate(**template_in.model_dump())
         db.add(db_template)
         db.commit()
-        db.refresh(db_template)
         return db_template
     except IntegrityError:
         db.rollback()
@@ -200,13 +224,20 @@ def create_project_template(
     "/templates/", response_model=List[ProjectTemplateRead], tags=["project-templates"]
 )
 def list_project_templates(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
+    db: Session = Depends(get_db),
 ):
     """
-    List all project templates.
+    List project templates in creation order.
     """
-    templates = db.query(ProjectTemplate).offset(skip).limit(limit).all()
-    return templates
+    key = (ProjectTemplate.created_at, ProjectTemplate.id)
+    stmt = paginate(
+        db.query(ProjectTemplate), key, limit, cursor, descending=False, skip=skip
+    )
+    return finish_page(stmt.all(), key, limit, response)
 
 
 # --- Project Endpoints ---
@@ -228,24 +259,45 @@ def create_project_endpoint(
 
 
 @router.get("/", response_model=List[ProjectRead])
-def list_projects(
-    skip: int = 0,
-    limit: int = 100,
+async def list_projects(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
     hackathon_id: Optional[uuid.UUID] = None,
-    db: Session = Depends(get_db),
+    cache: Conditional = Depends(conditional()),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    """List all projects. Can be filtered by hackathon."""
-    query = db.query(Project)
-    if hackathon_id:
-        query = query.filter(Project.hackathon_id == hackathon_id)
-    projects = query.offset(skip).limit(limit).all()
-    return projects
+    """
+    List projects, newest first. Can be filtered by hackathon.
+    Answers 304 to an If-None-Match naming the page's current ETag.
+    """
+    filters = [Project.hackathon_id == hackathon_id] if hackathon_id else []
+    key = (Project.created_at, Project.id)
+    ids = paginate(select(Project.id).where(*filters), key, limit, cursor, skip=skip)
+    cache.check(await db.scalar(page_etag(Project, ids, embedded_paths(Project))))
+    stmt = select(Project).options(*loader_options(Project, "card")).where(*filters)
+    result = await db.execute(paginate(stmt, key, limit, cursor, skip=skip))
+    return finish_page(result.scalars().all(), key, limit, response)
 
 
 @router.get("/{project_id}", response_model=ProjectRead)
-def get_project(project_id: uuid.UUID, db: Session = Depends(get_db)):
-    """Get details of a specific project."""
-    project = db.query(Project).filter(Project.id == project_id).first()
+def get_project(
+    project_id: uuid.UUID,
+    cache: Conditional = Depends(conditional()),
+    db: Session = Depends(get_db),
+):
+    """
+    Get details of a specific project.
+    Answers 304 to an If-None-Match naming the project's current ETag.
+    """
+    cache.check(db.scalar(entity_etag(Project, project_id, embedded_paths(Project))))
+    project = (
+        db.query(Project)
+        .options(*loader_options(Project, "detail"))
+        .filter(Project.id == project_id)
+        .first()
+    )
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
@@ -255,44 +307,44 @@ def get_project(project_id: uuid.UUID, db: Session = Depends(get_db)):
 def update_project(
     project_id: uuid.UUID,
     project_in: ProjectUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(if_match_version),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Update a project. Only accessible by admin, organizer, or team owner."""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    # Check if user has permission to update
+    """
+    Update a project. Only accessible by admin, organizer, or team owner.
+    Send the project's ETag as If-Match to get 409 instead of overwriting a
+    concurrent change.
+    """
     is_admin = any(r.role == UserRole.ADMIN for r in current_user.roles_association)
     is_organizer = any(
         r.role == UserRole.ORGANIZER for r in current_user.roles_association
     )
 
+    update_data = project_in.model_dump(exclude_unset=True)
+    stmt = versioned_update(Project, project_id, update_data, expected_version)
     if not (is_admin or is_organizer):
-        # Check if user is team owner
-        team_member = (
-            db.query(TeamMember)
-            .filter(
-                TeamMember.team_id == project.team_id,
+        # Team owners only: checked in the UPDATE itself
+        stmt = stmt.where(
+            exists().where(
+                TeamMember.team_id == Project.team_id,
                 TeamMember.user_id == current_user.id,
                 TeamMember.role == TeamMemberRole.owner,
             )
-            .first()
         )
-        if not team_member:
-            raise HTTPException(
-                status_code=403, detail="Not authorized to update this project"
-            )
-
-    update_data = project_in.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(project, key, value)
-
-    db.add(project)
+    row = fetch_updated(db, Project, stmt)
+    if row is None:
+        db.rollback()
+        check_update_conflict(
+            db, Project, project_id, expected_version, "Project not found"
+        )
+        raise HTTPException(
+            status_code=403, detail="Not authorized to update this project"
+        )
     db.commit()
-    db.refresh(project)
-    return project
+    set_etag(response, row.Project.version)
+    return row.Project
 
 
 @router.delete(
@@ -379,25 +431,27 @@ async def submit_project_version_endpoint(
 @router.get("/{project_id}/versions", response_model=List[ProjectVersionRead])
 def list_project_versions(
     project_id: uuid.UUID,
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
     db: Session = Depends(get_db),
 ):
-    """List all versions of a project."""
+    """List versions of a project, newest first."""
     project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    versions = (
-        db.query(ProjectVersion)
-        .filter(ProjectVersion.project_id == project_id)
-        .order_by(ProjectVersion.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    key = (ProjectVersion.created_at, ProjectVersion.id)
+    versions = paginate(
+        db.query(ProjectVersion).filter(ProjectVersion.project_id == project_id),
+        key,
+        limit,
+        cursor,
+        skip=skip,
+    ).all()
 
-    return versions
+    return finish_page(versions, key, limit, response)
 
 
 @router.get("/{project_id}/versions/{version_id}", response_model=ProjectVersionRead)
@@ -0,0 +1,158 @@
+"""
+Ranked search over hackathons, projects, teams and users.
+
+Hackathons, projects and teams carry a generated search_vector column (name
+weighted highest, then category/tags, then description) with a GIN index; `q`
+is parsed like a web search (words, "quoted phrases", -excluded, or). Users are
+matched fuzzily on username and email through pg_trgm, so typos and fragments
+still find them.
+
+Results are ordered by relevance and paginated by keyset on (rank, id) like the
+list endpoints: pass the X-Next-Cursor header of a page as `cursor`.
+"""
+
+import uuid
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import Float, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.db_routing import get_async_read_db
+from app.middleware import require_admin
+from app.models.hackathon import Hackathon
+from app.models.project import Project
+from app.models.team import Team, TeamStatus
+from app.models.user import User
+from app.schemas.search import (
+    HackathonSearchHit,
+    ProjectSearchHit,
+    TeamSearchHit,
+    UserSearchHit,
+)
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    finish_page,
+    paginate,
+)
+
+router = APIRouter(tags=["search"])
+
+# Text search configuration of the search_vector columns (init.sql)
+SEARCH_CONFIG = "english"
+MAX_QUERY_LENGTH = 200
+
+
+def _ranked(model, q: str):
+    """The match condition and the rank column for a full-text query."""
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    matches = model.search_vector.op("@@")(query)
+    rank = func.ts_rank_cd(model.search_vector, query, type_=Float).label("rank")
+    return matches, rank
+
+
+async def _search(db: AsyncSession, stmt, key, limit, cursor, response) -> list:
+    result = await db.execute(paginate(stmt, key, limit, cursor))
+    return finish_page(result.all(), key, limit, response)
+
+
+@router.get("/hackathons", response_model=List[HackathonSearchHit])
+async def search_hackathons(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=MAX_QUERY_LENGTH),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Search public hackathons by name, category, tags and description."""
+    matches, rank = _ranked(Hackathon, q)
+    stmt = select(
+        Hackathon.id,
+        Hackathon.name,
+        Hackathon.status,
+        Hackathon.start_date,
+        Hackathon.category,
+        Hackathon.tags,
+        rank,
+    ).where(matches, Hackathon.is_public.is_(True))
+    return await _search(db, stmt, (rank, Hackathon.id), limit, cursor, response)
+
+
+@router.get("/projects", response_model=List[ProjectSearchHit])
+async def search_projects(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=MAX_QUERY_LENGTH),
+    hackathon_id: Optional[uuid.UUID] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Search projects by name and description, optionally in one hackathon."""
+    matches, rank = _ranked(Project, q)
+    stmt = select(
+        Project.id,
+        Project.name,
+        Project.hackathon_id,
+        Project.team_id,
+        Project.status,
+        rank,
+    ).where(matches)
+    if hackathon_id:
+        stmt = stmt.where(Project.hackathon_id == hackathon_id)
+    return await _search(db, stmt, (rank, Project.id), limit, cursor, response)
+
+
+@router.get("/teams", response_model=List[TeamSearchHit])
+async def search_teams(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=MAX_QUERY_LENGTH),
+    hackathon_id: Optional[uuid.UUID] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Search active teams by name and description, optionally in one hackathon."""
+    matches, rank = _ranked(Team, q)
+    stmt = select(Team.id, Team.name, Team.hackathon_id, rank).where(
+        matches, Team.status == TeamStatus.active
+    )
+    if hackathon_id:
+        stmt = stmt.where(Team.hackathon_id == hackathon_id)
+    return await _search(db, stmt, (rank, Team.id), limit, cursor, response)
+
+
+@router.get(
+    "/users", response_model=List[UserSearchHit], dependencies=[require_admin()]
+)
+def search_users(
+    response: Response,
+    q: str = Query(..., min_length=3, max_length=MAX_QUERY_LENGTH),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Find users whose username or email contains q or resembles it (trigram
+    similarity), most similar first. Only accessible by admin users.
+    """
+    pattern = "%{}%".format(
+        q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    )
+    rank = func.greatest(
+        func.similarity(User.username, q), func.similarity(User.email, q), type_=Float
+    ).label("rank")
+    # Each branch can use the trigram GIN index of its column
+    stmt = select(User.id, User.username, User.email, User.full_name, rank).where(
+        or_(
+            User.username.ilike(pattern, escape="\\"),
+            User.email.ilike(pattern, escape="\\"),
+            User.username.op("%")(q),
+            User.email.op("%")(q),
+        )
+    )
+    key = (rank, User.id)
+    rows = db.execute(paginate(stmt, key, limit, cursor)).all()
+    return finish_page(rows, key, limit, response)
@@ -1,10 +1,17 @@
-from typing import List, Any
+from typing import List, Any, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import Query, Response
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    finish_page,
+    paginate,
+)
 from app.models.submission import Submission
 from app.models.user import User, UserRole
 from app.schemas.submission import SubmissionCreate, SubmissionRead, SubmissionUpdate
@@ -49,7 +56,6 @@ def create_submission(
     )
     db.add(submission)
     db.commit()
-    db.refresh(submission)
     return submission
 
 
@@ -60,11 +66,15 @@ def create_submission(
 )
 def list_submissions_for_project(
     project_id: UUID,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_project_team_member_or_admin),
 ) -> List[Submission]:
     """
-    List all submissions for a specific project.
+    List the submissions for a specific project, oldest first (submission ids
+    are UUIDv7, i.e. ordered by creation time).
     Only accessible by project team members or admins.
     """
     project = db.query(Project).filter(Project.id == project_id).first()
@@ -73,7 +83,15 @@ def list_submissions_for_project(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with id {project_id} not found",
         )
-    return project.submissions
+    key = (Submission.id,)
+    submissions = paginate(
+        db.query(Submission).filter(Submission.project_id == project_id),
+        key,
+        limit,
+        cursor,
+        descending=False,
+    ).all()
+    return finish_page(submissions, key, limit, response)
 
 
 @router.get(
@@ -127,7 +145,6 @@ def update_submission(
 
     db.add(submission)
     db.commit()
-    db.refresh(submission)
     return submission
 
 
@@ -1,6 +1,14 @@
 import psutil
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import text
+from sqlalchemy.orm import Session
 from app.logger import get_logger
+from app.database import async_engine, engine, get_db, pool_settings
+from app.db_routing import replica_router
+from app.pool_metrics import pool_stats
+from app.slow_queries import slow_query_log
+from app.write_latency import write_latency_log
+from app.middleware import require_admin
 
 router = APIRouter(tags=["admin", "system-metrics"])
 logger = get_logger("system_metrics")
@@ -43,3 +51,97 @@ async def get_system_metrics(
     except Exception as e:
         logger.error(f"Error in /system-metrics: {e}", exc_info=True)
         return {"error": "Internal server error. Check backend logs for details."}
+
+
+
+@router.get("/db-pool", dependencies=[require_admin()])
+def get_db_pool_stats(db: Session = Depends(get_db)):
+    """
+    Connection pool statistics of this worker (checked-out connections, overflow,
+    wait times, connection ages) together with the configured limits and the
+    server's max_connections, for sizing the pool across all uvicorn workers.
+    """
+    settings = pool_settings()
+    server_max_connections = None
+    try:
+        server_max_connections = int(db.execute(text("SHOW max_connections")).scalar_one())
+    except Exception as e:
+        logger.error(f"Could not read max_connections: {e}")
+    return {
+        "settings": settings,
+        "pool": pool_stats(engine.pool),
+        "async_pool": pool_stats(async_engine.pool),
+        "server_max_connections": server_max_connections,
+        "headroom": (
+            server_max_connections - settings["max_connections_all_workers"]
+            if server_max_connections is not None
+            else None
+        ),
+    }
+
+
+@router.get("/db-replicas", dependencies=[require_admin()])
+async def get_db_replica_stats(refresh: bool = False):
+    """
+    Read-replica routing state of this worker: measured replication lag, health
+    and pool usage per replica. Pass refresh=true to measure the lag right away
+    instead of returning the last value of the background monitor.
+    """
+    if refresh:
+        await replica_router.check_lag()
+    return replica_router.stats()
+
+
+@router.get("/slow-queries", dependencies=[require_admin()])
+def get_slow_queries(limit: int = 20, order_by: str = "total_ms"):
+    """
+    Slowest statement fingerprints seen by this worker, with parameter shapes,
+    originating routes and the last captured EXPLAIN (ANALYZE, BUFFERS) plan.
+    order_by: total_ms, max_ms or count.
+    """
+    if order_by not in ("total_ms", "max_ms", "count"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="order_by must be one of total_ms, max_ms, count",
+        )
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "explain_sample_rate": slow_query_log.sample_rate,
+        "queries": slow_query_log.top(limit, order_by),
+    }
+
+
+@router.delete(
+    "/slow-queries",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[require_admin()],
+)
+def reset_slow_queries():
+    """Clear the slow-query log of this worker."""
+    slow_query_log.reset()
+
+
+@router.get("/write-latency", dependencies=[require_admin()])
+def get_write_latency(limit: int = 20, order_by: str = "p95_ms"):
+    """
+    Latency of the POST/PUT/PATCH/DELETE endpoints seen by this worker: count,
+    5xx errors, average, p50/p95/p99 over the recent window, maximum, and the
+    average SQL time and statement count per request.
+    order_by: p95_ms, p99_ms, max_ms, total_ms or count.
+    """
+    if order_by not in ("p95_ms", "p99_ms", "max_ms", "total_ms", "count"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="order_by must be one of p95_ms, p99_ms, max_ms, total_ms, count",
+        )
+    return {"routes": write_latency_log.top(limit, order_by)}
+
+
+@router.delete(
+    "/write-latency",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[require_admin()],
+)
+def reset_write_latency():
+    """Clear the write latency figures of this worker."""
+    write_latency_log.reset()
@@ -1,12 +1,30 @@
 from typing import List, Optional
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 import secrets
 from app.logger import get_logger
 
 from app.database import get_db
+from app.db_routing import get_async_read_db
+from app.utils.fieldsets import Fieldset, fieldset
+from app.utils.concurrency import if_match_version, set_etag
+from app.utils.http_cache import (
+    Conditional,
+    conditional,
+    embedded_paths,
+    entity_etag,
+    page_etag,
+)
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    finish_page,
+    paginate,
+)
 from app.models.user import User, UserRole
 from app.models.team import (
     Team,
@@ -94,46 +112,73 @@ def create_team_endpoint(
 
 
 @router.get("/", response_model=List[TeamRead])
-def list_teams(
+async def list_teams(
     hackathon_id: uuid.UUID,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
+    fields: Fieldset = Depends(fieldset(Team, TeamRead)),
+    cache: Conditional = Depends(conditional()),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """
-    List all teams for a specific hackathon.
+    List the active teams of a specific hackathon, newest first.
+    `fields` / `expand` return (and load) only the given fields.
+    Answers 304 to an If-None-Match naming the page's current ETag.
     """
-    teams = (
-        db.query(Team)
-        .filter(Team.hackathon_id == hackathon_id, Team.status == TeamStatus.active)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
-    return teams
+    key = (Team.created_at, Team.id)
+    active = (Team.hackathon_id == hackathon_id, Team.status == TeamStatus.active)
+    ids = paginate(select(Team.id).where(*active), key, limit, cursor, skip=skip)
+    paths = embedded_paths(Team, fields.embedded)
+    cache.check(await db.scalar(page_etag(Team, ids, paths)))
+    stmt = select(Team).options(*fields.options("card", *key)).where(*active)
+    result = await db.execute(paginate(stmt, key, limit, cursor, skip=skip))
+    page = finish_page(result.scalars().all(), key, limit, response)
+    return fields.render(page, response)
 
 
 @router.get("/{team_id}", response_model=TeamRead)
-def get_team(team_id: uuid.UUID, db: Session = Depends(get_db)):
+def get_team(
+    team_id: uuid.UUID,
+    response: Response,
+    fields: Fieldset = Depends(fieldset(Team, TeamRead)),
+    cache: Conditional = Depends(conditional()),
+    db: Session = Depends(get_db),
+):
     """
     Get details of a specific team by ID.
+    `fields` / `expand` return (and load) only the given fields.
+    Answers 304 to an If-None-Match naming the team's current ETag.
     """
-    team = db.query(Team).filter(Team.id == team_id).first()
+    paths = embedded_paths(Team, fields.embedded)
+    cache.check(db.scalar(entity_etag(Team, team_id, paths)))
+    team = (
+        db.query(Team)
+        .options(*fields.options("detail"))
+        .filter(Team.id == team_id)
+        .first()
+    )
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Team not found"
         )
-    return team
+    return fields.render(team, response)
 
 
 @router.put("/{team_id}", response_model=TeamRead)
 def update_team_endpoint(
     team_id: uuid.UUID,
     team_in: TeamUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(if_match_version),
     db: Session = Depends(get_db),
     _: TeamMember = Depends(get_team_owner_or_admin),
 ):
-    return update_team(db, team_id, team_in)
+    """Update a team; If-Match with the team's ETag guards against lost updates."""
+    team = update_team(db, team_id, team_in, expected_version)
+    set_etag(response, team.version)
+    return team
 
 
 @router.delete("/{team_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -539,7 +584,6 @@ def add_team_member(
     try:
         db.add(db_member)
         db.commit()
-        db.refresh(db_member)
         return db_member
     except IntegrityError:
         db.rollback()
@@ -1,5 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Form, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    Form,
+    UploadFile,
+    File,
+    Query,
+    Response,
+)
+from sqlalchemy.orm import Session, selectinload
 from app.models.user import User, UserRole  # SQLAlchemy model
 from app.schemas.user import UserCreate, UserRead, UserUpdate  # Pydantic schemas
 from app.database import get_db
@@ -8,11 +18,12 @@ from app.auth import (
     verify_password,
     create_access_token,
     get_current_user,
+    get_current_user_async,
     get_current_user_or_admin_for_profile_update,
 )
 from pydantic import EmailStr
 import uuid
-from typing import List  # Import List for response_model
+from typing import List, Optional  # Import List for response_model
 import os
 from fastapi.responses import FileResponse
 from PIL import Image
@@ -22,6 +33,12 @@ from app.schemas.project import ProjectRead
 from app.static import avatar_url, avatar_path
 from app.models.hackathon_registration import HackathonRegistration  # Added import
 from app.logger import get_logger
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    finish_page,
+    paginate,
+)
 from app.services.user_service import (
     register_user,
     login_user,
@@ -65,7 +82,7 @@ def login(
 
 
 @router.get("/me", response_model=UserRead)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user_async)):
     return UserRead.from_orm(current_user)
 
 
@@ -80,12 +97,20 @@ def update_own_profile(
 
 
 @router.get("/", response_model=List[UserRead], dependencies=[require_admin()])
-def list_users(db: Session = Depends(get_db)):
+def list_users(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     """
-    Retrieve all users. Only accessible by admin users.
+    Retrieve users page by page, newest first. Only accessible by admin users.
+    The cursor for the next page is returned in the X-Next-Cursor header.
     """
-    users = db.query(User).all()
-    return users
+    key = (User.created_at, User.id)
+    query = db.query(User).options(selectinload(User.roles_association))
+    users = paginate(query, key, limit, cursor).all()
+    return finish_page(users, key, limit, response)
 
 
 @router.get(
@@ -132,7 +157,6 @@ def update_user_profile(
 
     db.add(user)
     db.commit()
-    db.refresh(user)
     return UserRead.from_orm(user)
 
 
@@ -178,7 +202,6 @@ def delete_avatar(
     current_user.avatar_url = None
     db.add(current_user)
     db.commit()
-    db.refresh(current_user)
     return {"detail": "Profilbild entfernt."}
 
 
@@ -243,7 +266,6 @@ def assign_role_to_user(
     user.roles_association.append(UserRole(role=role_enum))
     db.add(user)
     db.commit()
-    db.refresh(user)
 
     return {"detail": f"Role {role_enum.value} assigned to user"}
 
@@ -277,7 +299,6 @@ def remove_role_from_user(
     user.roles_association = [r for r in user.roles_association if r.role != role_enum]
     db.add(user)
     db.commit()
-    db.refresh(user)
 
     return {"detail": f"Role {role_enum.value} removed from user"}
 
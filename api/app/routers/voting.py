@@ -0,0 +1,77 @@
+# routers/voting.py
+import uuid
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import get_optional_user_id
+from app.database import get_async_db
+from app.db_routing import get_async_read_db
+from app.models.hackathon import Hackathon
+from app.schemas.voting import VoteAccepted, VoteCreate, VoteTallyRead
+from app.services import voting_service
+
+router = APIRouter(tags=["voting"])
+
+# Identifies anonymous voters of "public" / "mixed" hackathons
+VOTER_COOKIE = "voter_id"
+VOTER_COOKIE_MAX_AGE_S = 30 * 24 * 3600
+
+
+def _anonymous_voter(request: Request, response: Response) -> str:
+    voter = request.cookies.get(VOTER_COOKIE)
+    try:
+        return str(uuid.UUID(voter))
+    except (TypeError, ValueError):
+        voter = str(uuid.uuid4())
+        response.set_cookie(
+            VOTER_COOKIE,
+            voter,
+            max_age=VOTER_COOKIE_MAX_AGE_S,
+            httponly=True,
+            samesite="lax",
+        )
+        return voter
+
+
+@router.post(
+    "/{hackathon_id}/votes",
+    response_model=VoteAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def cast_vote(
+    hackathon_id: uuid.UUID,
+    vote_in: VoteCreate,
+    request: Request,
+    response: Response,
+    user_id: Optional[uuid.UUID] = Depends(get_optional_user_id),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Vote for a project. Logged-in users vote as themselves; in "public" and
+    "mixed" hackathons anonymous visitors vote through the voter_id cookie. The
+    vote is validated against cached settings and written in the next batch.
+    """
+    if user_id is not None:
+        identity = f"user:{user_id}"
+    else:
+        identity = f"anonymous:{_anonymous_voter(request, response)}"
+    await voting_service.buffer.submit(
+        db, hackathon_id, vote_in.project_id, identity, user_id
+    )
+    return {"hackathon_id": hackathon_id, "project_id": vote_in.project_id}
+
+
+@router.get("/{hackathon_id}/tallies", response_model=List[VoteTallyRead])
+async def vote_tallies(
+    hackathon_id: uuid.UUID, db: AsyncSession = Depends(get_async_read_db)
+):
+    """Votes per project, most votes first. Public endpoint."""
+    exists = await db.scalar(select(Hackathon.id).where(Hackathon.id == hackathon_id))
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
+        )
+    return await voting_service.tallies(db, hackathon_id)
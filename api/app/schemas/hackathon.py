@@ -21,6 +21,15 @@ class HackathonStatus(str, enum.Enum):
     ARCHIVED = "archived"
 
 
+class VotingType(str, enum.Enum):
+    judges_only = "judges_only"
+    users = "users"
+    public = "public"
+    mixed = "mixed"
+    # Judges pick the better of two projects; ranked by a Bradley-Terry fit
+    pairwise = "pairwise"
+
+
 class HackathonBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
@@ -35,6 +44,7 @@ class HackathonBase(BaseModel):
     tags: Optional[List[str]] = []
     max_team_size: Optional[int] = None
     min_team_size: Optional[int] = None
+    max_participants: Optional[int] = Field(default=None, ge=1)
     registration_deadline: Optional[datetime] = None
     is_public: Optional[bool] = True
     banner_image_url: Optional[str] = None
@@ -45,6 +55,10 @@ class HackathonBase(BaseModel):
     allow_individuals: Optional[bool] = True
     allow_multiple_projects_per_team: Optional[bool] = False
     custom_fields: Optional[dict] = None
+    voting_type: VotingType = VotingType.judges_only
+    # Criteria dicts ({"name", "description", ...}); in pairwise mode the first
+    # one's description is the question shown with each pair
+    judging_criteria: Optional[List[dict]] = None
 
 
 class HackathonCreate(HackathonBase):
@@ -65,6 +79,7 @@ class HackathonUpdate(BaseModel):
     tags: Optional[List[str]] = None
     max_team_size: Optional[int] = None
     min_team_size: Optional[int] = None
+    max_participants: Optional[int] = Field(default=None, ge=1)
     registration_deadline: Optional[datetime] = None
     is_public: Optional[bool] = None
     banner_image_url: Optional[str] = None
@@ -75,6 +90,8 @@ class HackathonUpdate(BaseModel):
     allow_individuals: Optional[bool] = None
     allow_multiple_projects_per_team: Optional[bool] = None
     custom_fields: Optional[dict] = None
+    voting_type: Optional[VotingType] = None
+    judging_criteria: Optional[List[dict]] = None
 
 
 # To avoid circular imports, we define UserRead as a forward reference if it's complex
@@ -109,6 +126,8 @@ class HackathonRead(HackathonBase):
     id: uuid.UUID
     created_at: datetime
     updated_at: datetime
+    version: int
+    registration_count: int = 0
     organizer: Optional[UserRead] = None
     registrations: List[HackathonRegistrationRead] = (
         []
@@ -117,6 +136,30 @@ class HackathonRead(HackathonBase):
     model_config = {"from_attributes": True}
 
 
+class HackathonSummary(BaseModel):
+    """A listing card: the hackathon's own fields plus counts, no registrations."""
+
+    id: uuid.UUID
+    name: str
+    description: Optional[str] = None
+    start_date: datetime
+    end_date: datetime
+    status: HackathonStatus
+    mode: HackathonMode
+    location: Optional[str] = None
+    category: Optional[str] = None
+    tags: Optional[List[str]] = []
+    banner_image_url: Optional[str] = None
+    registration_deadline: Optional[datetime] = None
+    max_participants: Optional[int] = None
+    registration_count: int  # Registered entries; a team counts once
+    team_count: int
+    participant_count: int  # Solo participants plus members of registered teams
+    waitlist_count: int
+
+    model_config = {"from_attributes": True}
+
+
 # The old HackathonTeamRegistrationRead is no longer needed, replaced by HackathonRegistrationRead
 
 
@@ -1,7 +1,7 @@
 # schemas/judging.py
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
 from pydantic import BaseModel, Field
 
@@ -48,6 +48,114 @@ class ScoreRead(ScoreBase):
     judge_id: uuid.UUID
     submitted_at: datetime  # Consistent with the model fix
     updated_at: datetime
+    version: int
     # criterion: Optional[CriterionRead] = None # To include criterion details if needed
 
     model_config = {"from_attributes": True}
+
+
+class LeaderboardEntryRead(BaseModel):
+    project_id: uuid.UUID
+    project_name: str
+    hackathon_id: uuid.UUID
+    weighted_average: Decimal  # sum(score * weight) / sum(weight)
+    weighted_total: Decimal
+    weight_sum: Decimal
+    score_count: int
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class PairwiseComparisonCreate(BaseModel):
+    winner_id: uuid.UUID
+    loser_id: uuid.UUID
+
+
+class PairwiseComparisonRead(PairwiseComparisonCreate):
+    id: uuid.UUID
+    hackathon_id: uuid.UUID
+    judge_id: uuid.UUID
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class PairwiseNextPair(BaseModel):
+    hackathon_id: uuid.UUID
+    project_a_id: uuid.UUID
+    project_b_id: uuid.UUID
+    prompt: Optional[str] = None
+
+
+class PairwiseRankingEntry(BaseModel):
+    project_id: uuid.UUID
+    rank: int
+    strength: float  # Bradley-Terry log-strength; differences are log-odds
+    std_error: float
+    comparisons: int
+
+
+class AssignmentPlanRequest(BaseModel):
+    reviews_per_project: int = Field(3, ge=1, le=50)
+    # Defaults to every user with the judge role
+    judge_ids: Optional[List[uuid.UUID]] = None
+    max_per_judge: Optional[int] = Field(None, ge=1)
+
+
+class AssignmentShortfall(BaseModel):
+    project_id: uuid.UUID
+    missing: int
+
+
+class AssignmentPlanSummary(BaseModel):
+    created: int
+    released: int = 0
+    total_assignments: int
+    judges: int
+    min_load: int
+    max_load: int
+    shortfall: List[AssignmentShortfall] = []
+
+
+class QueueItem(BaseModel):
+    project_id: uuid.UUID
+    project_name: str
+    position: int
+    reviewed: bool
+
+
+class AggregatedResultRead(BaseModel):
+    project_id: uuid.UUID
+    rank: int
+    score: float  # mean over judges of the normalized, weighted score
+    ci_low: Optional[float] = None
+    ci_high: Optional[float] = None
+    judge_count: int
+
+    model_config = {"from_attributes": True}
+
+
+class JudgeReliabilityRead(BaseModel):
+    judge_id: uuid.UUID
+    projects: int
+    mean: float
+    std: float
+    bias: Optional[float] = None  # vs the other judges of the same projects
+    residual_std: Optional[float] = None
+    consensus_correlation: Optional[float] = None
+    outlier: bool
+
+    model_config = {"from_attributes": True}
+
+
+class AgreementReportRead(BaseModel):
+    projects: int
+    judges: int
+    ratings: int
+    icc: Optional[float] = None
+    kendall_w: Optional[float] = None
+    kendall_w_projects: int  # projects scored by every judge
+    judge_stats: List[JudgeReliabilityRead] = []
+
+    model_config = {"from_attributes": True}
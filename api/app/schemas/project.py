@@ -132,6 +132,7 @@ class ProjectRead(ProjectBase):
     id: uuid.UUID
     created_at: datetime
     updated_at: datetime
+    version: int
     build_status: Optional[str] = None
     last_build_date: Optional[datetime] = None
     last_deploy_date: Optional[datetime] = None
@@ -0,0 +1,43 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from .hackathon import HackathonStatus
+from .project import ProjectStatus
+
+
+class SearchHit(BaseModel):
+    id: uuid.UUID
+    name: str
+    rank: float  # Relevance; results come best first
+
+    model_config = {"from_attributes": True}
+
+
+class HackathonSearchHit(SearchHit):
+    status: HackathonStatus
+    start_date: datetime
+    category: Optional[str] = None
+    tags: Optional[List[str]] = []
+
+
+class ProjectSearchHit(SearchHit):
+    hackathon_id: uuid.UUID
+    team_id: Optional[uuid.UUID] = None
+    status: ProjectStatus
+
+
+class TeamSearchHit(SearchHit):
+    hackathon_id: uuid.UUID
+
+
+class UserSearchHit(BaseModel):
+    id: uuid.UUID
+    username: str
+    email: str
+    full_name: Optional[str] = None
+    rank: float  # Trigram similarity to the query, 0..1
+
+    model_config = {"from_attributes": True}
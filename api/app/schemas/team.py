@@ -91,6 +91,8 @@ class TeamRead(TeamBase):
     status: TeamStatus
     created_at: datetime
     updated_at: datetime
+    version: int
+    member_count: int = 0
     members: List[TeamMemberRead] = []
     join_requests: Optional[List[JoinRequestRead]] = None
     invites: Optional[List[TeamInviteRead]] = None
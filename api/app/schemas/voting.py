@@ -0,0 +1,20 @@
+# schemas/voting.py
+import uuid
+
+from pydantic import BaseModel
+
+
+class VoteCreate(BaseModel):
+    project_id: uuid.UUID
+
+
+class VoteAccepted(BaseModel):
+    hackathon_id: uuid.UUID
+    project_id: uuid.UUID
+    # Buffered: the vote shows up in /tallies right away and is stored shortly
+    status: str = "accepted"
+
+
+class VoteTallyRead(BaseModel):
+    project_id: uuid.UUID
+    votes: int
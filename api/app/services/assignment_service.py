@@ -0,0 +1,223 @@
+"""
+Service layer for judge review queues (judging.judge_assignments).
+
+Planning is serialized per hackathon by locking its row, loads everything the
+planner needs in four flat queries and stores the new assignments in one bulk
+INSERT. Dropping a judge releases their unreviewed assignments and runs the same
+planner again, which only hands out the reviews that were released.
+"""
+
+import uuid
+from typing import Dict, Hashable, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, exists, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.logger import get_logger
+from app.models.hackathon import Hackathon
+from app.models.judging import JudgeAssignment, Score
+from app.models.project import Project
+from app.models.team import TeamMember
+from app.models.user import UserRole, UserRoleAssociation
+from app.services.judge_assignment import plan_assignments
+
+logger = get_logger("judge_assignment")
+
+
+def _lock_hackathon(db: Session, hackathon_id: uuid.UUID) -> Hackathon:
+    hackathon = (
+        db.query(Hackathon)
+        .filter(Hackathon.id == hackathon_id)
+        .with_for_update()
+        .first()
+    )
+    if not hackathon:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
+        )
+    return hackathon
+
+
+def _reviewed(judge_column, project_column):
+    return exists().where(
+        Score.judge_id == judge_column, Score.project_id == project_column
+    )
+
+
+def conflicts_query(hackathon_id: uuid.UUID, judge_ids):
+    """
+    SELECT of the (judge_id, project_id) conflicts of interest in a hackathon: the
+    judge owns the project or is a member of its team.
+    """
+    owned = select(
+        Project.owner_id.label("judge_id"), Project.id.label("project_id")
+    ).where(
+        Project.hackathon_id == hackathon_id, Project.owner_id.in_(judge_ids)
+    )
+    in_team = (
+        select(TeamMember.user_id, Project.id)
+        .join(Project, Project.team_id == TeamMember.team_id)
+        .where(
+            Project.hackathon_id == hackathon_id,
+            TeamMember.user_id.in_(judge_ids),
+        )
+    )
+    return owned.union(in_team)
+
+
+def _plan(
+    db: Session,
+    hackathon_id: uuid.UUID,
+    reviews_per_project: int,
+    judge_ids: Optional[List[uuid.UUID]],
+    max_per_judge: Optional[int],
+    released: int = 0,
+) -> dict:
+    judges: List[uuid.UUID]
+    if judge_ids is None:
+        judges = list(
+            db.execute(
+                select(UserRoleAssociation.user_id).where(
+                    UserRoleAssociation.role == UserRole.JUDGE.value
+                )
+            ).scalars()
+        )
+    else:
+        judges = judge_ids
+    projects = db.execute(
+        select(Project.id).where(Project.hackathon_id == hackathon_id)
+    ).all()
+    conflicts = [
+        tuple(row) for row in db.execute(conflicts_query(hackathon_id, judges))
+    ]
+    existing = [
+        tuple(row)
+        for row in db.execute(
+            select(JudgeAssignment.judge_id, JudgeAssignment.project_id).where(
+                JudgeAssignment.hackathon_id == hackathon_id
+            )
+        )
+    ]
+
+    plan = plan_assignments(
+        projects=[p.id for p in projects],
+        judges=judges,
+        reviews_per_project=reviews_per_project,
+        conflicts=conflicts,
+        existing=existing,
+        max_per_judge=max_per_judge,
+        seed=hackathon_id.int,
+    )
+
+    if plan.new:
+        # Append to the end of each judge's queue
+        positions: Dict[Hashable, int] = dict(
+            db.execute(
+                select(JudgeAssignment.judge_id, func.max(JudgeAssignment.position))
+                .where(JudgeAssignment.hackathon_id == hackathon_id)
+                .group_by(JudgeAssignment.judge_id)
+            ).tuples().all()
+        )
+        rows = []
+        for judge_id, project_id in plan.new:
+            positions[judge_id] = positions.get(judge_id, 0) + 1
+            rows.append(
+                {
+                    "hackathon_id": hackathon_id,
+                    "judge_id": judge_id,
+                    "project_id": project_id,
+                    "position": positions[judge_id],
+                }
+            )
+        db.execute(insert(JudgeAssignment), rows)
+    db.commit()
+
+    loads = list(plan.load.values()) or [0]
+    logger.info(
+        f"Planned hackathon {hackathon_id}: {len(plan.new)} new assignments, "
+        f"{len(plan.shortfall)} projects short"
+    )
+    return {
+        "created": len(plan.new),
+        "released": released,
+        "total_assignments": len(existing) + len(plan.new),
+        "judges": len(judges),
+        "min_load": min(loads),
+        "max_load": max(loads),
+        "shortfall": [
+            {"project_id": p, "missing": n} for p, n in plan.shortfall.items()
+        ],
+    }
+
+
+def plan_hackathon(
+    db: Session,
+    hackathon_id: uuid.UUID,
+    reviews_per_project: int,
+    judge_ids: Optional[List[uuid.UUID]] = None,
+    max_per_judge: Optional[int] = None,
+) -> dict:
+    """Fill every project's review queue up to reviews_per_project judges."""
+    _lock_hackathon(db, hackathon_id)
+    return _plan(db, hackathon_id, reviews_per_project, judge_ids, max_per_judge)
+
+
+def drop_judge(
+    db: Session,
+    hackathon_id: uuid.UUID,
+    judge_id: uuid.UUID,
+    reviews_per_project: int,
+    max_per_judge: Optional[int] = None,
+) -> dict:
+    """Release a judge's unreviewed assignments and re-plan only those."""
+    _lock_hackathon(db, hackathon_id)
+    released = db.execute(
+        delete(JudgeAssignment)
+        .where(
+            JudgeAssignment.hackathon_id == hackathon_id,
+            JudgeAssignment.judge_id == judge_id,
+            ~_reviewed(JudgeAssignment.judge_id, JudgeAssignment.project_id),
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    # Everyone who still has assignments, except the judge who dropped out
+    judge_ids = [
+        j
+        for j in db.execute(
+            select(JudgeAssignment.judge_id)
+            .where(JudgeAssignment.hackathon_id == hackathon_id)
+            .distinct()
+        )
+        .scalars()
+        .all()
+        if j != judge_id
+    ]
+    return _plan(
+        db,
+        hackathon_id,
+        reviews_per_project,
+        judge_ids,
+        max_per_judge,
+        released=released,
+    )
+
+
+def judge_queue(db: Session, hackathon_id: uuid.UUID, judge_id: uuid.UUID) -> list:
+    rows = db.execute(
+        select(
+            JudgeAssignment.project_id,
+            Project.name.label("project_name"),
+            JudgeAssignment.position,
+            _reviewed(JudgeAssignment.judge_id, JudgeAssignment.project_id).label(
+                "reviewed"
+            ),
+        )
+        .join(Project, Project.id == JudgeAssignment.project_id)
+        .where(
+            JudgeAssignment.hackathon_id == hackathon_id,
+            JudgeAssignment.judge_id == judge_id,
+        )
+        .order_by(JudgeAssignment.position)
+    ).all()
+    return [row._asdict() for row in rows]
@@ -0,0 +1,228 @@
+"""
+Inter-rater agreement and per-judge reliability for a hackathon's scores.
+
+Works on the (project, judge) matrix of judge verdicts from score_aggregation
+(each judge's criterion-weighted score / max_score for a project, NaN where the
+judge did not score it), with whole-array NumPy operations:
+
+- ICC(1): one-way random-effects intra-class correlation, the share of score
+  variance explained by the projects rather than by who judged them. It does not
+  need every judge to score every project, so it suits review queues where each
+  project only gets a few judges.
+- Kendall's W over the projects every judge scored (with tie correction); None
+  when fewer than two projects were scored by all judges.
+- Per judge: mean and spread of their verdicts, their bias against the other
+  judges of the same projects (leave-one-out consensus), the spread of that
+  difference and their correlation with the consensus. Judges whose bias is more
+  than OUTLIER_Z standard deviations from the other judges', or who correlate
+  negatively with the consensus, are flagged as outliers.
+
+Reports are cached per worker, keyed on the score set's version (row count and
+last modification of the hackathon's scores and criteria), so repeated requests
+only cost the version query until a score changes.
+"""
+
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app.models.judging import Criterion, Score
+from app.models.project import Project
+from app.services.score_aggregation import judge_verdicts, tensor_from_rows
+
+OUTLIER_Z = 2.0
+
+
+@dataclass
+class JudgeReliability:
+    judge_id: uuid.UUID
+    projects: int
+    mean: float
+    std: float
+    bias: Optional[float]  # mean (own verdict - other judges' mean); None if alone
+    residual_std: Optional[float]
+    consensus_correlation: Optional[float]
+    outlier: bool
+
+
+@dataclass
+class AgreementReport:
+    projects: int
+    judges: int
+    ratings: int
+    icc: Optional[float]
+    kendall_w: Optional[float]
+    kendall_w_projects: int
+    judge_stats: List[JudgeReliability] = field(default_factory=list)
+
+
+def icc_oneway(verdicts: np.ndarray) -> Optional[float]:
+    """ICC(1) for unbalanced designs (Shrout & Fleiss; k0 for unequal counts)."""
+    rated = ~np.isnan(verdicts)
+    counts = rated.sum(axis=1)
+    keep = counts > 0
+    verdicts, rated, counts = verdicts[keep], rated[keep], counts[keep]
+    n_projects, n_ratings = len(counts), counts.sum()
+    if n_projects < 2 or n_ratings <= n_projects:
+        return None
+    means = np.nansum(verdicts, axis=1) / counts
+    grand = np.nansum(verdicts) / n_ratings
+    between = (counts * (means - grand) ** 2).sum() / (n_projects - 1)
+    within = (np.where(rated, verdicts - means[:, None], 0.0) ** 2).sum() / (
+        n_ratings - n_projects
+    )
+    k0 = (n_ratings - (counts**2).sum() / n_ratings) / (n_projects - 1)
+    denominator = between + (k0 - 1) * within
+    if denominator <= 0:
+        return None
+    return float((between - within) / denominator)
+
+
+def _midranks(column: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Average ranks (1-based) of one judge's verdicts and their tie term."""
+    _, inverse, counts = np.unique(column, return_inverse=True, return_counts=True)
+    ranks = np.cumsum(counts) - (counts - 1) / 2
+    return ranks[inverse], float((counts**3 - counts).sum())
+
+
+def kendall_w(verdicts: np.ndarray) -> Tuple[Optional[float], int]:
+    """Kendall's W over the projects every judge scored, and how many those are."""
+    complete = verdicts[~np.isnan(verdicts).any(axis=1)]
+    n, m = complete.shape
+    if n < 2 or m < 2:
+        return None, n
+    ranked = [_midranks(complete[:, j]) for j in range(m)]
+    rank_sums = np.sum([ranks for ranks, _ in ranked], axis=0)
+    ties = sum(tie for _, tie in ranked)
+    spread = ((rank_sums - rank_sums.mean()) ** 2).sum()
+    denominator = m**2 * (n**3 - n) - m * ties
+    if denominator <= 0:
+        return None, n
+    return float(12 * spread / denominator), n
+
+
+def _optional(values: np.ndarray) -> List[Optional[float]]:
+    return [float(v) if np.isfinite(v) else None for v in values]
+
+
+def judge_reliability(
+    verdicts: np.ndarray, judge_ids: np.ndarray
+) -> List[JudgeReliability]:
+    """Per-judge statistics against the leave-one-out consensus of each project."""
+    rated = ~np.isnan(verdicts)
+    counts = rated.sum(axis=1, keepdims=True)
+    totals = np.nansum(verdicts, axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Mean of the *other* judges of the same project
+        others = np.where(
+            rated & (counts > 1), (totals - verdicts) / (counts - 1), np.nan
+        )
+        shared = ~np.isnan(others)
+        n_shared = shared.sum(axis=0)
+        difference = np.where(shared, verdicts - others, np.nan)
+        bias = np.nansum(difference, axis=0) / n_shared
+        residual_std = np.sqrt(
+            np.nansum((difference - bias) ** 2, axis=0) / n_shared
+        )
+
+        own = np.where(shared, verdicts, np.nan)
+        own_centred = np.where(shared, own - np.nansum(own, axis=0) / n_shared, 0.0)
+        others_centred = np.where(
+            shared, others - np.nansum(others, axis=0) / n_shared, 0.0
+        )
+        correlation = (own_centred * others_centred).sum(axis=0) / np.sqrt(
+            (own_centred**2).sum(axis=0) * (others_centred**2).sum(axis=0)
+        )
+
+        n_rated = rated.sum(axis=0)
+        mean = np.nansum(verdicts, axis=0) / n_rated
+        std = np.sqrt(
+            np.nansum(np.where(rated, verdicts - mean, np.nan) ** 2, axis=0) / n_rated
+        )
+
+        finite = np.isfinite(bias)
+        bias_z = np.zeros_like(bias)
+        if finite.sum() > 2:
+            spread = bias[finite].std()
+            if spread > 0:
+                bias_z[finite] = (bias[finite] - bias[finite].mean()) / spread
+    outlier = (np.abs(bias_z) > OUTLIER_Z) | (np.nan_to_num(correlation) < 0)
+
+    return [
+        JudgeReliability(
+            judge_id=judge_id,
+            projects=int(n),
+            mean=float(m),
+            std=float(s),
+            bias=b,
+            residual_std=r,
+            consensus_correlation=c,
+            outlier=bool(o),
+        )
+        for judge_id, n, m, s, b, r, c, o in zip(
+            judge_ids,
+            n_rated,
+            mean,
+            std,
+            _optional(bias),
+            _optional(residual_std),
+            _optional(correlation),
+            outlier,
+        )
+    ]
+
+
+def agreement_report(rows) -> AgreementReport:
+    """Rows of score_aggregation.score_rows_query -> report (CPU bound, no I/O)."""
+    tensor = tensor_from_rows(rows)
+    if tensor.values.size == 0:
+        return AgreementReport(0, 0, 0, None, None, 0)
+    verdicts = judge_verdicts(tensor.values, tensor.weights)
+    w, w_projects = kendall_w(verdicts)
+    return AgreementReport(
+        projects=len(tensor.project_ids),
+        judges=len(tensor.judge_ids),
+        ratings=int((~np.isnan(verdicts)).sum()),
+        icc=icc_oneway(verdicts),
+        kendall_w=w,
+        kendall_w_projects=w_projects,
+        judge_stats=judge_reliability(verdicts, tensor.judge_ids),
+    )
+
+
+# --- Per-worker cache keyed on the score set's version ---
+_reports: Dict[uuid.UUID, Tuple[tuple, AgreementReport]] = {}
+_reports_lock = threading.Lock()
+
+
+def score_version_query(hackathon_id: uuid.UUID):
+    """Changes whenever a score or criterion of the hackathon changes."""
+    return (
+        select(
+            func.count(Score.id),
+            func.max(Score.updated_at),
+            func.max(Criterion.updated_at),
+        )
+        .join(Criterion, Criterion.id == Score.criteria_id)
+        .join(Project, Project.id == Score.project_id)
+        .where(Project.hackathon_id == hackathon_id)
+    )
+
+
+def cached_report(hackathon_id: uuid.UUID, version: tuple) -> Optional[AgreementReport]:
+    with _reports_lock:
+        cached = _reports.get(hackathon_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    return None
+
+
+def compute_report(hackathon_id: uuid.UUID, version: tuple, rows) -> AgreementReport:
+    report = agreement_report(rows)
+    with _reports_lock:
+        _reports[hackathon_id] = (version, report)
+    return report
@@ -0,0 +1,93 @@
+"""
+Balanced judge-to-project assignment.
+
+plan_assignments() fills every project up to reviews_per_project judges:
+
+- projects are processed most-constrained first (fewest eligible judges), so
+  projects with many conflicts of interest are not starved by easy ones;
+- each project takes the least-loaded eligible judges from a min-heap keyed by
+  (current load, random tie-break), which keeps the load spread within one
+  review of even whenever the conflicts allow it;
+- existing assignments are kept and count towards both the project's reviews
+  and the judge's load, so the same call re-plans incrementally: after a judge
+  drops out only the reviews they leave open are handed out again.
+
+Everything is in memory and O((P * k + C) log J) for P projects, k reviews per
+project, C conflicts and J judges, i.e. well under a second for thousands of
+projects.
+"""
+
+import heapq
+import random
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+Pair = Tuple[Hashable, Hashable]  # (judge, project)
+
+
+@dataclass
+class AssignmentPlan:
+    new: List[Pair] = field(default_factory=list)
+    # project -> reviews that could not be assigned (conflicts / capacity)
+    shortfall: Dict[Hashable, int] = field(default_factory=dict)
+    load: Dict[Hashable, int] = field(default_factory=dict)
+
+
+def plan_assignments(
+    projects: Iterable[Hashable],
+    judges: Iterable[Hashable],
+    reviews_per_project: int,
+    conflicts: Iterable[Pair] = (),
+    existing: Iterable[Pair] = (),
+    max_per_judge: Optional[int] = None,
+    seed: int = 0,
+) -> AssignmentPlan:
+    projects = list(projects)
+    judges = list(judges)
+    rng = random.Random(seed)
+    blocked: Dict[Hashable, Set] = defaultdict(set)
+    for judge, project in conflicts:
+        blocked[project].add(judge)
+
+    judge_set = set(judges)
+    load = {judge: 0 for judge in judges}
+    assigned: Dict[Hashable, Set] = defaultdict(set)
+    for judge, project in existing:
+        # Reviews by judges no longer in the pool still count for the project
+        assigned[project].add(judge)
+        if judge in load:
+            load[judge] += 1
+
+    def eligible_count(project) -> int:
+        return len(judge_set - blocked[project] - assigned[project])
+
+    needing = [p for p in projects if len(assigned[p]) < reviews_per_project]
+    needing.sort(key=lambda p: (eligible_count(p), rng.random()))
+
+    heap = [(load[j], rng.random(), j) for j in judges]
+    heapq.heapify(heap)
+    plan = AssignmentPlan()
+    for project in needing:
+        missing = reviews_per_project - len(assigned[project])
+        skipped = []
+        while missing and heap:
+            judge_load, tie, judge = heapq.heappop(heap)
+            if max_per_judge is not None and judge_load >= max_per_judge:
+                # The heap is ordered by load, so every other judge is full too
+                skipped.append((judge_load, tie, judge))
+                break
+            if judge in blocked[project] or judge in assigned[project]:
+                skipped.append((judge_load, tie, judge))
+                continue
+            assigned[project].add(judge)
+            load[judge] += 1
+            plan.new.append((judge, project))
+            missing -= 1
+            heapq.heappush(heap, (load[judge], rng.random(), judge))
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        if missing:
+            plan.shortfall[project] = missing
+    plan.load = load
+    return plan
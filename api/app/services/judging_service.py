@@ -2,15 +2,34 @@
 Service layer for judging-related business logic.
 """
 
+from typing import Optional
+
+from sqlalchemy import literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.judging import Criterion, Score
 from app.models.project import Project
 from app.schemas.judging import CriterionCreate, ScoreCreate, ScoreUpdate
 from app.models.user import User
+from app.loaders import loader_options
+from app.utils.concurrency import (
+    check_update_conflict,
+    fetch_updated,
+    versioned_update,
+)
+from app.utils.pagination import DEFAULT_PAGE_SIZE, paginate
+from app.services.leaderboard_service import (
+    hackathons_scored_on,
+    rebuild_leaderboard,
+    record_changed_score,
+    record_new_score,
+)
 from fastapi import HTTPException, status
 import uuid
 from sqlalchemy.exc import IntegrityError
 
+SCORES_BY_JUDGE_KEY = (Score.id,)
+
 IS_ADMIN = lambda user: any(
     r.role == "admin" for r in getattr(user, "roles_association", [])
 )
@@ -29,7 +48,6 @@ def create_criterion(
         db_criterion = Criterion(**criterion_in.model_dump())
         db.add(db_criterion)
         db.commit()
-        db.refresh(db_criterion)
         return db_criterion
     except IntegrityError:
         db.rollback()
@@ -56,12 +74,20 @@ def update_criterion(
             status_code=status.HTTP_404_NOT_FOUND, detail="Criterion not found"
         )
     update_data = criterion_in.model_dump(exclude_unset=True)
+    weight_changed = (
+        "weight" in update_data and update_data["weight"] != db_criterion.weight
+    )
     for key, value in update_data.items():
         setattr(db_criterion, key, value)
     try:
         db.add(db_criterion)
+        if weight_changed:
+            # Only the totals of hackathons scored on this criterion change
+            scored = hackathons_scored_on(db, criterion_id)
+            db.flush()
+            for hackathon_id in scored:
+                rebuild_leaderboard(db, hackathon_id)
         db.commit()
-        db.refresh(db_criterion)
         return db_criterion
     except IntegrityError:
         db.rollback()
@@ -82,7 +108,12 @@ def delete_criterion(db: Session, criterion_id: uuid.UUID, current_user: User):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Criterion not found"
         )
+    # Looked up first: its scores are deleted with it
+    scored = hackathons_scored_on(db, criterion_id)
     db.delete(db_criterion)
+    db.flush()
+    for hackathon_id in scored:
+        rebuild_leaderboard(db, hackathon_id)
     db.commit()
     return
 
@@ -97,7 +128,12 @@ def submit_score(db: Session, score_in: ScoreCreate, current_user: User) -> Scor
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only judges or admins can submit scores.",
         )
-    project = db.query(Project).filter(Project.id == score_in.project_id).first()
+    project = (
+        db.query(Project)
+        .options(*loader_options(Project, "authz"))
+        .filter(Project.id == score_in.project_id)
+        .first()
+    )
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Project not found."
@@ -115,8 +151,9 @@ def submit_score(db: Session, score_in: ScoreCreate, current_user: User) -> Scor
     db_score = Score(**score_in.model_dump(), judge_id=current_user.id)
     try:
         db.add(db_score)
+        db.flush()
+        record_new_score(db, db_score, criterion, project)
         db.commit()
-        db.refresh(db_score)
         return db_score
     except IntegrityError:
         db.rollback()
@@ -127,60 +164,91 @@ def submit_score(db: Session, score_in: ScoreCreate, current_user: User) -> Scor
 
 
 def update_score(
-    db: Session, score_id: uuid.UUID, score_in: ScoreUpdate, current_user: User
+    db: Session,
+    score_id: uuid.UUID,
+    score_in: ScoreUpdate,
+    current_user: User,
+    expected_version: Optional[int] = None,
 ) -> Score:
-    """Update a score (judge or admin only)."""
-    db_score = db.query(Score).filter(Score.id == score_id).first()
-    if not db_score:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Score not found"
-        )
-    if db_score.judge_id != current_user.id and not IS_ADMIN(current_user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this score.",
-        )
+    """
+    Update a score (judge or admin only) in one conditional UPDATE that also
+    checks the judge, the criterion's score range and, if expected_version is
+    given, that nobody changed the score in between.
+    """
+    # The row as it is before this update, locked so the leaderboard delta is
+    # computed from the value actually replaced
+    old = (
+        select(Score.id, Score.score)
+        .where(Score.id == score_id)
+        .with_for_update()
+        .subquery("old")
+    )
+    stmt = versioned_update(
+        Score, score_id, score_in.model_dump(exclude_unset=True), expected_version
+    ).where(
+        old.c.id == Score.id,
+        Criterion.id == Score.criteria_id,
+        Project.id == Score.project_id,
+    )
+    if not IS_ADMIN(current_user):
+        stmt = stmt.where(Score.judge_id == current_user.id)
     if score_in.score is not None:
-        criterion = (
-            db.query(Criterion).filter(Criterion.id == db_score.criteria_id).first()
-        )
-        if not criterion:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Associated criterion not found. Cannot validate score.",
-            )
-        if score_in.score < 0 or score_in.score > criterion.max_score:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Score must be between 0 and {criterion.max_score} for this criterion.",
-            )
-    update_data = score_in.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_score, key, value)
+        stmt = stmt.where(literal(score_in.score).between(0, Criterion.max_score))
     try:
-        db.add(db_score)
-        db.commit()
-        db.refresh(db_score)
-        return db_score
+        row = fetch_updated(
+            db, Score, stmt, old.c.score, Criterion.weight, Project.hackathon_id
+        )
+        if row is not None:
+            db_score, old_value, weight, hackathon_id = row
+            if db_score.score != old_value:
+                record_changed_score(db, db_score, old_value, weight, hackathon_id)
+            db.commit()
+            return db_score
     except IntegrityError:
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Error updating score."
         )
+    db.rollback()
+    check_update_conflict(db, Score, score_id, expected_version, "Score not found")
+    judge_id, max_score = db.execute(
+        select(Score.judge_id, Criterion.max_score)
+        .join(Criterion, Criterion.id == Score.criteria_id)
+        .where(Score.id == score_id)
+    ).one()
+    if judge_id != current_user.id and not IS_ADMIN(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this score.",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Score must be between 0 and {max_score} for this criterion.",
+    )
 
 
-def list_scores_for_project(db: Session, project_id: uuid.UUID):
+async def list_scores_for_project(db: AsyncSession, project_id: uuid.UUID):
     """List all scores for a project."""
-    scores = db.query(Score).filter(Score.project_id == project_id).all()
-    return scores
+    result = await db.execute(select(Score).where(Score.project_id == project_id))
+    return result.scalars().all()
 
 
-def list_scores_by_judge(db: Session, judge_id: uuid.UUID, current_user: User):
-    """List all scores submitted by a judge (or admin)."""
+def list_scores_by_judge(
+    db: Session,
+    judge_id: uuid.UUID,
+    current_user: User,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+):
+    """
+    One page of the scores submitted by a judge (or admin), oldest first, plus
+    the look-ahead row of paginate. Score ids are UUIDv7, so the id alone is the
+    time-ordered key and (judge_id, id) is the whole index the page needs.
+    """
     if judge_id != current_user.id and not IS_ADMIN(current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to view these scores.",
         )
-    scores = db.query(Score).filter(Score.judge_id == judge_id).all()
-    return scores
+    stmt = db.query(Score).filter(Score.judge_id == judge_id)
+    return paginate(stmt, SCORES_BY_JUDGE_KEY, limit, cursor, descending=False).all()
@@ -0,0 +1,153 @@
+"""
+Incremental maintenance of the judging leaderboard (judging.leaderboard).
+
+Every score write adds its weighted delta to the project's row in the same
+transaction, so the ranking endpoint reads one row per project instead of
+aggregating judging.scores. rebuild_leaderboard recomputes the rows from scratch
+(after criterion weight changes, for the hackathons scored on that criterion, or
+via scripts/rebuild_leaderboard.py).
+Both announce the new values to live leaderboard subscribers (app.broadcast)
+when the transaction commits.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy import delete, func, insert, literal, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app import broadcast
+from app.logger import get_logger
+from app.models.judging import Criterion, LeaderboardEntry, Score
+from app.models.project import Project
+
+logger = get_logger("leaderboard")
+
+
+def apply_score_delta(
+    db: Session,
+    project_id: uuid.UUID,
+    hackathon_id: uuid.UUID,
+    weighted_delta: Decimal,
+    weight_delta: Decimal = Decimal(0),
+    count_delta: int = 0,
+):
+    """Add a score change to the project's leaderboard row (upsert, no commit)."""
+    table = LeaderboardEntry.__table__
+    row = pg_insert(table).values(
+        project_id=project_id,
+        hackathon_id=hackathon_id,
+        weighted_total=weighted_delta,
+        weight_sum=weight_delta,
+        score_count=count_delta,
+        updated_at=datetime.now(timezone.utc),
+    )
+    stmt = row.on_conflict_do_update(
+        index_elements=[table.c.project_id],
+        set_={
+            "weighted_total": table.c.weighted_total + weighted_delta,
+            "weight_sum": table.c.weight_sum + weight_delta,
+            "score_count": table.c.score_count + count_delta,
+            "updated_at": row.excluded.updated_at,
+        },
+    ).returning(table.c.weighted_average, table.c.score_count)
+    weighted_average, score_count = db.execute(stmt).one()
+    value = broadcast.leaderboard_value(weighted_average, score_count)
+    for announce in broadcast.notify(
+        hackathon_id, broadcast.LEADERBOARD, {project_id: value}
+    ):
+        db.execute(announce)
+
+
+def record_new_score(db: Session, score: Score, criterion: Criterion, project):
+    apply_score_delta(
+        db,
+        score.project_id,
+        project.hackathon_id,
+        weighted_delta=Decimal(score.score) * criterion.weight,
+        weight_delta=criterion.weight,
+        count_delta=1,
+    )
+
+
+def record_changed_score(
+    db: Session, score: Score, old_value: int, weight: Decimal, hackathon_id
+):
+    apply_score_delta(
+        db,
+        score.project_id,
+        hackathon_id,
+        weighted_delta=Decimal(score.score - old_value) * weight,
+    )
+
+
+def lock_scores(db: Session) -> None:
+    """Block score writes until the transaction ends (reads go on)."""
+    db.execute(text("LOCK TABLE judging.scores IN SHARE MODE"))
+
+
+def hackathons_scored_on(db: Session, criterion_id: uuid.UUID) -> List[uuid.UUID]:
+    """
+    The hackathons with scores on the criterion, the only leaderboards that depend
+    on it. Score writes are blocked from here on, so no other hackathon starts to
+    depend on it before the caller commits.
+    """
+    lock_scores(db)
+    return list(
+        db.execute(
+            select(Project.hackathon_id)
+            .join(Score, Score.project_id == Project.id)
+            .where(Score.criteria_id == criterion_id)
+            .distinct()
+        ).scalars()
+    )
+
+
+def rebuild_leaderboard(db: Session, hackathon_id: Optional[uuid.UUID] = None) -> int:
+    """
+    Recompute the leaderboard rows (of one hackathon, or all) from judging.scores.
+    Score writes are blocked for the duration so no delta is lost; the caller
+    commits. Returns the number of rows written.
+    """
+    lock_scores(db)
+    clear = delete(LeaderboardEntry)
+    totals = (
+        select(
+            Score.project_id,
+            Project.hackathon_id,
+            func.sum(Score.score * Criterion.weight),
+            func.sum(Criterion.weight),
+            func.count(),
+            literal(datetime.now(timezone.utc)),
+        )
+        .join(Criterion, Criterion.id == Score.criteria_id)
+        .join(Project, Project.id == Score.project_id)
+        .group_by(Score.project_id, Project.hackathon_id)
+    )
+    if hackathon_id is not None:
+        clear = clear.where(LeaderboardEntry.hackathon_id == hackathon_id)
+        totals = totals.where(Project.hackathon_id == hackathon_id)
+    db.execute(clear, execution_options={"synchronize_session": False})
+    result = db.execute(
+        insert(LeaderboardEntry.__table__).from_select(
+            [
+                "project_id",
+                "hackathon_id",
+                "weighted_total",
+                "weight_sum",
+                "score_count",
+                "updated_at",
+            ],
+            totals,
+        )
+    )
+    for announce in broadcast.notify(hackathon_id or "*", broadcast.RELOAD):
+        db.execute(announce)
+    logger.info(
+        f"Rebuilt leaderboard ({hackathon_id or 'all hackathons'}): "
+        f"{result.rowcount} projects"
+    )
+    return result.rowcount
@@ -0,0 +1,238 @@
+"""
+Service layer for pairwise-comparison judging (Hackathon.voting_type "pairwise").
+
+Comparisons are stored in judging.pairwise_comparisons and ranked with the
+Crowd-BT fit in app.services.bradley_terry. The last fit of every hackathon is
+kept per worker and used as the warm start of the next one, so a refit after new
+comparisons converges in a few iterations instead of starting from scratch.
+"""
+
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.hackathon import Hackathon
+from app.models.judging import PairwiseComparison
+from app.models.project import Project
+from app.models.user import User
+from app.schemas.hackathon import VotingType
+from app.schemas.judging import PairwiseComparisonCreate
+from app.services import bradley_terry
+from app.services.assignment_service import conflicts_query
+
+
+@dataclass
+class _CachedFit:
+    project_ids: List[uuid.UUID]
+    judge_ids: List[uuid.UUID]
+    fit: bradley_terry.BTFit
+    comparisons: Tuple[int, int]
+
+
+_fits: Dict[uuid.UUID, _CachedFit] = {}
+_fits_lock = threading.Lock()
+
+
+def comparison_rows_query(hackathon_id: uuid.UUID):
+    return select(
+        PairwiseComparison.winner_id,
+        PairwiseComparison.loser_id,
+        PairwiseComparison.judge_id,
+        PairwiseComparison.id,
+    ).where(PairwiseComparison.hackathon_id == hackathon_id)
+
+
+def _comparisons_key(rows: Sequence) -> Tuple[int, int]:
+    """
+    Identifies the set of comparison rows: their count and the XOR of their ids.
+    Comparisons are deleted with their judge, so a count alone can stay the same
+    while the rows change.
+    """
+    digest = 0
+    for row in rows:
+        digest ^= row[3].int
+    return len(rows), digest
+
+
+def project_ids_query(hackathon_id: uuid.UUID):
+    return (
+        select(Project.id)
+        .where(Project.hackathon_id == hackathon_id)
+        .order_by(Project.id)
+    )
+
+
+def _carry_over(old_keys: Sequence, old_values, keys: Sequence, default: float):
+    """Previous values re-indexed to keys; new keys start at default."""
+    previous = dict(zip(old_keys, old_values))
+    return np.array([previous.get(key, default) for key in keys], dtype=float)
+
+
+def fit_hackathon(
+    hackathon_id: uuid.UUID, project_ids: Sequence[uuid.UUID], rows: Sequence
+) -> Tuple[List[uuid.UUID], bradley_terry.BTFit]:
+    """Refit from all comparison rows (winner, loser, judge, id), warm-started."""
+    project_ids = list(project_ids)
+    project_index = {p: i for i, p in enumerate(project_ids)}
+    # Comparisons of projects that left the hackathon are ignored
+    rows = [r for r in rows if r[0] in project_index and r[1] in project_index]
+    judge_ids = sorted({r[2] for r in rows})
+    judge_index = {j: i for i, j in enumerate(judge_ids)}
+    comparisons = _comparisons_key(rows)
+
+    with _fits_lock:
+        previous = _fits.get(hackathon_id)
+    init_log_strength = init_reliability = None
+    if previous is not None:
+        if (
+            previous.comparisons == comparisons
+            and previous.project_ids == project_ids
+        ):
+            return project_ids, previous.fit
+        init_log_strength = _carry_over(
+            previous.project_ids, previous.fit.log_strength, project_ids, 0.0
+        )
+        init_reliability = _carry_over(
+            previous.judge_ids,
+            previous.fit.reliability,
+            judge_ids,
+            bradley_terry.RELIABILITY_PRIOR_MEAN,
+        )
+
+    result = bradley_terry.fit(
+        winners=np.array([project_index[r[0]] for r in rows], dtype=np.intp),
+        losers=np.array([project_index[r[1]] for r in rows], dtype=np.intp),
+        judges=np.array([judge_index[r[2]] for r in rows], dtype=np.intp),
+        n_items=len(project_ids),
+        n_judges=len(judge_ids),
+        init_log_strength=init_log_strength,
+        init_reliability=init_reliability,
+    )
+    with _fits_lock:
+        _fits[hackathon_id] = _CachedFit(project_ids, judge_ids, result, comparisons)
+    return project_ids, result
+
+
+def get_pairwise_hackathon(db: Session, hackathon_id: uuid.UUID) -> Hackathon:
+    hackathon = db.query(Hackathon).filter(Hackathon.id == hackathon_id).first()
+    if not hackathon:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
+        )
+    if hackathon.voting_type != VotingType.pairwise.value:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This hackathon does not use pairwise judging.",
+        )
+    return hackathon
+
+
+def _prompt(hackathon: Hackathon) -> Optional[str]:
+    criteria = hackathon.judging_criteria or []
+    if criteria and isinstance(criteria[0], dict):
+        return criteria[0].get("description") or criteria[0].get("name")
+    return None
+
+
+def next_pair(db: Session, hackathon_id: uuid.UUID, judge: User) -> dict:
+    """The most informative pair this judge has not compared yet."""
+    hackathon = get_pairwise_hackathon(db, hackathon_id)
+    projects = db.execute(project_ids_query(hackathon_id)).scalars().all()
+    rows = db.execute(comparison_rows_query(hackathon_id)).all()
+    project_ids, result = fit_hackathon(hackathon_id, projects, rows)
+    # Judges never compare projects they own or whose team they are in
+    conflicts = conflicts_query(hackathon_id, [judge.id]).subquery()
+    own = set(db.execute(select(conflicts.c.project_id)).scalars())
+
+    n_items = len(project_ids)
+    index = {p: i for i, p in enumerate(project_ids)}
+    eligible = np.array([p not in own for p in project_ids], dtype=bool)
+    compared = np.array(
+        [
+            min(index[w], index[l]) * n_items + max(index[w], index[l])
+            for w, l, j, _ in rows
+            if j == judge.id and w in index and l in index
+        ],
+        dtype=np.int64,
+    )
+    pair = bradley_terry.select_pair(result, eligible, compared)
+    if pair is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No pairs left to compare for this judge.",
+        )
+    return {
+        "hackathon_id": hackathon_id,
+        "project_a_id": project_ids[pair[0]],
+        "project_b_id": project_ids[pair[1]],
+        "prompt": _prompt(hackathon),
+    }
+
+
+def record_comparison(
+    db: Session,
+    hackathon_id: uuid.UUID,
+    comparison_in: PairwiseComparisonCreate,
+    judge: User,
+) -> PairwiseComparison:
+    get_pairwise_hackathon(db, hackathon_id)
+    if comparison_in.winner_id == comparison_in.loser_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A project cannot be compared with itself.",
+        )
+    pair = [comparison_in.winner_id, comparison_in.loser_id]
+    found = db.execute(
+        select(Project.id).where(
+            Project.id.in_(pair), Project.hackathon_id == hackathon_id
+        )
+    ).all()
+    if len(found) != 2:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Both projects must belong to this hackathon.",
+        )
+    conflicts = conflicts_query(hackathon_id, [judge.id]).subquery()
+    if db.execute(select(conflicts).where(conflicts.c.project_id.in_(pair))).first():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Judges cannot compare their own or their team's projects.",
+        )
+    comparison = PairwiseComparison(
+        hackathon_id=hackathon_id, judge_id=judge.id, **comparison_in.model_dump()
+    )
+    try:
+        db.add(comparison)
+        db.commit()
+        return comparison
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This judge has already compared these projects.",
+        )
+
+
+def ranking(
+    hackathon_id: uuid.UUID, project_ids: Sequence[uuid.UUID], rows: Sequence
+) -> List[dict]:
+    """Projects by fitted strength, strongest first (CPU bound, no I/O)."""
+    project_ids, result = fit_hackathon(hackathon_id, project_ids, rows)
+    order = np.argsort(-result.log_strength, kind="stable")
+    return [
+        {
+            "project_id": project_ids[i],
+            "rank": rank,
+            "strength": float(result.log_strength[i]),
+            "std_error": float(result.std_error[i]),
+            "comparisons": int(result.comparisons[i]),
+        }
+        for rank, i in enumerate(order, start=1)
+    ]
@@ -12,6 +12,7 @@ import uuid, os, shutil, tempfile, zipfile, subprocess
 from datetime import datetime
 from app.static import project_image_path as project_file_path, SCRIPTS_DIR
 from app.logger import get_logger
+from app.counters import next_version_number
 
 logger = get_logger("project_service")
 
@@ -47,7 +48,6 @@ def create_project(
     )
     db.add(db_project)
     db.commit()
-    db.refresh(db_project)
     return db_project
 
 
@@ -79,18 +79,16 @@ def submit_project_version(
         shutil.copyfileobj(file.file, buffer)
     file.file.close()
     version = ProjectVersion(
-        id=uuid.uuid4(),
         project_id=project_uuid,
-        version_number=len(project.versions) + 1 if hasattr(project, "versions") else 1,
+        version_number=next_version_number(db, project_uuid),
         file_path=filename,
         version_notes=version_notes,
         submitted_by=current_user.id,
         status="pending",
     )
     db.add(version)
+    # Committed before the build so no transaction stays open while it runs
     db.commit()
-    db.expire_all()
-    db.refresh(version)
     temp_dir = tempfile.mkdtemp()
     try:
         with zipfile.ZipFile(file_path, "r") as zip_ref:
@@ -133,14 +131,10 @@ def submit_project_version(
             project.status = "failed"
         version.build_logs = build_output
         db.commit()
-        db.expire_all()
-        db.refresh(version)
     except zipfile.BadZipFile:
         version.status = "failed"
         version.build_logs = "Upload is not a valid ZIP file."
         db.commit()
-        db.expire_all()
-        db.refresh(version)
         raise HTTPException(
             status_code=400, detail="Uploaded file is not a valid ZIP archive."
         )
@@ -148,8 +142,6 @@ def submit_project_version(
         version.status = "failed"
         version.build_logs = f"Build failed: {str(e)}"
         db.commit()
-        db.expire_all()
-        db.refresh(version)
         raise HTTPException(status_code=400, detail=f"Build failed: {str(e)}")
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
@@ -0,0 +1,336 @@
+"""
+Service layer for hackathon registrations.
+
+Registering is check-then-insert: no solo registration of the user, no
+registration of their team, none of the members registered solo, ... Two
+concurrent requests for the same participant could both pass the checks, so the
+checks and the insert run under transaction-scoped advisory locks keyed by
+(hackathon, user) and (hackathon, team). A team takes its own key plus those of
+its members, which is what a solo registration of a member takes as well.
+Registrations of unrelated participants never wait for each other here. The
+partial unique indexes uq_registrations_hackathon_user / _team back the locks up
+for writes that do not take them.
+
+With max_participants set, only that many registrations (a team counts once)
+are "registered"; later ones are "waitlisted" and move up, oldest first, when a
+seat is freed. Claiming a seat locks the hackathon row (FOR UPDATE on the
+count). A "registered" insert row-locks it as well, with or without a limit: its
+flush bumps hackathons.registration_count (app.counters). Both locks are held
+until commit, but register() flushes only at its commit, after the checks, so
+concurrent registrations check in parallel and queue only for that tail.
+"""
+
+import hashlib
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.hackathon import Hackathon
+from app.models.hackathon_registration import (
+    REGISTERED,
+    WAITLISTED,
+    HackathonRegistration,
+)
+from app.models.project import Project
+from app.models.team import Team, TeamMember, TeamMemberRole
+from app.models.user import User
+from app.schemas.hackathon import HackathonStatus, ParticipantRegistrationCreate
+from app.schemas.project import ProjectStatus
+
+UNIQUE_INDEXES = {
+    "uq_registrations_hackathon_user",
+    "uq_registrations_hackathon_team",
+}
+
+
+def _is_admin(user: User) -> bool:
+    return any(r.role == "admin" for r in getattr(user, "roles_association", []))
+
+
+def lock_key(hackathon_id: uuid.UUID, kind: str, participant_id: uuid.UUID) -> int:
+    """Signed 64-bit advisory lock key of a participant within a hackathon."""
+    digest = hashlib.blake2b(
+        f"{hackathon_id}:{kind}:{participant_id}".encode(), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def lock_participants(db: Session, keys: Iterable[int]) -> None:
+    """Take the advisory locks until the transaction ends, in a fixed order."""
+    for key in sorted(set(keys)):
+        db.execute(select(func.pg_advisory_xact_lock(key)))
+
+
+def _open_hackathon(db: Session, hackathon_id: uuid.UUID) -> Hackathon:
+    hackathon = db.query(Hackathon).filter(Hackathon.id == hackathon_id).first()
+    if not hackathon:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
+        )
+    if (
+        hackathon.registration_deadline
+        and hackathon.registration_deadline < datetime.now(timezone.utc)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Registration deadline has passed.",
+        )
+    return hackathon
+
+
+def _lock_solo(db: Session, hackathon: Hackathon, user: User) -> None:
+    """Lock the user's key, then reject them if they already take part."""
+    lock_participants(db, [lock_key(hackathon.id, "user", user.id)])
+    user_team_ids = select(TeamMember.team_id).where(TeamMember.user_id == user.id)
+    existing = db.execute(
+        select(HackathonRegistration.user_id)
+        .where(
+            HackathonRegistration.hackathon_id == hackathon.id,
+            or_(
+                HackathonRegistration.user_id == user.id,
+                HackathonRegistration.team_id.in_(user_team_ids),
+            ),
+        )
+        .limit(1)
+    ).first()
+    if existing is None:
+        return
+    if existing.user_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User is already registered solo for this hackathon.",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="User is already participating in this hackathon with a team.",
+    )
+
+
+def _lock_team(db: Session, hackathon: Hackathon, team: Team) -> None:
+    """Lock the team's and its members' keys, then reject it if any takes part."""
+    member_ids = list(
+        db.scalars(select(TeamMember.user_id).where(TeamMember.team_id == team.id))
+    )
+    lock_participants(
+        db,
+        [lock_key(hackathon.id, "team", team.id)]
+        + [lock_key(hackathon.id, "user", user_id) for user_id in member_ids],
+    )
+    conflicts = [HackathonRegistration.team_id == team.id]
+    if member_ids:
+        conflicts.append(HackathonRegistration.user_id.in_(member_ids))
+    existing = db.execute(
+        select(HackathonRegistration.team_id, User.username)
+        .outerjoin(User, User.id == HackathonRegistration.user_id)
+        .where(HackathonRegistration.hackathon_id == hackathon.id, or_(*conflicts))
+        # The team's own registration first
+        .order_by(HackathonRegistration.team_id.is_(None))
+        .limit(1)
+    ).first()
+    if existing is None:
+        return
+    if existing.team_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Team is already registered for this hackathon.",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"{existing.username or 'A team member'} is already registered solo "
+        "for this hackathon. Cannot register team.",
+    )
+
+
+def _claim_seat(db: Session, hackathon: Hackathon) -> str:
+    """Status of a new registration: registered while seats are left."""
+    if hackathon.max_participants is None:
+        return REGISTERED
+    # Held until commit; concurrent claims for this hackathon queue up here
+    taken, capacity = db.execute(
+        select(Hackathon.registration_count, Hackathon.max_participants)
+        .where(Hackathon.id == hackathon.id)
+        .with_for_update()
+    ).one()
+    if capacity is None or taken < capacity:
+        return REGISTERED
+    return WAITLISTED
+
+
+def register(
+    db: Session,
+    hackathon_id: uuid.UUID,
+    registration_in: ParticipantRegistrationCreate,
+    current_user: User,
+) -> HackathonRegistration:
+    """Register a user or a team, with a new draft project as its entry."""
+    hackathon = _open_hackathon(db, hackathon_id)
+    if hackathon.status not in [HackathonStatus.UPCOMING, HackathonStatus.ACTIVE]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Hackathon is not open for registration.",
+        )
+
+    user: Optional[User] = None
+    team: Optional[Team] = None
+    if registration_in.user_id:
+        # --- SOLO REGISTRATION ---
+        if not hackathon.allow_individuals:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Solo participation is not allowed for this hackathon.",
+            )
+        user = db.query(User).filter(User.id == registration_in.user_id).first()
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User to register not found.",
+            )
+        # Current user must be the user being registered or an admin
+        if current_user.id != user.id and not _is_admin(current_user):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to register this user.",
+            )
+        _lock_solo(db, hackathon, user)
+        entry_name = f"{user.username}'s entry for {hackathon.name}"
+    elif registration_in.team_id:
+        # --- TEAM REGISTRATION ---
+        team = db.query(Team).filter(Team.id == registration_in.team_id).first()
+        if not team:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Team to register not found.",
+            )
+        is_team_owner = db.execute(
+            select(TeamMember.user_id).where(
+                TeamMember.team_id == team.id,
+                TeamMember.user_id == current_user.id,
+                TeamMember.role == TeamMemberRole.owner,
+            )
+        ).first()
+        if not (is_team_owner or _is_admin(current_user)):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User must be an owner of the team or a platform admin to register it.",
+            )
+        if hackathon.min_team_size and team.member_count < hackathon.min_team_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Team size is less than the minimum of {hackathon.min_team_size}.",
+            )
+        if hackathon.max_team_size and team.member_count > hackathon.max_team_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Team size exceeds the maximum of {hackathon.max_team_size}.",
+            )
+        _lock_team(db, hackathon, team)
+        entry_name = f"{team.name}'s entry for {hackathon.name}"
+    else:
+        # Should be caught by Pydantic model_validator, but as a safeguard:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid registration data: user_id or team_id must be provided.",
+        )
+
+    registration = HackathonRegistration(
+        hackathon_id=hackathon.id,
+        user_id=user.id if user else None,
+        team_id=team.id if team else None,
+        project=Project(
+            name=entry_name,
+            status=ProjectStatus.DRAFT,
+            hackathon_id=hackathon.id,
+            # A team's entry belongs to whoever registered it
+            owner_id=user.id if user else current_user.id,
+            team_id=team.id if team else None,
+        ),
+        status=_claim_seat(db, hackathon),
+    )
+    db.add(registration)
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        constraint = getattr(getattr(e.orig, "diag", None), "constraint_name", None)
+        if constraint in UNIQUE_INDEXES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Already registered for this hackathon.",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database integrity error during registration: {e}",
+        )
+    return registration
+
+
+def promote_waitlisted(db: Session, hackathon_id: uuid.UUID) -> int:
+    """
+    Fill the free seats from the waitlist, oldest registration first (no
+    commit). Returns the number of registrations promoted.
+    """
+    taken, capacity = db.execute(
+        select(Hackathon.registration_count, Hackathon.max_participants)
+        .where(Hackathon.id == hackathon_id)
+        .with_for_update()
+    ).one()
+    free = None if capacity is None else capacity - taken
+    if free is not None and free <= 0:
+        return 0
+    stmt = (
+        select(HackathonRegistration)
+        .where(
+            HackathonRegistration.hackathon_id == hackathon_id,
+            HackathonRegistration.status == WAITLISTED,
+        )
+        .order_by(HackathonRegistration.registered_at, HackathonRegistration.id)
+        .with_for_update(skip_locked=True)
+    )
+    if free is not None:
+        stmt = stmt.limit(free)
+    promoted = db.scalars(stmt).all()
+    for registration in promoted:
+        registration.status = REGISTERED
+    db.flush()
+    return len(promoted)
+
+
+def withdraw(db: Session, hackathon_id: uuid.UUID, current_user: User) -> None:
+    """
+    Withdraw the user's solo registration, or that of a team they own or
+    administer, and give its seat to the waitlist.
+    """
+    _open_hackathon(db, hackathon_id)
+    managed_team_ids = select(TeamMember.team_id).where(
+        TeamMember.user_id == current_user.id,
+        TeamMember.role.in_([TeamMemberRole.owner, TeamMemberRole.admin]),
+    )
+    registration = db.scalars(
+        select(HackathonRegistration)
+        .where(
+            HackathonRegistration.hackathon_id == hackathon_id,
+            or_(
+                HackathonRegistration.user_id == current_user.id,
+                HackathonRegistration.team_id.in_(managed_team_ids),
+            ),
+        )
+        # The solo registration first
+        .order_by(HackathonRegistration.user_id.is_(None))
+        .limit(1)
+    ).first()
+    if not registration:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No registration found for user or their teams.",
+        )
+    freed_seat = registration.status == REGISTERED
+    db.delete(registration)
+    db.flush()
+    if freed_seat:
+        promote_waitlisted(db, hackathon_id)
+    db.commit()
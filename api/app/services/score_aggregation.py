@@ -0,0 +1,194 @@
+"""
+Vectorized score aggregation with per-judge normalization.
+
+All scores of a hackathon are fetched as flat columns in one query and scattered
+into a dense (project, judge, criterion) tensor, NaN where a judge did not score.
+Normalization and aggregation are whole-array NumPy operations:
+
+1. every score is scaled to [0, 1] by its criterion's max_score;
+2. each judge's scores are normalized ("zscore": centred and scaled by the judge's
+   own mean / std; "minmax": stretched over the judge's own range; "none"), which
+   removes the bias of harsh or lenient judges;
+3. a judge's verdict on a project is the criterion-weighted mean of their scores;
+4. a project's result is the mean over its judges, with a Student-t confidence
+   interval from the spread between judges.
+
+scripts/benchmark_score_aggregation.py times this at 10k projects.
+"""
+
+import uuid
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+
+from app.models.judging import Criterion, Score
+from app.models.project import Project
+
+NORMALIZATION_METHODS = ("zscore", "minmax", "none")
+
+
+def _factorize(keys: Sequence):
+    """Distinct keys and each entry's index into them."""
+    return np.unique(np.asarray(keys, dtype=object), return_inverse=True)
+
+
+@dataclass
+class ScoreTensor:
+    project_ids: np.ndarray  # (P,) object array of UUIDs
+    judge_ids: np.ndarray  # (J,)
+    criterion_ids: np.ndarray  # (C,)
+    weights: np.ndarray  # (C,) float
+    values: np.ndarray  # (P, J, C) float, score / max_score, NaN if missing
+
+
+@dataclass
+class AggregatedResult:
+    project_id: uuid.UUID
+    rank: int
+    score: float
+    ci_low: Optional[float]  # None with a single judge
+    ci_high: Optional[float]
+    judge_count: int
+
+
+def build_tensor(
+    project_ids: Sequence,
+    judge_ids: Sequence,
+    criterion_ids: Sequence,
+    scores: Sequence,
+    weights: Sequence,
+    max_scores: Sequence,
+) -> ScoreTensor:
+    """Scatter flat score columns (one entry per score row) into a dense tensor."""
+    project_keys, p = _factorize(project_ids)
+    judge_keys, j = _factorize(judge_ids)
+    criterion_keys, c = _factorize(criterion_ids)
+    # Per-row criterion attributes -> one value per criterion
+    criterion_weights = np.zeros(len(criterion_keys))
+    criterion_weights[c] = np.asarray(weights, dtype=float)
+    values = np.full((len(project_keys), len(judge_keys), len(criterion_keys)), np.nan)
+    values[p, j, c] = np.asarray(scores, dtype=float) / np.asarray(
+        max_scores, dtype=float
+    )
+    return ScoreTensor(
+        project_keys, judge_keys, criterion_keys, criterion_weights, values
+    )
+
+
+def score_rows_query(hackathon_id: uuid.UUID):
+    """The single flat query feeding tensor_from_rows."""
+    return (
+        select(
+            Score.project_id,
+            Score.judge_id,
+            Score.criteria_id,
+            Score.score,
+            Criterion.weight,
+            Criterion.max_score,
+        )
+        .join(Criterion, Criterion.id == Score.criteria_id)
+        .join(Project, Project.id == Score.project_id)
+        .where(Project.hackathon_id == hackathon_id)
+    )
+
+
+def tensor_from_rows(rows) -> ScoreTensor:
+    if not rows:
+        empty = np.empty(0, dtype=object)
+        return ScoreTensor(empty, empty, empty, np.empty(0), np.empty((0, 0, 0)))
+    return build_tensor(*zip(*rows))
+
+
+def normalize(values: np.ndarray, method: str = "zscore") -> np.ndarray:
+    """Normalize each judge's scores (axis 1 of the tensor) over all they gave."""
+    if method not in NORMALIZATION_METHODS:
+        raise ValueError(f"Unknown normalization {method!r}")
+    if method == "none" or values.size == 0:
+        return values
+    axes = (0, 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if method == "zscore":
+            mean = np.nanmean(values, axis=axes, keepdims=True)
+            std = np.nanstd(values, axis=axes, keepdims=True)
+            # A judge who gave every score the same value carries no ranking signal
+            result = np.where(std > 0, (values - mean) / std, 0.0)
+        else:
+            low = np.nanmin(values, axis=axes, keepdims=True)
+            span = np.nanmax(values, axis=axes, keepdims=True) - low
+            result = np.where(span > 0, (values - low) / span, 0.5)
+    result[np.isnan(values)] = np.nan
+    return result
+
+
+def t_quantile(p: float, df: np.ndarray) -> np.ndarray:
+    """
+    Student-t quantile: exact for 1 and 2 degrees of freedom, otherwise the
+    Cornish-Fisher expansion around the normal quantile (within 1% from 3 up).
+    """
+    z = NormalDist().inv_cdf(p)
+    df = np.asarray(df, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expansion = (
+            z
+            + (z**3 + z) / (4 * df)
+            + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+            + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * df**3)
+        )
+    one = np.tan(np.pi * (p - 0.5))
+    two = (2 * p - 1) / np.sqrt(2 * p * (1 - p))
+    return np.where(df == 1, one, np.where(df == 2, two, expansion))
+
+
+def judge_verdicts(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """(P, J): each judge's weighted mean over the criteria they scored, or NaN."""
+    scored = ~np.isnan(values)
+    weights = np.broadcast_to(weights, values.shape)
+    weight_sum = np.where(scored, weights, 0.0).sum(axis=2)
+    weighted = np.where(scored, values * weights, 0.0).sum(axis=2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(weight_sum > 0, weighted / weight_sum, np.nan)
+
+
+def aggregate(
+    tensor: ScoreTensor, method: str = "zscore", confidence: float = 0.95
+) -> List[AggregatedResult]:
+    """Rank the projects by their mean normalized, criterion-weighted score."""
+    if tensor.values.size == 0:
+        return []
+    per_judge = judge_verdicts(normalize(tensor.values, method), tensor.weights)
+
+    # (P,): mean and spread across judges
+    judged = ~np.isnan(per_judge)
+    n = judged.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(per_judge, axis=1) / n
+        deviations = np.where(judged, per_judge - mean[:, None], 0.0)
+        std = np.sqrt((deviations**2).sum(axis=1) / (n - 1))
+        half_width = t_quantile((1 + confidence) / 2, n - 1) * std / np.sqrt(n)
+
+    # Best mean first, ties broken by project id; lexsort's last key is primary
+    order = np.lexsort(
+        (tensor.project_ids.astype(str), -np.nan_to_num(mean, nan=-np.inf))
+    )
+    return [
+        AggregatedResult(
+            project_id=tensor.project_ids[i],
+            rank=rank,
+            score=float(mean[i]),
+            ci_low=float(mean[i] - half_width[i]) if n[i] > 1 else None,
+            ci_high=float(mean[i] + half_width[i]) if n[i] > 1 else None,
+            judge_count=int(n[i]),
+        )
+        for rank, i in enumerate(order, start=1)
+        if n[i] > 0
+    ]
+
+
+def rank_projects(
+    rows, method: str = "zscore", confidence: float = 0.95
+) -> List[AggregatedResult]:
+    """Rows of score_rows_query -> ranked results (CPU bound, no I/O)."""
+    return aggregate(tensor_from_rows(rows), method, confidence)
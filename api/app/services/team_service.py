@@ -2,6 +2,9 @@
 Service layer for team-related business logic.
 """
 
+from typing import Optional
+
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
 from app.models.team import (
     Team,
@@ -14,8 +17,14 @@ from app.models.team import (
 )
 from app.models.hackathon import Hackathon
 from app.models.user import User
+from app.loaders import loader_options
 from app.schemas.team import TeamCreate, TeamUpdate, TeamMemberRole
 from app.schemas.hackathon import HackathonStatus
+from app.utils.concurrency import (
+    check_update_conflict,
+    fetch_updated,
+    versioned_update,
+)
 from fastapi import HTTPException, status
 import secrets
 import uuid
@@ -27,7 +36,12 @@ IS_ADMIN = lambda user: any(
 
 def create_team(db: Session, team_in: TeamCreate, current_user: User) -> Team:
     """Create a new team for a specific hackathon. The creator becomes the team leader."""
-    hackathon = db.query(Hackathon).filter(Hackathon.id == team_in.hackathon_id).first()
+    hackathon = (
+        db.query(Hackathon)
+        .options(*loader_options(Hackathon, "authz"))
+        .filter(Hackathon.id == team_in.hackathon_id)
+        .first()
+    )
     if not hackathon:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
@@ -44,15 +58,10 @@ def create_team(db: Session, team_in: TeamCreate, current_user: User) -> Team:
             is_open=team_in.is_open,
             hackathon_id=team_in.hackathon_id,
             status=TeamStatus.active,
+            members=[TeamMember(user_id=current_user.id, role=TeamMemberRole.owner)],
         )
         db.add(db_team)
-        db.flush()
-        team_leader = TeamMember(
-            team_id=db_team.id, user_id=current_user.id, role=TeamMemberRole.owner
-        )
-        db.add(team_leader)
         db.commit()
-        db.refresh(db_team)
         return db_team
     except Exception:
         db.rollback()
@@ -62,43 +71,60 @@ def create_team(db: Session, team_in: TeamCreate, current_user: User) -> Team:
         )
 
 
-def update_team(db: Session, team_id: uuid.UUID, team_in: TeamUpdate) -> Team:
-    """Update a team's details."""
-    db_team = db.query(Team).filter(Team.id == team_id).first()
-    if not db_team:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Team not found"
-        )
-    hackathon = db.query(Hackathon).filter(Hackathon.id == db_team.hackathon_id).first()
-    if not hackathon or hackathon.status != HackathonStatus.ACTIVE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot update team for inactive hackathon",
-        )
-    update_data = team_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_team, field, value)
+def update_team(
+    db: Session,
+    team_id: uuid.UUID,
+    team_in: TeamUpdate,
+    expected_version: Optional[int] = None,
+) -> Team:
+    """
+    Update a team's details in one conditional UPDATE (hackathon still active,
+    version unchanged if expected_version is given).
+    """
+    hackathon_active = exists().where(
+        Hackathon.id == Team.hackathon_id,
+        Hackathon.status == HackathonStatus.ACTIVE,
+    )
+    stmt = versioned_update(
+        Team, team_id, team_in.model_dump(exclude_unset=True), expected_version
+    ).where(hackathon_active)
     try:
-        db.add(db_team)
-        db.commit()
-        db.refresh(db_team)
-        return db_team
+        row = fetch_updated(db, Team, stmt)
+        if row is not None:
+            db.commit()
+            return row.Team
     except Exception:
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Team name already exists for this hackathon or other integrity violation.",
         )
+    db.rollback()
+    check_update_conflict(db, Team, team_id, expected_version, "Team not found")
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Cannot update team for inactive hackathon",
+    )
 
 
 def join_team(db: Session, team_id: uuid.UUID, current_user: User):
     """Allow the current user to join an existing team as a member."""
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = (
+        db.query(Team)
+        .options(*loader_options(Team, "authz"))
+        .filter(Team.id == team_id)
+        .first()
+    )
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Team not found"
         )
-    hackathon = db.query(Hackathon).filter(Hackathon.id == team.hackathon_id).first()
+    hackathon = (
+        db.query(Hackathon)
+        .options(*loader_options(Hackathon, "authz"))
+        .filter(Hackathon.id == team.hackathon_id)
+        .first()
+    )
     if not hackathon or hackathon.status != HackathonStatus.ACTIVE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -147,10 +173,20 @@ def leave_team(db: Session, team_id: uuid.UUID, membership_to_delete: TeamMember
 
 def request_join(db: Session, team_id: uuid.UUID, current_user: User):
     """Request to join a team."""
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = (
+        db.query(Team)
+        .options(*loader_options(Team, "authz"))
+        .filter(Team.id == team_id)
+        .first()
+    )
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
-    hackathon = db.query(Hackathon).filter(Hackathon.id == team.hackathon_id).first()
+    hackathon = (
+        db.query(Hackathon)
+        .options(*loader_options(Hackathon, "authz"))
+        .filter(Hackathon.id == team.hackathon_id)
+        .first()
+    )
     if not hackathon or hackathon.status != HackathonStatus.ACTIVE:
         raise HTTPException(
             status_code=400, detail="Cannot request to join team for inactive hackathon"
@@ -176,10 +212,20 @@ def accept_join_request(
     db: Session, team_id: uuid.UUID, user_id: uuid.UUID, current_user: User
 ):
     """Accept a join request for a team."""
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = (
+        db.query(Team)
+        .options(*loader_options(Team, "authz"))
+        .filter(Team.id == team_id)
+        .first()
+    )
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
-    hackathon = db.query(Hackathon).filter(Hackathon.id == team.hackathon_id).first()
+    hackathon = (
+        db.query(Hackathon)
+        .options(*loader_options(Hackathon, "authz"))
+        .filter(Hackathon.id == team.hackathon_id)
+        .first()
+    )
     if not hackathon or hackathon.status != HackathonStatus.ACTIVE:
         raise HTTPException(
             status_code=400, detail="Cannot accept join request for inactive hackathon"
@@ -23,23 +23,17 @@ def register_user(db: Session, user_in: UserCreate) -> User:
     existing = db.query(User).filter(User.email == user_in.email).first()
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
+    roles = user_in.roles if user_in.roles else [UserRole.PARTICIPANT]
     user = User(
         email=user_in.email,
         hashed_password=get_password_hash(user_in.password),
         full_name=user_in.full_name,
         username=user_in.username,
         github_id=user_in.github_id,
+        roles_association=[UserRoleAssociation(role=role) for role in roles],
     )
     db.add(user)
     db.commit()
-    db.refresh(user)
-    # Rollen setzen
-    roles = user_in.roles if user_in.roles else [UserRole.PARTICIPANT]
-    for role in roles:
-        assoc = UserRoleAssociation(user_id=user.id, role=role)
-        db.add(assoc)
-    db.commit()
-    db.refresh(user)
     return user
 
 
@@ -80,18 +74,13 @@ def update_profile(db: Session, user_in: UserUpdate, current_user: User) -> User
         update_data.pop("current_password")
     # Rollen aktualisieren
     if "roles" in update_data and update_data["roles"] is not None:
-        db.query(UserRoleAssociation).filter(
-            UserRoleAssociation.user_id == current_user.id
-        ).delete()
-        for role in update_data["roles"]:
-            assoc = UserRoleAssociation(user_id=current_user.id, role=role)
-            db.add(assoc)
-        update_data.pop("roles")
+        current_user.roles_association = [
+            UserRoleAssociation(role=role) for role in update_data.pop("roles")
+        ]
     for field, value in update_data.items():
         setattr(current_user, field, value)
     db.add(current_user)
     db.commit()
-    db.refresh(current_user)
     return current_user
 
 
@@ -127,7 +116,6 @@ def upload_avatar_file(db: Session, file: UploadFile, current_user: User) -> dic
     current_user.avatar_url = avatar_url_value
     db.add(current_user)
     db.commit()
-    db.refresh(current_user)
     return {"avatar_url": avatar_url_value}
 
 
@@ -0,0 +1,329 @@
+"""
+Audience voting (Hackathon.voting_type "users", "public" or "mixed") built for a
+live-audience spike.
+
+A vote never touches the database on the request path:
+
+- the hackathon's voting settings (window, flags, project ids) are cached per
+  worker for VOTING_CONFIG_TTL_S and loaded with the voters seen so far on the
+  first vote of a hackathon;
+- duplicates are rejected from an in-memory set of (voter, ballot), where the
+  ballot is the project when voters may vote for several projects and the
+  hackathon otherwise;
+- accepted votes are appended to a buffer and counted in per-project pending
+  tallies.
+
+run_flusher() drains the buffer every VOTE_FLUSH_INTERVAL_S (or as soon as
+VOTE_BATCH_SIZE votes are waiting) with one INSERT ... SELECT FROM (VALUES ...)
+ON CONFLICT DO NOTHING per batch, which also drops duplicates accepted by another
+worker, and adds the votes actually inserted to judging.vote_tallies in the same
+transaction, announcing the new tallies to live subscribers (app.broadcast).
+Everything here runs on the event loop, so no locking is needed beyond the
+flush lock.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import column, select, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import broadcast
+from app.database import AsyncSessionLocal
+from app.logger import get_logger
+from app.models.hackathon import Hackathon
+from app.models.judging import Vote, VoteTally
+from app.models.project import Project
+from app.models.user import User
+from app.schemas.hackathon import VotingType
+from app.utils.ids import uuid7
+
+logger = get_logger("voting")
+
+VOTE_FLUSH_INTERVAL_S = float(os.getenv("VOTE_FLUSH_INTERVAL_S", "0.5"))
+VOTE_BATCH_SIZE = int(os.getenv("VOTE_BATCH_SIZE", "2000"))
+# Votes waiting for a flush before new ones are refused with 503
+VOTE_MAX_PENDING = int(os.getenv("VOTE_MAX_PENDING", "200000"))
+VOTING_CONFIG_TTL_S = float(os.getenv("VOTING_CONFIG_TTL_S", "30"))
+
+AUDIENCE_VOTING_TYPES = {
+    VotingType.users.value,
+    VotingType.public.value,
+    VotingType.mixed.value,
+}
+
+
+@dataclass
+class VotingConfig:
+    voting_type: str
+    voting_start: Optional[datetime]
+    voting_end: Optional[datetime]
+    anonymous_votes: bool
+    allow_multiple_votes: bool
+    project_ids: FrozenSet[uuid.UUID]
+    loaded_at: float
+
+    def is_open(self, now: datetime) -> bool:
+        if self.voting_start and now < self.voting_start:
+            return False
+        if self.voting_end and now >= self.voting_end:
+            return False
+        return True
+
+
+def voter_key(hackathon_id: uuid.UUID, identity: str) -> str:
+    """Stored instead of the identity itself, so anonymous votes stay anonymous."""
+    return hashlib.sha256(f"{hackathon_id}:{identity}".encode()).hexdigest()
+
+
+class VoteBuffer:
+    def __init__(self):
+        self._configs: Dict[uuid.UUID, VotingConfig] = {}
+        self._seen: Dict[uuid.UUID, Set[Tuple[str, uuid.UUID]]] = {}
+        self._pending: List[dict] = []
+        self._pending_tallies: Dict[uuid.UUID, Counter] = defaultdict(Counter)
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def invalidate(self, hackathon_id: uuid.UUID) -> None:
+        """Drop the cached settings, e.g. after the hackathon was updated."""
+        self._configs.pop(hackathon_id, None)
+
+    async def config(
+        self, db: AsyncSession, hackathon_id: uuid.UUID
+    ) -> Optional[VotingConfig]:
+        cached = self._configs.get(hackathon_id)
+        if cached and time.monotonic() - cached.loaded_at < VOTING_CONFIG_TTL_S:
+            return cached
+        hackathon = (
+            await db.execute(
+                select(
+                    Hackathon.voting_type,
+                    Hackathon.voting_start,
+                    Hackathon.voting_end,
+                    Hackathon.anonymous_votes,
+                    Hackathon.allow_multiple_votes,
+                ).where(Hackathon.id == hackathon_id)
+            )
+        ).first()
+        if hackathon is None:
+            self._configs.pop(hackathon_id, None)
+            return None
+        project_ids = await db.scalars(
+            select(Project.id).where(Project.hackathon_id == hackathon_id)
+        )
+        config = VotingConfig(
+            **hackathon._asdict(),
+            project_ids=frozenset(project_ids),
+            loaded_at=time.monotonic(),
+        )
+        if hackathon_id not in self._seen:
+            # Votes stored before this worker started (or by other workers)
+            stored = await db.execute(
+                select(Vote.voter_key, Vote.ballot_id).where(
+                    Vote.hackathon_id == hackathon_id
+                )
+            )
+            self._seen.setdefault(hackathon_id, set()).update(map(tuple, stored))
+        self._configs[hackathon_id] = config
+        return config
+
+    async def submit(
+        self,
+        db: AsyncSession,
+        hackathon_id: uuid.UUID,
+        project_id: uuid.UUID,
+        identity: str,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> None:
+        """Validate and buffer one vote; identity is the user or anonymous voter."""
+        config = await self.config(db, hackathon_id)
+        if config is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Hackathon not found"
+            )
+        if config.voting_type not in AUDIENCE_VOTING_TYPES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="This hackathon does not accept audience votes.",
+            )
+        if config.voting_type == VotingType.users.value and user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Log in to vote in this hackathon.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        now = datetime.now(timezone.utc)
+        if not config.is_open(now):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Voting is not open."
+            )
+        if project_id not in config.project_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found in this hackathon.",
+            )
+
+        key = voter_key(hackathon_id, identity)
+        ballot_id = project_id if config.allow_multiple_votes else hackathon_id
+        seen = self._seen.setdefault(hackathon_id, set())
+        if (key, ballot_id) in seen:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="You have already voted."
+                if not config.allow_multiple_votes
+                else "You have already voted for this project.",
+            )
+        if len(self._pending) >= VOTE_MAX_PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many votes in flight, please retry.",
+                headers={"Retry-After": "1"},
+            )
+        seen.add((key, ballot_id))
+        self._pending.append(
+            {
+                "id": uuid7(),
+                "hackathon_id": hackathon_id,
+                "project_id": project_id,
+                "voter_key": key,
+                "ballot_id": ballot_id,
+                "user_id": None if config.anonymous_votes else user_id,
+                "created_at": now,
+            }
+        )
+        self._pending_tallies[hackathon_id][project_id] += 1
+        if len(self._pending) >= VOTE_BATCH_SIZE:
+            self._wake.set()
+
+    def pending_tallies(self, hackathon_id: uuid.UUID) -> Counter:
+        return Counter(self._pending_tallies.get(hackathon_id, ()))
+
+    async def flush(self, session_factory=AsyncSessionLocal) -> int:
+        """Write every buffered vote; returns how many were new."""
+        inserted = 0
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[:VOTE_BATCH_SIZE]
+                del self._pending[:VOTE_BATCH_SIZE]
+                written = False
+                try:
+                    async with session_factory() as db:
+                        inserted += await _write_batch(db, batch)
+                    written = True
+                except Exception as e:
+                    logger.error(f"Flushing {len(batch)} votes failed: {e}")
+                finally:
+                    if not written:
+                        # Keep the votes for the next attempt, also when the
+                        # flusher is cancelled mid-write (shutdown)
+                        self._pending[:0] = batch
+                if not written:
+                    break
+                for row in batch:
+                    waiting = self._pending_tallies[row["hackathon_id"]]
+                    waiting[row["project_id"]] -= 1
+                    if waiting[row["project_id"]] <= 0:
+                        del waiting[row["project_id"]]
+        return inserted
+
+    async def run_flusher(self, interval_s: float = VOTE_FLUSH_INTERVAL_S):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+
+# user_id last: it is looked up, see _write_batch
+_BATCH_COLUMNS = (
+    "id",
+    "hackathon_id",
+    "project_id",
+    "voter_key",
+    "ballot_id",
+    "created_at",
+    "user_id",
+)
+
+
+async def _write_batch(db: AsyncSession, rows: List[dict]) -> int:
+    votes = Vote.__table__
+    batch = values(
+        *(column(name, votes.c[name].type) for name in _BATCH_COLUMNS), name="batch"
+    ).data([tuple(row[name] for name in _BATCH_COLUMNS) for row in rows])
+    # INSERT ... SELECT so votes for projects (or voters) deleted while the vote
+    # was buffered are dropped instead of failing the whole batch
+    user_exists = select(User.id).where(User.id == batch.c.user_id)
+    source = select(
+        *(batch.c[name] for name in _BATCH_COLUMNS[:-1]),
+        user_exists.scalar_subquery(),
+    ).join(Project, Project.id == batch.c.project_id)
+    stmt = (
+        pg_insert(votes)
+        .from_select(list(_BATCH_COLUMNS), source)
+        .on_conflict_do_nothing(constraint="uq_vote_ballot")
+        .returning(votes.c.hackathon_id, votes.c.project_id)
+    )
+    counts = Counter(tuple(row) for row in await db.execute(stmt))
+    if counts:
+        tally = VoteTally.__table__
+        now = datetime.now(timezone.utc)
+        added = pg_insert(tally).values(
+            [
+                {
+                    "project_id": project_id,
+                    "hackathon_id": hackathon_id,
+                    "votes": n,
+                    "updated_at": now,
+                }
+                for (hackathon_id, project_id), n in counts.items()
+            ]
+        )
+        upsert = added.on_conflict_do_update(
+            index_elements=[tally.c.project_id],
+            set_={
+                "votes": tally.c.votes + added.excluded.votes,
+                "updated_at": added.excluded.updated_at,
+            },
+        ).returning(tally.c.hackathon_id, tally.c.project_id, tally.c.votes)
+        updated: Dict[uuid.UUID, Dict[uuid.UUID, int]] = defaultdict(dict)
+        for hackathon_id, project_id, n in await db.execute(upsert):
+            updated[hackathon_id][project_id] = n
+        for hackathon_id, votes in updated.items():
+            for announce in broadcast.notify(hackathon_id, broadcast.VOTES, votes):
+                await db.execute(announce)
+    await db.commit()
+    return sum(counts.values())
+
+
+async def tallies(db: AsyncSession, hackathon_id: uuid.UUID) -> List[dict]:
+    """Stored tallies plus this worker's votes still waiting for a flush."""
+    counts = buffer.pending_tallies(hackathon_id)
+    stored = await db.execute(
+        select(VoteTally.project_id, VoteTally.votes).where(
+            VoteTally.hackathon_id == hackathon_id
+        )
+    )
+    for project_id, votes in stored:
+        counts[project_id] += votes
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+    return [{"project_id": p, "votes": n} for p, n in ranked]
+
+
+buffer = VoteBuffer()
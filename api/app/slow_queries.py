@@ -0,0 +1,227 @@
+"""
+Slow-query log.
+
+Every statement slower than SLOW_QUERY_MS is recorded under a fingerprint (the SQL
+with placeholders and IN-lists collapsed) together with the shapes of its bound
+parameters (types only, never values) and the routes it was issued from. For a
+sample of slow SELECTs (SLOW_QUERY_EXPLAIN_SAMPLE_RATE) an
+EXPLAIN (ANALYZE, BUFFERS) plan is captured in a background thread on a separate
+connection of the sync primary engine, so the request itself is not delayed.
+
+The log is per worker and bounded to SLOW_QUERY_MAX_FINGERPRINTS entries; it is
+exposed via GET /admin/slow-queries.
+"""
+
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app import query_stats
+from app.logger import get_logger
+
+logger = get_logger("slow_queries")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(
+    os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.1")
+)
+SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", "5000"))
+SLOW_QUERY_MAX_FINGERPRINTS = int(os.getenv("SLOW_QUERY_MAX_FINGERPRINTS", "200"))
+# Re-capture the plan of a fingerprint at most this often
+SLOW_QUERY_PLAN_TTL_S = float(os.getenv("SLOW_QUERY_PLAN_TTL_S", "600"))
+
+_WHITESPACE = re.compile(r"\s+")
+_PYFORMAT_PARAM = re.compile(r"%\(\w+\)s")
+_NUMERIC_PARAM = re.compile(r"\$\d+")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+\b")
+_UUID = re.compile(r"[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}")
+# Not safe to run twice: row locks, advisory locks, notifications, sequences
+_SIDE_EFFECTS = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+)?UPDATE\b|\bFOR\s+(?:KEY\s+)?SHARE\b"
+    r"|\b(?:PG_ADVISORY\w*|PG_TRY_ADVISORY\w*|PG_NOTIFY|NEXTVAL|SETVAL)\s*\(",
+    re.IGNORECASE,
+)
+
+
+def normalize_statement(statement: str) -> str:
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _PYFORMAT_PARAM.sub("?", sql)
+    sql = _NUMERIC_PARAM.sub("?", sql)
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _PLACEHOLDER_LIST.sub("?, ...", sql)
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize_statement(statement).encode()).hexdigest()[:16]
+
+
+def parameter_shapes(parameters, executemany: bool = False) -> Any:
+    """Types of the bound parameters, e.g. {"id_1": "UUID"}; values are dropped."""
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return {"executemany": len(parameters), "row": parameter_shapes(parameters[0])}
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(v).__name__ for v in parameters]
+    return type(parameters).__name__
+
+
+def route_template(route: str) -> str:
+    return _UUID.sub("{id}", route)
+
+
+@dataclass
+class SlowQuery:
+    fingerprint: str
+    statement: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_seen: float = 0.0
+    parameter_shapes: Any = None
+    routes: Counter = field(default_factory=Counter)
+    plan: Optional[str] = None
+    plan_captured_at: Optional[float] = None
+    plan_pending: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "statement": self.statement,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 2),
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "last_seen_ago_s": round(time.time() - self.last_seen, 1),
+            "parameter_shapes": self.parameter_shapes,
+            "routes": dict(self.routes.most_common(10)),
+            "plan": self.plan,
+            "plan_captured_ago_s": (
+                round(time.time() - self.plan_captured_at, 1)
+                if self.plan_captured_at
+                else None
+            ),
+        }
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_QUERY_MS,
+        sample_rate: float = SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+        max_fingerprints: int = SLOW_QUERY_MAX_FINGERPRINTS,
+        explain_engine=None,
+    ):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.max_fingerprints = max_fingerprints
+        self.explain_engine = explain_engine
+        self._lock = threading.Lock()
+        self._entries: Dict[str, SlowQuery] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain")
+
+    def observe(self, statement, parameters, elapsed_s, executemany, stats=None):
+        """query_stats observer: record the statement if it was slow."""
+        elapsed_ms = elapsed_s * 1000
+        if elapsed_ms < self.threshold_ms or statement.startswith("EXPLAIN"):
+            return
+        route = None
+        if stats is not None and stats.route:
+            route = route_template(stats.route)
+        entry = self.record(statement, parameters, elapsed_ms, executemany, route)
+        if self._should_explain(entry, statement, executemany):
+            entry.plan_pending = True
+            self._executor.submit(self._capture_plan, entry, statement, parameters)
+
+    def record(self, statement, parameters, elapsed_ms, executemany=False, route=None):
+        key = fingerprint(statement)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    cheapest = min(self._entries.values(), key=lambda e: e.total_ms)
+                    del self._entries[cheapest.fingerprint]
+                entry = SlowQuery(
+                    fingerprint=key, statement=normalize_statement(statement)
+                )
+                self._entries[key] = entry
+            entry.count += 1
+            entry.total_ms += elapsed_ms
+            entry.max_ms = max(entry.max_ms, elapsed_ms)
+            entry.last_seen = time.time()
+            entry.parameter_shapes = parameter_shapes(parameters, executemany)
+            entry.routes[route or "-"] += 1
+        logger.warning(
+            f"Slow query {key} ({elapsed_ms:.1f}ms) from {route or '-'}: "
+            f"{entry.statement[:300]}"
+        )
+        return entry
+
+    def _should_explain(self, entry: SlowQuery, statement: str, executemany) -> bool:
+        # ANALYZE executes the statement again, so only plain SELECTs qualify
+        if self.explain_engine is None or executemany or entry.plan_pending:
+            return False
+        sql = statement.lstrip().upper()
+        if not sql.startswith("SELECT") or _SIDE_EFFECTS.search(sql):
+            return False
+        fresh = (
+            entry.plan_captured_at is not None
+            and time.time() - entry.plan_captured_at < SLOW_QUERY_PLAN_TTL_S
+        )
+        return not fresh and random.random() < self.sample_rate
+
+    def _capture_plan(self, entry: SlowQuery, statement: str, parameters):
+        try:
+            if _NUMERIC_PARAM.search(statement):
+                # asyncpg style ($1, $2, ...) -> psycopg2 positional (%s)
+                statement = _NUMERIC_PARAM.sub("%s", statement.replace("%", "%%"))
+                parameters = tuple(parameters)
+            with self.explain_engine.connect() as conn:
+                with conn.begin() as trans:
+                    conn.exec_driver_sql(
+                        f"SET LOCAL statement_timeout = {SLOW_QUERY_EXPLAIN_TIMEOUT_MS}"
+                    )
+                    rows = conn.exec_driver_sql(
+                        "EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters
+                    ).fetchall()
+                    trans.rollback()
+            entry.plan = "\n".join(row[0] for row in rows)
+            entry.plan_captured_at = time.time()
+        except Exception as e:
+            logger.error(f"EXPLAIN failed for slow query {entry.fingerprint}: {e}")
+        finally:
+            entry.plan_pending = False
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = sorted(
+                self._entries.values(),
+                key=lambda e: getattr(e, order_by),
+                reverse=True,
+            )
+            return [e.to_dict() for e in entries[:limit]]
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _build_log() -> SlowQueryLog:
+    from app.database import engine
+
+    log = SlowQueryLog(explain_engine=engine)
+    query_stats.add_observer(log.observe)
+    return log
+
+
+slow_query_log = _build_log()
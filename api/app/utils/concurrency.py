@@ -0,0 +1,105 @@
+"""
+Optimistic concurrency control for the PUT endpoints of rows that are edited
+concurrently (hackathons, teams, projects, scores).
+
+Each of these rows carries a version that every UPDATE increments. Responses
+expose it as the ETag ("<version>"); a client that sends it back in If-Match only
+overwrites the row if nobody changed it in between, and gets 409 Conflict with
+the current ETag otherwise. The version check and the write are one statement,
+UPDATE ... WHERE id = :id AND version = :expected ... RETURNING, so there is no
+pre-read and no row lock. Only an UPDATE that matched nothing costs a second
+query, to tell "not found", "conflict" and the caller's own conditions apart.
+
+Requests without If-Match keep the last-writer-wins behaviour.
+"""
+
+from typing import Optional
+
+from fastapi import Header, HTTPException, Response, status
+from sqlalchemy import Row, select, update
+from sqlalchemy.orm import Session
+
+ETAG_HEADER = "ETag"
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def set_etag(response: Response, version: int) -> None:
+    response.headers[ETAG_HEADER] = etag(version)
+
+
+def if_match_version(if_match: Optional[str] = Header(None)) -> Optional[int]:
+    """
+    Dependency: the version named by the If-Match header, None if absent or "*".
+    A weak tag (W/"3") is accepted too, the version identifies the row either way,
+    and so are the tags of GET responses, W/"3.<fingerprint>" (app.utils.http_cache).
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    try:
+        if len(tag) < 3 or tag[0] != '"' or tag[-1] != '"':
+            raise ValueError(tag)
+        return int(tag[1:-1].split(".", 1)[0])
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='If-Match must be a single ETag such as "3".',
+        )
+
+
+def versioned_update(model, pk, values: dict, expected_version: Optional[int]):
+    """
+    UPDATE model SET values, version = version + 1 WHERE id = pk, and
+    version = expected_version if given. Add conditions (and FROM tables) with
+    .where() and run it with fetch_updated.
+    """
+    table = model.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == pk)
+        .values(**values, version=table.c.version + 1)
+    )
+    if expected_version is not None:
+        stmt = stmt.where(table.c.version == expected_version)
+    return stmt
+
+
+def fetch_updated(db: Session, model, stmt, *columns) -> Optional[Row]:
+    """
+    Execute a versioned_update with RETURNING; the row is (entity, *columns),
+    columns being any further values to read back, or None if nothing matched.
+    """
+    returning = stmt.returning(*model.__table__.c, *columns)
+    return db.execute(
+        select(model, *columns)
+        .from_statement(returning)
+        .execution_options(populate_existing=True)
+    ).first()
+
+
+def check_update_conflict(
+    db: Session,
+    model,
+    pk,
+    expected_version: Optional[int],
+    not_found: str,
+) -> None:
+    """
+    After a versioned_update that matched no row: 404 if the row is gone, 409 if
+    its version moved on. Returns if neither, i.e. one of the caller's own
+    conditions failed.
+    """
+    current = db.scalar(select(model.version).where(model.id == pk))
+    if current is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+    if expected_version is not None and current != expected_version:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The resource was modified by someone else; reload and retry.",
+            headers={ETAG_HEADER: etag(current)},
+        )
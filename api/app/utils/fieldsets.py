@@ -0,0 +1,149 @@
+"""
+Sparse fieldsets for read endpoints: ?fields= and ?expand=.
+
+fields is a comma-separated list of the response fields to return, expand one
+of the relationships to embed (members, registrations, ...); a relationship
+named in fields is embedded too, and the id is always returned. Without either
+parameter an endpoint answers as before, with its full Read schema and loader
+profile.
+
+With a selection the query loads only the selected columns (plus the id, the
+version for the ETag and the sort key) and the selected relationships; every
+other relationship is raiseload'ed, so it is never queried. The response is
+serialized with a subset of the Read schema holding just the selected fields.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple, Type
+
+from fastapi import HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import Mapper, load_only, raiseload
+
+from app.loaders import EXPANSIONS, loader_options
+
+
+def _split(raw: Optional[str]) -> FrozenSet[str]:
+    return frozenset(name.strip() for name in (raw or "").split(",") if name.strip())
+
+
+@lru_cache(maxsize=256)
+def _subset_schema(schema: Type[BaseModel], names: FrozenSet[str]) -> Type[BaseModel]:
+    # Any: unpacked into create_model, whose other keywords must match too
+    fields: Dict[str, Any] = {
+        name: (info.annotation, info)
+        for name, info in schema.model_fields.items()
+        if name in names
+    }
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        __base__=None,
+        **fields,
+    )
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    """The fields of a Read schema one request asked for (None: all, as before)."""
+
+    model: Type[Any]
+    schema: Type[BaseModel]
+    columns: Optional[FrozenSet[str]] = None
+    relationships: FrozenSet[str] = frozenset()
+
+    @property
+    def selected(self) -> bool:
+        return self.columns is not None
+
+    @property
+    def embedded(self) -> Optional[FrozenSet[str]]:
+        """The relationships the response embeds; None: all of the schema's."""
+        return self.relationships if self.selected else None
+
+    def options(self, profile: str, *always) -> Tuple:
+        """
+        Loader options for the query: the endpoint's profile without a
+        selection, otherwise the selected columns (plus id, version and the
+        given columns, e.g. the sort key) and relationships only.
+        """
+        columns = self.columns
+        if columns is None:
+            return loader_options(self.model, profile)
+        mapper: Mapper = inspect(self.model)
+        names = set(columns) | {"id"}
+        if "version" in mapper.column_attrs:
+            names.add("version")
+        attrs = [mapper.column_attrs[name].class_attribute for name in sorted(names)]
+        attrs += [column for column in always if column.key not in names]
+        expansions = EXPANSIONS.get(self.model, {})
+        return (
+            load_only(*attrs, raiseload=True),
+            *[expansions[name] for name in sorted(self.relationships)],
+            raiseload("*"),
+        )
+
+    def render(self, data, response: Response):
+        """
+        The endpoint's return value: data itself without a selection, otherwise
+        a JSONResponse of the selected fields (keeping the headers already set).
+        """
+        columns = self.columns
+        if columns is None:
+            return data
+        subset = _subset_schema(self.schema, columns | self.relationships)
+        if isinstance(data, list):
+            content = jsonable_encoder([subset.model_validate(item) for item in data])
+        else:
+            content = jsonable_encoder(subset.model_validate(data))
+        return JSONResponse(
+            content,
+            status_code=response.status_code or status.HTTP_200_OK,
+            headers=dict(response.headers),
+        )
+
+
+def fieldset(model, schema: Type[BaseModel]) -> Callable[..., Fieldset]:
+    """Dependency parsing ?fields= and ?expand= against schema (400 if unknown)."""
+    mapper = inspect(model)
+    expandable = frozenset(EXPANSIONS.get(model, {}))
+    scalars = frozenset(
+        name
+        for name in schema.model_fields
+        if name not in expandable and name in mapper.column_attrs
+    )
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return (default: all)"
+        ),
+        expand: Optional[str] = Query(
+            None,
+            description="Comma-separated relationships to embed: "
+            + ", ".join(sorted(expandable)),
+        ),
+    ) -> Fieldset:
+        if fields is None and expand is None:
+            return Fieldset(model, schema)
+        requested = _split(fields) if fields is not None else scalars
+        expanded = _split(expand)
+        unknown = (requested - scalars - expandable) | (expanded - expandable)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field(s): {', '.join(sorted(unknown))}. "
+                f"Fields: {', '.join(sorted(scalars))}; "
+                f"expandable: {', '.join(sorted(expandable))}.",
+            )
+        return Fieldset(
+            model,
+            schema,
+            columns=(requested & scalars) | {"id"},
+            relationships=(requested & expandable) | expanded,
+        )
+
+    return dependency
@@ -0,0 +1,135 @@
+"""
+Conditional GETs: weak ETags and 304 Not Modified for read endpoints.
+
+Before loading anything, a read endpoint runs one cheap query for the
+fingerprint of the rows its response would show: the md5 of (primary key,
+stamp) of the root row(s) and of every row embedded through a relationship
+(app.loaders.EMBEDDED), where the stamp is the row's updated_at, or its xmin
+(the transaction that last wrote it) for tables without one. Any insert, update
+or delete of one of those rows changes the fingerprint. A list fingerprints the
+ids of its page, so a row entering or leaving the page changes it too.
+
+The fingerprint is sent as a weak ETag. When the client's If-None-Match names
+it, the endpoint answers 304 right away, without loading the entities or
+serializing them. Detail ETags start with the row version, W/"<version>.<md5>",
+so they are still accepted as If-Match by the PUT endpoints
+(app.utils.concurrency).
+
+Every conditional response carries a Cache-Control policy, HTTP_CACHE_CONTROL
+unless the route passes its own.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Header, HTTPException, Response, status
+from sqlalchemy import func, inspect, literal, literal_column, select, union_all
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from app.loaders import EMBEDDED
+from app.utils.concurrency import ETAG_HEADER
+
+CACHE_CONTROL_HEADER = "Cache-Control"
+# Caches may store responses but must revalidate them (cheap with the ETag)
+HTTP_CACHE_CONTROL = os.getenv("HTTP_CACHE_CONTROL", "no-cache")
+
+
+def embedded_paths(
+    model, relationships: Optional[Iterable[str]] = None
+) -> Tuple[Tuple[str, ...], ...]:
+    """The EMBEDDED paths of the given relationship fields (None: all of them)."""
+    fields = EMBEDDED.get(model, {})
+    names = fields if relationships is None else relationships
+    return tuple(path for name in sorted(names) for path in fields[name])
+
+
+def _rows(model, ids, path: Tuple[str, ...]):
+    """One text per row reached from the root rows along path."""
+    joins, target = [], model
+    for name in path:
+        joins.append(getattr(target, name))
+        target = joins[-1].property.mapper.class_
+    table = target.__table__
+    if "updated_at" in table.c:
+        stamp = table.c.updated_at
+    else:
+        stamp = literal_column(f"{table.fullname}.xmin")
+    row = func.concat_ws(":", ".".join(path), *inspect(target).primary_key, stamp)
+    stmt = select(row.label("row")).select_from(model)
+    for relationship in joins:
+        stmt = stmt.join(relationship)
+    return stmt.where(model.id.in_(ids))
+
+
+def fingerprint(model, ids, paths: Tuple[Tuple[str, ...], ...] = ()):
+    """
+    SELECT of the md5 over the rows of model with the given ids (a list or a
+    SELECT of ids) and the rows embedded along paths.
+    """
+    rows = union_all(
+        _rows(model, ids, ()), *[_rows(model, ids, p) for p in paths]
+    ).subquery()
+    ordered = aggregate_order_by(literal(","), rows.c.row)
+    return select(func.md5(func.coalesce(func.string_agg(rows.c.row, ordered), "")))
+
+
+def entity_etag(model, pk, paths: Tuple[Tuple[str, ...], ...] = ()):
+    """SELECT of the weak ETag W/"<version>.<md5>" of one row; no row if missing."""
+    digest = fingerprint(model, [pk], paths).scalar_subquery()
+    return select(func.concat('W/"', model.version, ".", digest, '"')).where(
+        model.id == pk
+    )
+
+
+def page_etag(model, ids, paths: Tuple[Tuple[str, ...], ...] = ()):
+    """SELECT of the weak ETag of a list response; ids is the page's SELECT."""
+    digest = fingerprint(model, ids, paths).scalar_subquery()
+    return select(func.concat('W/"', digest, '"'))
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+@dataclass(frozen=True)
+class Conditional:
+    """The If-None-Match of a request and the response it is answered with."""
+
+    response: Response
+    if_none_match: Optional[str]
+    cache_control: str
+
+    def matches(self, tag: str) -> bool:
+        """Weak comparison: W/ prefixes are ignored, "*" matches anything."""
+        if self.if_none_match is None:
+            return False
+        candidates = [_opaque(t) for t in self.if_none_match.split(",")]
+        return "*" in candidates or _opaque(tag) in candidates
+
+    def check(self, tag: Optional[str]) -> None:
+        """
+        Answer 304 Not Modified if If-None-Match names tag, otherwise set the ETag
+        and Cache-Control headers of the full response. tag None (the row does
+        not exist) leaves the response to the endpoint.
+        """
+        if tag is None:
+            return
+        headers = {ETAG_HEADER: tag, CACHE_CONTROL_HEADER: self.cache_control}
+        if self.matches(tag):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+        self.response.headers.update(headers)
+
+
+def conditional(cache_control: str = HTTP_CACHE_CONTROL):
+    """Dependency: a Conditional answering with the given Cache-Control policy."""
+
+    def dependency(
+        response: Response, if_none_match: Optional[str] = Header(None)
+    ) -> Conditional:
+        return Conditional(response, if_none_match, cache_control)
+
+    return dependency
@@ -0,0 +1,100 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+A page is ordered by (sort column, id) and the next page starts strictly after the
+last row of the previous one, so deep pages cost the same as the first one and
+concurrent inserts cannot shift rows between pages. The cursor is an opaque,
+URL-safe token holding the key of the last row; it is returned in the
+X-Next-Cursor response header so the list bodies keep their shape.
+"""
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import literal, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def _to_json(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _from_json(column, raw):
+    python_type = column.type.python_type
+    if raw is None or isinstance(raw, python_type):
+        return raw
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is date:
+        return date.fromisoformat(raw)
+    return python_type(raw)
+
+
+def encode_cursor(*values) -> str:
+    payload = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    """Decode a cursor into values typed like the key columns (400 if malformed)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(raw, list) or len(raw) != len(columns):
+            raise ValueError("cursor does not match the sort key")
+        return [_from_json(c, v) for c, v in zip(columns, raw)]
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid cursor: {e}"
+        )
+
+
+def paginate(
+    stmt,
+    columns: Sequence,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    skip: int = 0,
+):
+    """
+    Order stmt by the key columns (last one must be unique, e.g. the id) and
+    start after the cursor. One extra row is fetched to detect a next page.
+    skip is only honoured for backwards compatibility.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        after = tuple_(*[literal(v, c.type) for c, v in zip(columns, values)])
+        key = tuple_(*columns)
+        stmt = stmt.where(key < after if descending else key > after)
+    stmt = stmt.order_by(*[c.desc() if descending else c.asc() for c in columns])
+    if skip:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit + 1)
+
+
+def finish_page(
+    rows: Sequence, columns: Sequence, limit: int, response: Response
+) -> list:
+    """Trim the look-ahead row and set the next-page cursor header if there is one."""
+    rows = list(rows)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            *[getattr(last, c.key) for c in columns]
+        )
+    return rows
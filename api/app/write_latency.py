@@ -0,0 +1,112 @@
+"""
+Write latency per endpoint.
+
+The query stats middleware in app.main reports every POST, PUT, PATCH and DELETE
+here with its duration and the number and time of the SQL statements it ran.
+Requests are grouped by method and route template ("PUT /teams/{team_id}"); the
+last WRITE_LATENCY_WINDOW durations of a route give its percentiles, so a
+regression shows up without waiting for the totals to move.
+
+The figures are per worker and exposed via GET /admin/write-latency.
+"""
+
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from app.query_stats import RequestQueryStats
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+WRITE_LATENCY_WINDOW = int(os.getenv("WRITE_LATENCY_WINDOW", "512"))
+WRITE_LATENCY_MAX_ROUTES = int(os.getenv("WRITE_LATENCY_MAX_ROUTES", "500"))
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list, 0.0 if empty."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class WriteLatency:
+    route: str
+    count: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    db_ms: float = 0.0
+    queries: int = 0
+    recent_ms: Deque[float] = field(
+        default_factory=lambda: deque(maxlen=WRITE_LATENCY_WINDOW)
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        recent = sorted(self.recent_ms)
+        return {
+            "route": self.route,
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(percentile(recent, 50), 2),
+            "p95_ms": round(percentile(recent, 95), 2),
+            "p99_ms": round(percentile(recent, 99), 2),
+            "max_ms": round(self.max_ms, 2),
+            "total_ms": round(self.total_ms, 2),
+            "avg_db_ms": round(self.db_ms / self.count, 2) if self.count else 0.0,
+            "avg_queries": round(self.queries / self.count, 2) if self.count else 0.0,
+        }
+
+
+class WriteLatencyLog:
+    def __init__(self, max_routes: int = WRITE_LATENCY_MAX_ROUTES):
+        self.max_routes = max_routes
+        self._lock = threading.Lock()
+        self._entries: Dict[str, WriteLatency] = {}
+
+    def record(
+        self,
+        method: str,
+        route: str,
+        elapsed_s: float,
+        status_code: int,
+        stats: Optional[RequestQueryStats] = None,
+    ) -> None:
+        if method not in WRITE_METHODS:
+            return
+        key = f"{method} {route}"
+        elapsed_ms = elapsed_s * 1000
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_routes:
+                    # Unmatched paths (404s) must not push out the real routes
+                    rarest = min(self._entries.values(), key=lambda e: e.count)
+                    del self._entries[rarest.route]
+                entry = WriteLatency(route=key)
+                self._entries[key] = entry
+            entry.count += 1
+            if status_code >= 500:
+                entry.errors += 1
+            entry.total_ms += elapsed_ms
+            entry.max_ms = max(entry.max_ms, elapsed_ms)
+            entry.recent_ms.append(elapsed_ms)
+            if stats is not None:
+                entry.db_ms += stats.time_s * 1000
+                entry.queries += stats.count
+
+    def top(self, limit: int = 20, order_by: str = "p95_ms") -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = [e.to_dict() for e in self._entries.values()]
+        rows.sort(key=lambda r: r[order_by], reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+
+
+write_latency_log = WriteLatencyLog()
@@ -0,0 +1,134 @@
+"""
+Load benchmark for the hot read endpoints.
+
+Drives a running API with a fixed number of concurrent clients for a fixed
+duration and reports sustained requests per second and latency percentiles per
+endpoint. Run it once against a build that serves the endpoints from the sync
+threadpool and once against the async (asyncpg) build to compare, e.g.:
+
+    python scripts/benchmark_read_paths.py --base-url http://localhost:8000 \
+        --concurrency 200 --duration 30 --token "$TOKEN" --label async
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+DEFAULT_ENDPOINTS = [
+    "/hackathons/",
+    "/projects/",
+    "/users/me",
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    path: str,
+    deadline: float,
+    latencies: List[float],
+    errors: List[int],
+):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_endpoint(
+    base_url: str,
+    path: str,
+    concurrency: int,
+    duration: float,
+    token: Optional[str],
+) -> Dict:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    latencies: List[float] = []
+    errors: List[int] = []
+    async with httpx.AsyncClient(
+        base_url=base_url, headers=headers, limits=limits, timeout=30
+    ) as client:
+        # Warm up connection pools on both sides before measuring
+        await client.get(path)
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[
+                _worker(client, path, deadline, latencies, errors)
+                for _ in range(concurrency)
+            ]
+        )
+        elapsed = time.perf_counter() - started
+    return {
+        "endpoint": path,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+async def main_async(args) -> List[Dict]:
+    results = []
+    for path in args.endpoint or DEFAULT_ENDPOINTS:
+        if path == "/users/me" and not args.token:
+            continue
+        result = await run_endpoint(
+            args.base_url, path, args.concurrency, args.duration, args.token
+        )
+        result["label"] = args.label
+        results.append(result)
+        print(
+            f"[{args.label}] {path:<40} {result['rps']:>9.1f} req/s  "
+            f"p50 {result['p50_ms']:>7.1f} ms  p99 {result['p99_ms']:>7.1f} ms  "
+            f"errors {result['errors']}"
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hot read endpoints")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds")
+    parser.add_argument("--token", help="Bearer token for authenticated endpoints")
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        help="Endpoint path to benchmark (repeatable, defaults to the hot reads)",
+    )
+    parser.add_argument("--label", default="run", help="Label for this run")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark for the vectorized score aggregation (app/services/score_aggregation).
+
+Generates a synthetic hackathon - every project scored by a few judges on every
+criterion, judges with individual leniency - and times tensor construction and
+the normalized ranking. --compare also times a straightforward per-project
+Python loop over the same rows and checks both produce the same ranking:
+
+    python scripts/benchmark_score_aggregation.py --projects 10000 --judges 200 \
+        --judges-per-project 5 --criteria 5 --compare
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import defaultdict
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.score_aggregation import aggregate, tensor_from_rows
+
+
+def synthetic_rows(projects, judges, judges_per_project, criteria, seed=0):
+    rnd = random.Random(seed)
+    project_ids = [uuid.uuid4() for _ in range(projects)]
+    judge_ids = [uuid.uuid4() for _ in range(judges)]
+    leniency = {j: rnd.gauss(0, 1.5) for j in judge_ids}
+    criterion_specs = [
+        (uuid.uuid4(), rnd.choice([1, 1, 2]), 10) for _ in range(criteria)
+    ]
+    rows = []
+    for project_id in project_ids:
+        quality = rnd.gauss(5, 2)
+        for judge_id in rnd.sample(judge_ids, judges_per_project):
+            for criterion_id, weight, max_score in criterion_specs:
+                raw = quality + leniency[judge_id] + rnd.gauss(0, 1)
+                score = min(max_score, max(0, round(raw)))
+                rows.append(
+                    (project_id, judge_id, criterion_id, score, weight, max_score)
+                )
+    return rows
+
+
+def python_reference(rows):
+    """Per-judge z-score, weighted per-judge mean, mean over judges; plain loops."""
+    by_judge = defaultdict(list)
+    for _, judge_id, _, score, _, max_score in rows:
+        by_judge[judge_id].append(score / max_score)
+    judge_stats = {
+        j: (statistics.fmean(v), statistics.pstdev(v)) for j, v in by_judge.items()
+    }
+    per_judge = defaultdict(lambda: [0.0, 0.0])
+    for project_id, judge_id, _, score, weight, max_score in rows:
+        mean, std = judge_stats[judge_id]
+        z = (score / max_score - mean) / std if std > 0 else 0.0
+        acc = per_judge[(project_id, judge_id)]
+        acc[0] += z * weight
+        acc[1] += weight
+    per_project = defaultdict(list)
+    for (project_id, _), (weighted, weight_sum) in per_judge.items():
+        per_project[project_id].append(weighted / weight_sum)
+    means = {p: statistics.fmean(v) for p, v in per_project.items()}
+    return sorted(means, key=lambda p: (-means[p], str(p)))
+
+
+def timed(fn, *args, repeat=3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark score aggregation")
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--judges", type=int, default=200)
+    parser.add_argument("--judges-per-project", type=int, default=5)
+    parser.add_argument("--criteria", type=int, default=5)
+    parser.add_argument("--method", default="zscore")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--compare", action="store_true", help="also time the pure-Python loop"
+    )
+    args = parser.parse_args()
+
+    rows = synthetic_rows(
+        args.projects, args.judges, args.judges_per_project, args.criteria
+    )
+    print(
+        f"{args.projects} projects x {args.judges} judges x {args.criteria} "
+        f"criteria, {len(rows)} scores"
+    )
+
+    build_s, tensor = timed(tensor_from_rows, rows, repeat=args.repeat)
+    rank_s, results = timed(aggregate, tensor, args.method, repeat=args.repeat)
+    print(f"  tensor build      {build_s * 1000:9.1f} ms  shape={tensor.values.shape}")
+    print(f"  normalize + rank  {rank_s * 1000:9.1f} ms  ({args.method})")
+    print(f"  total (vectorized){(build_s + rank_s) * 1000:9.1f} ms")
+
+    if args.compare:
+        loop_s, ranking = timed(python_reference, rows, repeat=args.repeat)
+        print(f"  python loop       {loop_s * 1000:9.1f} ms")
+        print(f"  speed-up          {loop_s / (build_s + rank_s):9.1f} x")
+        if args.method == "zscore":
+            same = ranking == [r.project_id for r in results]
+            print(f"  same ranking      {same}")
+
+
+if __name__ == "__main__":
+    main()
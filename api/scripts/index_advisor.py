@@ -0,0 +1,470 @@
+"""
+Index advisor.
+
+Plans the application's hot query shapes (APP_QUERIES, mirroring the filters the
+routers and services issue) together with the most expensive app-schema SELECTs
+recorded by pg_stat_statements, walks the generic plans for sequential scans with
+a filter on large tables and proposes the indexes that would serve them. Run it
+against a database holding realistic volumes; `seed` fills a scratch database
+with a synthetic dataset for that:
+
+    python scripts/index_advisor.py seed --hackathons 200 --yes
+    python scripts/index_advisor.py advise --min-rows 10000
+    python scripts/index_advisor.py advise --sql > proposed.sql
+    python scripts/index_advisor.py advise --check   # exit 1 on any proposal
+
+Generic plans (plan_cache_mode = force_generic_plan) are used so the proposals do
+not depend on sample parameter values; nothing is executed, only planned.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import insert, text
+
+from app.database import engine
+from app.models.hackathon import Hackathon
+from app.models.hackathon_registration import HackathonRegistration
+from app.models.judging import Criterion, Score
+from app.models.project import Project
+from app.models.submission import Submission
+from app.models.team import JoinRequest, Team, TeamMember
+from app.models.user import User
+from app.schemas.hackathon import HackathonMode, HackathonStatus
+from app.schemas.submission import SubmissionContentType
+from app.schemas.team import TeamMemberRole
+
+APP_SCHEMAS = ("auth", "hackathons", "teams", "projects", "judging")
+
+# Query shapes issued per request today ($n placeholders, planned generically)
+APP_QUERIES: Dict[str, str] = {
+    "teams of a user": "SELECT * FROM teams.members WHERE user_id = $1",
+    "membership check": (
+        "SELECT * FROM teams.members WHERE team_id = $1 AND user_id = $2"
+    ),
+    "projects of a team": "SELECT * FROM projects.projects WHERE team_id = $1",
+    "projects of a hackathon (page)": (
+        "SELECT * FROM projects.projects WHERE hackathon_id = $1 "
+        "ORDER BY created_at DESC, id DESC LIMIT 101"
+    ),
+    "active teams of a hackathon (page)": (
+        "SELECT * FROM teams.teams WHERE hackathon_id = $1 AND status = $2 "
+        "ORDER BY created_at DESC, id DESC LIMIT 101"
+    ),
+    "submissions of a project": (
+        "SELECT * FROM projects.submissions WHERE project_id = $1"
+    ),
+    "scores of a judge": "SELECT * FROM judging.scores WHERE judge_id = $1",
+    "scores of a project": "SELECT * FROM judging.scores WHERE project_id = $1",
+    "join requests of a user": (
+        "SELECT * FROM teams.join_requests WHERE sender_id = $1"
+    ),
+    "pending join requests of a team": (
+        "SELECT * FROM teams.join_requests WHERE team_id = $1 AND status = 'pending'"
+    ),
+    "registrations of a user": (
+        "SELECT * FROM hackathons.hackathon_registrations WHERE user_id = $1"
+    ),
+}
+
+_PARAM = re.compile(r"\$(\d+)")
+# "(members.user_id = $1)", "((status)::text = 'pending'::text)", "(x > $2)"
+_COMPARISON = re.compile(
+    r"\(*(?:\w+\.)?\"?(\w+)\"?\)?(?:::[\w ]+)?\s*(=|<|>|<=|>=)\s*"
+    r"(\$\d+|'(?:[^']|'')*'(?:::[\w ]+)?|-?\d+(?:\.\d+)?)"
+)
+
+
+# --- seeding ----------------------------------------------------------------
+
+
+def _chunks(rows: List[dict], size: int = 5000):
+    for i in range(0, len(rows), size):
+        yield rows[i : i + size]
+
+
+def _bulk_insert(conn, model, rows: List[dict]):
+    for chunk in _chunks(rows):
+        conn.execute(insert(model), chunk)
+    print(f"  {model.__table__.fullname}: {len(rows)} rows")
+
+
+def seed(args):
+    """Insert a synthetic dataset sized by the flags (scratch databases only)."""
+    if not args.yes:
+        sys.exit("seed writes a large synthetic dataset; pass --yes to confirm")
+    rnd = random.Random(args.random_seed)
+    tag = uuid.uuid4().hex[:8]
+    now = datetime.now(timezone.utc)
+    statuses = list(HackathonStatus)
+
+    n_participants = args.hackathons * args.teams_per_hackathon * args.team_size
+    users = [
+        {
+            "id": uuid.uuid4(),
+            "email": f"seed-{tag}-{i}@example.test",
+            "username": f"seed_{tag}_{i}",
+            "hashed_password": "!",
+        }
+        for i in range(n_participants + args.judges)
+    ]
+    participants, judges = users[:n_participants], users[n_participants:]
+
+    hackathons = [
+        {
+            "id": uuid.uuid4(),
+            "name": f"seed-{tag}-hackathon-{i}",
+            "start_date": now - timedelta(days=i),
+            "end_date": now - timedelta(days=i) + timedelta(days=2),
+            "status": statuses[i % len(statuses)],
+            "mode": HackathonMode.TEAM_ONLY,
+        }
+        for i in range(args.hackathons)
+    ]
+    criteria = [
+        {"id": uuid.uuid4(), "name": f"seed-{tag}-criterion-{i}", "max_score": 10}
+        for i in range(args.criteria)
+    ]
+
+    teams, members, projects, registrations = [], [], [], []
+    submissions, scores, join_requests = [], [], []
+    user_iter = iter(participants)
+    for hackathon in hackathons:
+        for t in range(args.teams_per_hackathon):
+            team = {
+                "id": uuid.uuid4(),
+                "hackathon_id": hackathon["id"],
+                "name": f"team-{t}",
+                "created_at": now - timedelta(minutes=len(teams)),
+            }
+            teams.append(team)
+            team_users = [next(user_iter) for _ in range(args.team_size)]
+            for j, user in enumerate(team_users):
+                role = TeamMemberRole.owner if j == 0 else TeamMemberRole.member
+                members.append(
+                    {"team_id": team["id"], "user_id": user["id"], "role": role}
+                )
+            project = {
+                "id": uuid.uuid4(),
+                "name": f"seed-{tag}-project-{len(projects)}",
+                "hackathon_id": hackathon["id"],
+                "owner_id": team_users[0]["id"],
+                "team_id": team["id"],
+                "created_at": team["created_at"],
+            }
+            projects.append(project)
+            registrations.append(
+                {
+                    "hackathon_id": hackathon["id"],
+                    "project_id": project["id"],
+                    "team_id": team["id"],
+                }
+            )
+            for _ in range(args.submissions_per_project):
+                submissions.append(
+                    {
+                        "project_id": project["id"],
+                        "user_id": rnd.choice(team_users)["id"],
+                        "content_type": SubmissionContentType.LINK,
+                        "content_value": "https://example.test/demo",
+                    }
+                )
+            for judge in rnd.sample(judges, min(args.judges_per_project, len(judges))):
+                for criterion in criteria:
+                    scores.append(
+                        {
+                            "project_id": project["id"],
+                            "criteria_id": criterion["id"],
+                            "judge_id": judge["id"],
+                            "score": rnd.randint(0, criterion["max_score"]),
+                        }
+                    )
+            join_requests.append(
+                {
+                    "team_id": team["id"],
+                    "sender_id": rnd.choice(participants)["id"],
+                    "recipient_id": team_users[0]["id"],
+                }
+            )
+
+    print(f"Seeding batch {tag}:")
+    with engine.begin() as conn:
+        _bulk_insert(conn, User, users)
+        _bulk_insert(conn, Hackathon, hackathons)
+        _bulk_insert(conn, Criterion, criteria)
+        _bulk_insert(conn, Team, teams)
+        _bulk_insert(conn, TeamMember, members)
+        _bulk_insert(conn, Project, projects)
+        _bulk_insert(conn, HackathonRegistration, registrations)
+        _bulk_insert(conn, Submission, submissions)
+        _bulk_insert(conn, Score, scores)
+        _bulk_insert(conn, JoinRequest, join_requests)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for schema in APP_SCHEMAS:
+            tables = conn.execute(
+                text("SELECT tablename FROM pg_tables WHERE schemaname = :s"),
+                {"s": schema},
+            ).scalars()
+            for table in tables:
+                conn.exec_driver_sql(f'ANALYZE "{schema}"."{table}"')
+    print("Done; statistics refreshed.")
+
+
+# --- planning -----------------------------------------------------------------
+
+
+def _statements_from_pg_stat_statements(conn, top: int) -> Dict[str, str]:
+    """Most expensive app-schema SELECTs, if the extension is installed."""
+    installed = conn.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+    ).first()
+    if not installed:
+        print("pg_stat_statements is not installed; using APP_QUERIES only.")
+        return {}
+    schema_filter = " OR ".join(f"query ILIKE '%{s}.%'" for s in APP_SCHEMAS)
+    rows = conn.execute(
+        text(
+            "SELECT queryid, query, calls, total_exec_time "
+            "FROM pg_stat_statements "
+            f"WHERE query ILIKE 'select%' AND ({schema_filter}) "
+            "AND query NOT ILIKE '%pg_catalog%' "
+            "ORDER BY total_exec_time DESC LIMIT :top"
+        ),
+        {"top": top},
+    ).all()
+    return {
+        f"pg_stat_statements {r.queryid} ({r.calls} calls, "
+        f"{r.total_exec_time:.0f}ms)": r.query
+        for r in rows
+    }
+
+
+def generic_plan(conn, statement: str) -> Optional[dict]:
+    """EXPLAIN the generic plan of a $n-parameterized statement, or None."""
+    n_params = max((int(n) for n in _PARAM.findall(statement)), default=0)
+    args = ", ".join(["NULL"] * n_params)
+    savepoint = conn.begin_nested()
+    try:
+        conn.exec_driver_sql("SET LOCAL plan_cache_mode = force_generic_plan")
+        conn.exec_driver_sql(
+            "PREPARE index_advisor_q AS " + statement.replace("%", "%%")
+        )
+        execute = "EXECUTE index_advisor_q" + (f"({args})" if n_params else "")
+        raw = conn.exec_driver_sql(f"EXPLAIN (VERBOSE, FORMAT JSON) {execute}").scalar()
+        conn.exec_driver_sql("DEALLOCATE index_advisor_q")
+        savepoint.commit()
+    except Exception as e:
+        savepoint.rollback()
+        conn.exec_driver_sql("DEALLOCATE ALL")
+        print(f"    could not plan: {str(e).splitlines()[0]}")
+        return None
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    return plan[0]["Plan"]
+
+
+def _walk(node: dict, parent: Optional[dict] = None):
+    yield node, parent
+    for child in node.get("Plans", []):
+        yield from _walk(child, node)
+
+
+def _table_rows(conn, schema: str, table: str) -> int:
+    return int(
+        conn.execute(
+            text(
+                "SELECT c.reltuples FROM pg_class c "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = :s AND c.relname = :t"
+            ),
+            {"s": schema, "t": table},
+        ).scalar()
+        or 0
+    )
+
+
+def existing_indexes(conn, schema: str, table: str) -> List[Tuple[str, List[str]]]:
+    rows = conn.execute(
+        text(
+            "SELECT i.relname AS name, "
+            "array_agg(a.attname ORDER BY k.ord) AS columns "
+            "FROM pg_index x "
+            "JOIN pg_class t ON t.oid = x.indrelid "
+            "JOIN pg_namespace n ON n.oid = t.relnamespace "
+            "JOIN pg_class i ON i.oid = x.indexrelid "
+            "CROSS JOIN LATERAL unnest(x.indkey) WITH ORDINALITY AS k(attnum, ord) "
+            "JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum "
+            "WHERE n.nspname = :s AND t.relname = :t "
+            "GROUP BY i.relname"
+        ),
+        {"s": schema, "t": table},
+    ).all()
+    return [(r.name, list(r.columns)) for r in rows]
+
+
+def _sort_columns(parent: Optional[dict]) -> List[str]:
+    if not parent or parent.get("Node Type") != "Sort":
+        return []
+    columns = []
+    for key in parent.get("Sort Key", []):
+        match = re.match(r"(?:\w+\.)?\"?(\w+)\"?", key)
+        if match:
+            columns.append(match.group(1))
+    return columns
+
+
+def propose(node: dict, parent: Optional[dict]) -> Optional[dict]:
+    """Index definition for a filtered Seq Scan: equality columns first, then
+    range columns, then the sort keys; literal equalities become the predicate."""
+    equality, ranges, predicate = [], [], []
+    for column, op, value in _COMPARISON.findall(node.get("Filter", "")):
+        if op == "=" and value.startswith("$"):
+            equality.append(column)
+        elif op == "=" and value.startswith("'"):
+            predicate.append(f"{column} = {value.split('::')[0]}")
+        elif value.startswith("$"):
+            ranges.append(column)
+    if not equality and not ranges:
+        return None
+    columns = list(dict.fromkeys(equality + ranges + _sort_columns(parent)))
+    return {
+        "schema": node["Schema"],
+        "table": node["Relation Name"],
+        "columns": columns,
+        "equality": equality,
+        "where": " AND ".join(predicate) or None,
+    }
+
+
+def is_covered(proposal: dict, indexes: List[Tuple[str, List[str]]]) -> Optional[str]:
+    """Name of an existing index whose leading columns serve the equality filter."""
+    wanted = set(proposal["equality"] or proposal["columns"][:1])
+    for name, columns in indexes:
+        if set(columns[: len(wanted)]) == wanted:
+            return name
+    return None
+
+
+def index_sql(proposal: dict) -> str:
+    suffix = "_partial" if proposal["where"] else ""
+    name = f"idx_{proposal['table']}_{'_'.join(proposal['columns'])}{suffix}"
+    sql = (
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name[:63]} ON "
+        f"{proposal['schema']}.{proposal['table']}({', '.join(proposal['columns'])})"
+    )
+    if proposal["where"]:
+        sql += f" WHERE {proposal['where']}"
+    return sql + ";"
+
+
+def _describe_scans(plan: dict) -> List[str]:
+    scans = []
+    for node, _ in _walk(plan):
+        if "Relation Name" not in node:
+            continue
+        index = f" using {node['Index Name']}" if node.get("Index Name") else ""
+        scans.append(f"{node['Node Type']}{index} on {node['Relation Name']}")
+    return scans
+
+
+def advise(args):
+    proposals: Dict[str, str] = {}
+    log = sys.stderr if args.sql else sys.stdout
+    with engine.connect() as conn:
+        with conn.begin():
+            queries = dict(APP_QUERIES)
+            if not args.no_pg_stat_statements:
+                queries.update(_statements_from_pg_stat_statements(conn, args.top))
+            for name, statement in queries.items():
+                print(f"- {name}", file=log)
+                plan = generic_plan(conn, statement)
+                if plan is None:
+                    continue
+                print(f"    plan: {'; '.join(_describe_scans(plan))}", file=log)
+                for node, parent in _walk(plan):
+                    if node.get("Node Type") != "Seq Scan" or "Filter" not in node:
+                        continue
+                    schema, table = node["Schema"], node["Relation Name"]
+                    rows = _table_rows(conn, schema, table)
+                    if rows < args.min_rows:
+                        continue
+                    proposal = propose(node, parent)
+                    if proposal is None:
+                        continue
+                    indexes = existing_indexes(conn, schema, table)
+                    covering = is_covered(proposal, indexes)
+                    if covering:
+                        print(
+                            f"    seq scan on {table} ({rows} rows) although "
+                            f"{covering} matches; stale statistics?",
+                            file=log,
+                        )
+                        continue
+                    sql = index_sql(proposal)
+                    print(f"    missing index ({rows} rows): {sql}", file=log)
+                    proposals[sql] = name
+
+    if args.sql:
+        for sql in proposals:
+            print(sql)
+    elif proposals:
+        print(f"\n{len(proposals)} index(es) proposed:")
+        for sql, name in proposals.items():
+            print(f"  {sql}  -- {name}")
+    else:
+        print("\nNo missing indexes found.")
+    if args.check and proposals:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = sub.add_parser("seed", help="insert a synthetic dataset")
+    seed_parser.add_argument("--hackathons", type=int, default=100)
+    seed_parser.add_argument("--teams-per-hackathon", type=int, default=50)
+    seed_parser.add_argument("--team-size", type=int, default=4)
+    seed_parser.add_argument("--judges", type=int, default=40)
+    seed_parser.add_argument("--judges-per-project", type=int, default=3)
+    seed_parser.add_argument("--criteria", type=int, default=5)
+    seed_parser.add_argument("--submissions-per-project", type=int, default=3)
+    seed_parser.add_argument("--random-seed", type=int, default=0)
+    seed_parser.add_argument(
+        "--yes", action="store_true", help="confirm writing to DATABASE_URL"
+    )
+    seed_parser.set_defaults(func=seed)
+
+    advise_parser = sub.add_parser("advise", help="plan queries and propose indexes")
+    advise_parser.add_argument(
+        "--min-rows",
+        type=int,
+        default=10000,
+        help="ignore sequential scans of tables smaller than this",
+    )
+    advise_parser.add_argument(
+        "--top", type=int, default=50, help="pg_stat_statements entries to replay"
+    )
+    advise_parser.add_argument("--no-pg-stat-statements", action="store_true")
+    advise_parser.add_argument(
+        "--sql", action="store_true", help="print only the CREATE INDEX statements"
+    )
+    advise_parser.add_argument(
+        "--check", action="store_true", help="exit 1 if any index is proposed"
+    )
+    advise_parser.set_defaults(func=advise)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
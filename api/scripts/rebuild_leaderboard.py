@@ -0,0 +1,47 @@
+"""
+Recompute judging.leaderboard from judging.scores.
+
+The score endpoints keep the leaderboard current incrementally; run this after
+the migration that creates the table, after editing scores directly in the
+database, or whenever the totals are suspected to have drifted:
+
+    python scripts/rebuild_leaderboard.py [--hackathon-id UUID]
+"""
+
+import argparse
+import os
+import sys
+import uuid
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.database import SessionLocal
+from app.services.leaderboard_service import rebuild_leaderboard
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Recompute the judging leaderboard from the submitted scores."
+    )
+    parser.add_argument(
+        "--hackathon-id",
+        type=uuid.UUID,
+        default=None,
+        help="only rebuild this hackathon (default: all)",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = rebuild_leaderboard(db, args.hackathon_id)
+        db.commit()
+        print(f"Leaderboard rebuilt: {rows} project(s).")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Recompute the denormalized counters (teams.member_count,
+hackathons.registration_count, projects.version_seq) from the rows they count.
+
+The API keeps them current in the transactions that add or remove rows (see
+app/counters.py); run this periodically, e.g. from cron, to correct drift from
+writes made outside the ORM:
+
+    python scripts/reconcile_counters.py
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.database import SessionLocal
+from app.counters import reconcile_counters
+
+
+def main():
+    db = SessionLocal()
+    try:
+        fixed = reconcile_counters(db)
+        db.commit()
+        for column, rows in fixed.items():
+            print(f"{column}: {rows} row(s) corrected")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
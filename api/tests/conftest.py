@@ -14,13 +14,20 @@ logger = logging.getLogger("conftest")
 os.environ["TESTING"] = "1"
 
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, text, StaticPool, event
+from sqlalchemy import create_engine, text, StaticPool, event, NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_async_db, async_database_url
+from app.db_routing import get_async_read_db
+from app.query_stats import (
+    N_PLUS_ONE_HEADER,
+    QUERY_COUNT_HEADER,
+    instrument_engine,
+)
 from app.models.user import User, UserRoleAssociation
 from app.auth import get_password_hash
 from app.models.hackathon import Hackathon
@@ -38,6 +45,22 @@ engine_test = create_engine(
     pool_pre_ping=True,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+# What the app's get_db hands out: objects are not expired on commit
+TestingAppSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine_test
+)
+
+# TestClient runs every request on a fresh event loop, so asyncpg connections
+# must not be pooled across requests.
+engine_test_async = create_async_engine(
+    async_database_url(DATABASE_URL), poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    engine_test_async, autoflush=False, expire_on_commit=False
+)
+# Report statements of the test engines in the X-DB-* headers like the app engines
+instrument_engine(engine_test)
+instrument_engine(engine_test_async.sync_engine)
 
 EXAMPLE_PROJECTS_DIR = os.path.join(os.path.dirname(__file__), "example_projects")
 
@@ -79,16 +102,74 @@ def db_session(setup_test_db_schemas) -> Generator[Session, None, None]:
 @pytest.fixture(scope="session")
 def client() -> TestClient:
     def override_get_db():
-        db = TestingSessionLocal()
+        db = TestingAppSessionLocal()
         try:
             yield db
         finally:
             db.close()
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
     return TestClient(app)
 
 
+@pytest.fixture
+def async_session_factory():
+    """Async sessions on the test database, for services that open their own."""
+    return TestingAsyncSessionLocal
+
+
+@pytest.fixture
+def session_factory():
+    """Sessions configured like the app's, for code running in other threads."""
+    return TestingAppSessionLocal
+
+
+@pytest.fixture
+def count_queries() -> Generator[list, None, None]:
+    """
+    Collects the SQL statements emitted on the test engines (sync and async)
+    while the test runs. Clear the list right before the call under test.
+    """
+    statements: list = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = [engine_test, engine_test_async.sync_engine]
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Returns check(response, max_queries) which fails the test when the request
+    issued more SQL statements than its budget (read from the X-DB-Queries header).
+    """
+
+    def check(response, max_queries: int):
+        count = int(response.headers[QUERY_COUNT_HEADER])
+        assert count <= max_queries, (
+            f"{response.request.method} {response.request.url.path} issued {count} "
+            f"SQL statements, budget is {max_queries} "
+            f"(suspected N+1 shapes: {response.headers.get(N_PLUS_ONE_HEADER, 0)})"
+        )
+        return count
+
+    return check
+
+
 @pytest.fixture
 def unique_id() -> (
     uuid.UUID
@@ -90,3 +90,21 @@ def test_admin_full_crud_and_security(client, admin_token):
     # Admin kann Security-Fehler erkennen (z.B. doppeltes Team löschen)
     r = client.delete(f"/teams/{team_id}", headers=headers)
     assert r.status_code in (204, 404, 400, 403)
+
+
+def test_db_pool_stats_as_admin(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    r = client.get("/admin/db-pool", headers=headers)
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["settings"]["max_connections_per_worker"] == 2 * (
+        data["settings"]["pool_size"] + data["settings"]["max_overflow"]
+    )
+    for pool in (data["pool"], data["async_pool"]):
+        for key in ("checked_out", "overflow", "wait_ms", "connection_age_s"):
+            assert key in pool
+
+
+def test_db_pool_stats_forbidden_for_participant(client, auth_headers_for_regular_user):
+    r = client.get("/admin/db-pool", headers=auth_headers_for_regular_user)
+    assert r.status_code == 403
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import select
+import time
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app import broadcast
+from app.broadcast import LEADERBOARD, RELOAD, VOTES, Broadcaster
+from app.models.project import Project
+from app.services.leaderboard_service import apply_score_delta
+
+HACKATHON = uuid.UUID(int=1)
+PROJECT_A, PROJECT_B = "a", "b"
+
+
+def _loader(states):
+    async def load(hackathon_id):
+        return states.get(str(hackathon_id))
+
+    return load
+
+
+def _announce(broadcaster, kind, values, hackathon=HACKATHON):
+    broadcaster.receive(json.dumps({"h": str(hackathon), "k": kind, "v": values}))
+
+
+def test_updates_are_coalesced_and_serialized_once_per_tick():
+    async def scenario():
+        broadcaster = Broadcaster(_loader({str(HACKATHON): {VOTES: {PROJECT_A: 1}}}))
+        first = await broadcaster.subscribe(HACKATHON)
+        second = await broadcaster.subscribe(HACKATHON)
+        streams = [first.messages(), second.messages()]
+        snapshots = [json.loads(await s.__anext__()) for s in streams]
+        assert snapshots[0] == snapshots[1]
+        assert snapshots[0]["type"] == "snapshot"
+        assert snapshots[0][VOTES] == {PROJECT_A: 1}
+
+        for n in range(2, 6):
+            _announce(broadcaster, VOTES, {PROJECT_A: n})
+        _announce(broadcaster, VOTES, {PROJECT_B: 1})
+        await broadcaster.tick()
+        await broadcaster.tick()  # nothing new: no message
+
+        messages = [await s.__anext__() for s in streams]
+        # Both subscribers got the very same serialized message
+        assert messages[0] is messages[1]
+        update = json.loads(messages[0])
+        assert update["type"] == "update"
+        assert update[VOTES] == {PROJECT_A: 5, PROJECT_B: 1}
+        assert update[LEADERBOARD] == {}
+
+    asyncio.run(scenario())
+
+
+def test_idle_subscribers_get_heartbeats():
+    async def scenario():
+        broadcaster = Broadcaster(_loader({str(HACKATHON): {}}))
+        stream = (await broadcaster.subscribe(HACKATHON)).messages(heartbeat_s=0.01)
+        await stream.__anext__()
+        assert await stream.__anext__() is None
+
+    asyncio.run(scenario())
+
+
+def test_lagging_subscriber_restarts_from_snapshot(monkeypatch):
+    monkeypatch.setattr(broadcast, "LIVE_HISTORY", 2)
+
+    async def scenario():
+        broadcaster = Broadcaster(_loader({str(HACKATHON): {}}))
+        stream = (await broadcaster.subscribe(HACKATHON)).messages()
+        await stream.__anext__()
+        for n in range(1, 5):
+            _announce(broadcaster, VOTES, {PROJECT_A: n})
+            await broadcaster.tick()
+        caught_up = json.loads(await stream.__anext__())
+        assert caught_up["type"] == "snapshot"
+        assert caught_up["seq"] == 4
+        assert caught_up[VOTES] == {PROJECT_A: 4}
+
+    asyncio.run(scenario())
+
+
+def test_reload_replaces_state_from_loader():
+    states = {str(HACKATHON): {LEADERBOARD: {PROJECT_A: {"score_count": 1}}}}
+
+    async def scenario():
+        broadcaster = Broadcaster(_loader(states))
+        stream = (await broadcaster.subscribe(HACKATHON)).messages()
+        await stream.__anext__()
+        states[str(HACKATHON)] = {LEADERBOARD: {PROJECT_B: {"score_count": 2}}}
+        broadcaster.receive(json.dumps({"h": "*", "k": RELOAD}))
+        await broadcaster.tick()
+        message = json.loads(await stream.__anext__())
+        assert message["type"] == "snapshot"
+        assert message[LEADERBOARD] == {PROJECT_B: {"score_count": 2}}
+
+    asyncio.run(scenario())
+
+
+def test_channels_are_dropped_with_their_last_subscriber():
+    async def scenario():
+        broadcaster = Broadcaster(_loader({str(HACKATHON): {}}))
+        with pytest.raises(LookupError):
+            await broadcaster.subscribe(uuid.uuid4())
+        subscription = await broadcaster.subscribe(HACKATHON)
+        assert broadcaster.subscribers == 1
+        subscription.close()
+        subscription.close()
+        assert broadcaster.subscribers == 0
+        # Announcements for hackathons nobody watches are ignored
+        _announce(broadcaster, VOTES, {PROJECT_A: 1})
+        await broadcaster.tick()
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_subscribers_share_a_failed_load():
+    async def scenario():
+        async def slow_miss(hackathon_id):
+            await asyncio.sleep(0.01)  # the second subscriber waits meanwhile
+            return None
+
+        broadcaster = Broadcaster(slow_miss)
+        unknown = uuid.uuid4()
+        results = await asyncio.gather(
+            broadcaster.subscribe(unknown),
+            broadcaster.subscribe(unknown),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, LookupError) for r in results)
+        assert broadcaster.subscribers == 0
+        assert broadcaster._channels == {}
+
+    asyncio.run(scenario())
+
+
+def test_notify_payloads_stay_under_the_postgres_limit():
+    values = {str(uuid.UUID(int=i)): i for i in range(1000)}
+    statements = broadcast.notify(HACKATHON, VOTES, values)
+    assert len(statements) > 1
+    merged = {}
+    for stmt in statements:
+        channel, payload = stmt.compile().params.values()
+        assert channel == broadcast.NOTIFY_CHANNEL
+        assert len(payload) < 8000
+        merged.update(json.loads(payload)["v"])
+    assert merged == values
+
+
+def _wait_for_notifies(connection, timeout: float = 5.0) -> list:
+    """Notifications of a LISTENing psycopg2 connection, waiting for the first."""
+    deadline = time.monotonic() + timeout
+    while not connection.notifies:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if select.select([connection], [], [], remaining)[0]:
+            connection.poll()
+    return connection.notifies
+
+
+def test_score_writes_are_announced_on_commit(
+    db_session, test_hackathon, created_regular_user
+):
+    project = Project(
+        name=f"Live Project {uuid.uuid4()}",
+        hackathon_id=test_hackathon.id,
+        owner_id=created_regular_user.id,
+    )
+    db_session.add(project)
+    db_session.commit()
+    # A connection of its own: the session's may change between transactions
+    listener = db_session.get_bind().raw_connection()
+    try:
+        listener.dbapi_connection.autocommit = True
+        listener.cursor().execute(f"LISTEN {broadcast.NOTIFY_CHANNEL}")
+        apply_score_delta(db_session, project.id, test_hackathon.id, Decimal(14), 2, 1)
+        listener.dbapi_connection.poll()
+        assert not listener.dbapi_connection.notifies  # nothing before the commit
+        db_session.commit()
+        notifies = _wait_for_notifies(listener.dbapi_connection)
+        payloads = [json.loads(n.payload) for n in notifies]
+    finally:
+        listener.cursor().execute(f"UNLISTEN {broadcast.NOTIFY_CHANNEL}")
+        listener.close()
+    assert {
+        "h": str(test_hackathon.id),
+        "k": LEADERBOARD,
+        "v": {str(project.id): {"weighted_average": 7.0, "score_count": 1}},
+    } in payloads
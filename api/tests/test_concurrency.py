@@ -0,0 +1,141 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.models.judging import Criterion, LeaderboardEntry, Score
+from app.models.project import Project
+from app.models.team import Team, TeamMember
+from app.schemas.judging import ScoreUpdate
+from app.schemas.team import TeamMemberRole
+from app.services.judging_service import update_score
+from app.services.leaderboard_service import record_new_score
+from app.utils.concurrency import if_match_version
+
+
+def test_if_match_parsing():
+    assert if_match_version(None) is None
+    assert if_match_version("*") is None
+    assert if_match_version('"3"') == 3
+    assert if_match_version('W/"4"') == 4
+    for malformed in ("3", '"a"', '"1", "2"'):
+        with pytest.raises(HTTPException) as exc:
+            if_match_version(malformed)
+        assert exc.value.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.fixture
+def judged_score(db_session, test_hackathon, created_regular_user, created_judge_user):
+    project = Project(
+        name=f"OCC Project {uuid.uuid4()}",
+        hackathon_id=test_hackathon.id,
+        owner_id=created_regular_user.id,
+    )
+    criterion = Criterion(name=f"OCC {uuid.uuid4()}", max_score=10, weight=2)
+    db_session.add_all([project, criterion])
+    db_session.flush()
+    score = Score(
+        project_id=project.id,
+        criteria_id=criterion.id,
+        judge_id=created_judge_user.id,
+        score=4,
+    )
+    db_session.add(score)
+    db_session.flush()
+    record_new_score(db_session, score, criterion, project)
+    db_session.commit()
+    yield score
+    db_session.delete(project)
+    db_session.delete(criterion)
+    db_session.commit()
+
+
+def test_score_update_checks_version_and_keeps_leaderboard(
+    db_session, judged_score, created_judge_user
+):
+    assert judged_score.version == 1
+    updated = update_score(
+        db_session, judged_score.id, ScoreUpdate(score=8), created_judge_user, 1
+    )
+    assert (updated.score, updated.version) == (8, 2)
+
+    # A second writer still holding version 1 must not overwrite the change
+    with pytest.raises(HTTPException) as exc:
+        update_score(
+            db_session, judged_score.id, ScoreUpdate(score=2), created_judge_user, 1
+        )
+    assert exc.value.status_code == status.HTTP_409_CONFLICT
+    assert exc.value.headers["ETag"] == '"2"'
+
+    # Without If-Match the last writer wins, as before
+    updated = update_score(
+        db_session, judged_score.id, ScoreUpdate(score=6), created_judge_user
+    )
+    assert updated.version == 3
+    entry = db_session.get(LeaderboardEntry, judged_score.project_id)
+    db_session.refresh(entry)
+    assert entry.weighted_average == Decimal(6)
+    assert entry.score_count == 1
+
+
+def test_failed_score_update_reports_the_reason(
+    db_session, judged_score, created_judge_user, created_regular_user
+):
+    cases = [
+        (uuid.uuid4(), ScoreUpdate(score=5), created_judge_user, 404),
+        (judged_score.id, ScoreUpdate(score=11), created_judge_user, 400),
+        (judged_score.id, ScoreUpdate(score=5), created_regular_user, 403),
+    ]
+    for score_id, score_in, user, expected in cases:
+        with pytest.raises(HTTPException) as exc:
+            update_score(db_session, score_id, score_in, user)
+        assert exc.value.status_code == expected
+    db_session.refresh(judged_score)
+    assert (judged_score.score, judged_score.version) == (4, 1)
+
+
+def test_project_put_honours_if_match(
+    client,
+    db_session,
+    test_hackathon,
+    created_regular_user,
+    auth_headers_for_regular_user,
+):
+    team = Team(name=f"OCC Team {uuid.uuid4()}", hackathon_id=test_hackathon.id)
+    db_session.add(team)
+    db_session.flush()
+    db_session.add(
+        TeamMember(
+            team_id=team.id, user_id=created_regular_user.id, role=TeamMemberRole.owner
+        )
+    )
+    project = Project(
+        name=f"OCC Project {uuid.uuid4()}",
+        hackathon_id=test_hackathon.id,
+        owner_id=created_regular_user.id,
+        team_id=team.id,
+    )
+    db_session.add(project)
+    db_session.commit()
+    url = f"/projects/{project.id}"
+
+    etag = client.get(url, headers=auth_headers_for_regular_user).headers["ETag"]
+    first = client.put(
+        url,
+        headers={**auth_headers_for_regular_user, "If-Match": etag},
+        json={"description": "first"},
+    )
+    assert first.status_code == status.HTTP_200_OK
+    assert first.headers["ETag"] != etag
+    assert first.json()["version"] == 2
+
+    stale = client.put(
+        url,
+        headers={**auth_headers_for_regular_user, "If-Match": etag},
+        json={"description": "second"},
+    )
+    assert stale.status_code == status.HTTP_409_CONFLICT
+    assert stale.headers["ETag"] == first.headers["ETag"]
+    db_session.refresh(project)
+    assert project.description == "first"
@@ -0,0 +1,115 @@
+import threading
+import uuid
+
+from sqlalchemy import update
+
+from app.counters import next_version_number, reconcile_counters
+from app.models.hackathon_registration import HackathonRegistration
+from app.models.project import Project
+from app.models.team import Team, TeamMember
+from app.schemas.team import TeamCreate, TeamMemberRole
+from app.services.team_service import create_team
+
+
+def test_member_count_follows_membership(
+    db_session, test_hackathon, created_regular_user, created_judge_user
+):
+    team = create_team(
+        db_session,
+        TeamCreate(name=f"Count {uuid.uuid4()}", hackathon_id=test_hackathon.id),
+        created_regular_user,
+    )
+    # The creator was counted in the same flush, no reload needed
+    assert team.member_count == 1
+    version = team.version
+
+    member = TeamMember(
+        team_id=team.id, user_id=created_judge_user.id, role=TeamMemberRole.member
+    )
+    db_session.add(member)
+    db_session.commit()
+    assert team.member_count == 2
+    db_session.delete(member)
+    db_session.commit()
+    db_session.expire(team)
+    assert (team.member_count, team.version) == (1, version)
+
+    db_session.delete(team)
+    db_session.commit()
+
+
+def test_registration_count_follows_registrations(
+    db_session, test_hackathon, created_regular_user
+):
+    project = Project(
+        name=f"Count Project {uuid.uuid4()}",
+        hackathon_id=test_hackathon.id,
+        owner_id=created_regular_user.id,
+    )
+    registration = HackathonRegistration(
+        hackathon_id=test_hackathon.id,
+        user_id=created_regular_user.id,
+        project=project,
+        status="registered",
+    )
+    db_session.add(registration)
+    db_session.commit()
+    assert test_hackathon.registration_count == 1
+
+    db_session.delete(registration)
+    db_session.delete(project)
+    db_session.commit()
+    db_session.expire(test_hackathon)
+    assert test_hackathon.registration_count == 0
+
+
+def test_concurrent_uploads_get_distinct_version_numbers(
+    db_session, session_factory, test_hackathon, created_regular_user
+):
+    project = Project(
+        name=f"Seq Project {uuid.uuid4()}",
+        hackathon_id=test_hackathon.id,
+        owner_id=created_regular_user.id,
+    )
+    db_session.add(project)
+    db_session.commit()
+    project_id = project.id
+    numbers = []
+
+    def upload():
+        with session_factory() as db:
+            numbers.append(next_version_number(db, project_id))
+            db.commit()
+
+    threads = [threading.Thread(target=upload) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(numbers) == list(range(1, 9))
+
+    db_session.delete(project)
+    db_session.commit()
+
+
+def test_reconcile_corrects_drift(db_session, test_hackathon, created_regular_user):
+    team = Team(
+        name=f"Drift {uuid.uuid4()}",
+        hackathon_id=test_hackathon.id,
+        members=[TeamMember(user_id=created_regular_user.id)],
+    )
+    db_session.add(team)
+    db_session.commit()
+    # A write that bypasses the ORM listeners
+    db_session.execute(update(Team).where(Team.id == team.id).values(member_count=7))
+    db_session.commit()
+
+    fixed = reconcile_counters(db_session)
+    db_session.commit()
+    assert fixed["member_count"] >= 1
+    assert reconcile_counters(db_session)["member_count"] == 0
+    db_session.refresh(team)
+    assert team.member_count == 1
+
+    db_session.delete(team)
+    db_session.commit()
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import time
+
+import pytest
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.auth import create_access_token
+from app.db_routing import (
+    DB_PIN_COOKIE,
+    RecentWriters,
+    Replica,
+    ReplicaRouter,
+    _build_replica,
+    record_write,
+    replica_router,
+)
+
+
+def _request(method="GET", token=None, cookie=None):
+    headers = []
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    if cookie:
+        headers.append((b"cookie", cookie.encode()))
+    return Request({"type": "http", "method": method, "path": "/", "headers": headers})
+
+
+def _healthy(name, lag_s=0.0):
+    return Replica(name=name, url="", healthy=True, lag_s=lag_s)
+
+
+def test_recent_writers_window():
+    writers = RecentWriters(window_s=5)
+    writers.mark("user-1", now=100.0)
+    assert writers.is_pinned("user-1", now=104.0)
+    assert not writers.is_pinned("user-1", now=106.0)
+    assert not writers.is_pinned("user-2", now=104.0)
+    assert not writers.is_pinned(None)
+
+
+def test_pick_skips_lagging_and_unhealthy_replicas():
+    lagging = _healthy("lagging", lag_s=30.0)
+    down = Replica(name="down", url="", healthy=False, lag_s=0.0)
+    ok = _healthy("ok")
+    router = ReplicaRouter(replicas=[lagging, down, ok], max_lag_s=5)
+    assert {router.pick(None).name for _ in range(4)} == {"ok"}
+
+    router = ReplicaRouter(replicas=[lagging, down], max_lag_s=5)
+    assert router.pick(None) is None
+
+
+def test_pick_round_robins_healthy_replicas():
+    router = ReplicaRouter(replicas=[_healthy("a"), _healthy("b")])
+    assert [router.pick(None).name for _ in range(4)] == ["a", "b", "a", "b"]
+
+
+def test_recent_writer_reads_from_primary():
+    router = ReplicaRouter(replicas=[_healthy("a")])
+    router.recent_writers.mark("user-1")
+    assert router.pick("user-1") is None
+    assert router.pick("user-2").name == "a"
+    # Pin cookie set by another worker
+    assert router.pick("user-2", pinned_until=time.time() + 5) is None
+
+
+def test_record_write_pins_user(monkeypatch):
+    monkeypatch.setattr(replica_router, "replicas", [_healthy("a")])
+    monkeypatch.setattr(replica_router, "recent_writers", RecentWriters(window_s=5))
+    token = create_access_token({"sub": "user-1"})
+
+    response = Response(status_code=200)
+    record_write(_request("GET", token), response)
+    assert DB_PIN_COOKIE not in response.headers.get("set-cookie", "")
+
+    response = Response(status_code=400)
+    record_write(_request("POST", token), response)
+    assert not replica_router.recent_writers.is_pinned("user-1")
+
+    response = Response(status_code=201)
+    record_write(_request("POST", token), response)
+    assert replica_router.recent_writers.is_pinned("user-1")
+    assert DB_PIN_COOKIE in response.headers["set-cookie"]
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_REPLICA_DATABASE_URL"),
+    reason="TEST_REPLICA_DATABASE_URL not set (needs a second Postgres instance)",
+)
+def test_replica_lag_measurement():
+    replica = _build_replica(0, os.environ["TEST_REPLICA_DATABASE_URL"])
+    router = ReplicaRouter(replicas=[replica])
+
+    async def check():
+        await router.check_lag()
+        await replica.engine.dispose()
+
+    asyncio.run(check())
+    assert replica.healthy, replica.last_error
+    assert replica.lag_s is not None and replica.lag_s >= 0
+    assert router.pick(None) is replica
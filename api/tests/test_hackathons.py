@@ -7,6 +7,9 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from app.models.hackathon import Hackathon  # SQLAlchemy model
+from app.models.hackathon_registration import HackathonRegistration
+from app.models.project import Project
+from app.models.team import Team, TeamMember
 from app.schemas.hackathon import HackathonStatus  # Enum for payload
 from app.models.user import (
     User as UserModel,
@@ -254,3 +257,132 @@ def test_delete_hackathon_as_regular_user(
         f"/hackathons/{created_hackathon_id}", headers=auth_headers_for_regular_user
     )
     assert delete_response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_hackathon_summary_counts(
+    client: TestClient,
+    db_session: Session,
+    created_regular_user: UserModel,
+    created_judge_user: UserModel,
+    created_admin_user: UserModel,
+    query_budget,
+):
+    start = datetime(2999, 1, 1, tzinfo=timezone.utc)
+    public, hidden = [
+        Hackathon(
+            name=f"Summary Hackathon {uuid.uuid4()}",
+            start_date=start,
+            end_date=start + timedelta(days=2),
+            status=HackathonStatus.UPCOMING,
+            is_public=is_public,
+        )
+        for is_public in (True, False)
+    ]
+    db_session.add_all([public, hidden])
+    db_session.flush()
+    team = Team(
+        name=f"Summary Team {uuid.uuid4()}",
+        hackathon_id=public.id,
+        members=[
+            TeamMember(user_id=created_regular_user.id),
+            TeamMember(user_id=created_judge_user.id),
+        ],
+    )
+    db_session.add(team)
+    db_session.flush()
+
+    def entry(status, **participant):
+        owner_id = participant.get("user_id", created_regular_user.id)
+        return HackathonRegistration(
+            hackathon_id=public.id,
+            status=status,
+            project=Project(name="Entry", hackathon_id=public.id, owner_id=owner_id),
+            **participant,
+        )
+
+    db_session.add_all(
+        [
+            entry("registered", team_id=team.id),
+            entry("registered", user_id=created_admin_user.id),
+            entry("waitlisted", user_id=created_judge_user.id),
+        ]
+    )
+    db_session.commit()
+
+    response = client.get(
+        "/hackathons/summary",
+        params={"status_filter": HackathonStatus.UPCOMING.value, "limit": 5},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    query_budget(response, 2)  # The ETag, then the cards
+    cards = {card["id"]: card for card in response.json()}
+    assert str(hidden.id) not in cards
+    card = cards[str(public.id)]
+    assert "registrations" not in card
+    assert (
+        card["registration_count"],
+        card["team_count"],
+        card["participant_count"],
+        card["waitlist_count"],
+    ) == (2, 1, 3, 1)
+
+    for registration in public.registrations:
+        db_session.delete(registration)
+    db_session.flush()
+    db_session.query(Project).filter(Project.hackathon_id == public.id).delete()
+    db_session.delete(team)
+    db_session.delete(public)
+    db_session.delete(hidden)
+    db_session.commit()
+
+
+def test_list_hackathons_filters(
+    client: TestClient, db_session: Session, count_queries
+):
+    start = datetime(2998, 1, 1, tzinfo=timezone.utc)
+    tag = f"tag-{uuid.uuid4().hex[:8]}"
+    match, wrong_category, missing_tag = [
+        Hackathon(
+            name=f"Filter Hackathon {uuid.uuid4()}",
+            start_date=start,
+            end_date=start + timedelta(days=2),
+            status=HackathonStatus.UPCOMING,
+            category=category,
+            tags=tags,
+            requirements=["laptop", "github"],
+        )
+        for category, tags in (
+            ("AI", [tag, "python"]),
+            ("Health", [tag, "python"]),
+            ("AI", [tag]),
+        )
+    ]
+    db_session.add_all([match, wrong_category, missing_tag])
+    db_session.commit()
+    ids = [str(h.id) for h in (match, wrong_category, missing_tag)]
+
+    count_queries.clear()
+    response = client.get(
+        "/hackathons/",
+        params={
+            "tag": [tag, "python"],
+            "requirement": "github",
+            "category": "AI",
+            "fields": "id",
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [h["id"] for h in response.json()] == ids[:1]
+    # Filtered by the database, not after loading
+    assert any("@>" in statement for statement in count_queries)
+
+    response = client.get("/hackathons/", params={"tag": tag})
+    assert sorted(h["id"] for h in response.json()) == sorted(ids)
+    response = client.get("/hackathons/", params={"tag": tag, "requirement": "docker"})
+    assert response.json() == []
+    response = client.get("/hackathons/summary", params={"tag": tag, "category": "AI"})
+    assert sorted(card["id"] for card in response.json()) == sorted(ids[::2])
+
+    for hackathon in (match, wrong_category, missing_tag):
+        db_session.delete(hackathon)
+    db_session.commit()
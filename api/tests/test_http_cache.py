@@ -0,0 +1,133 @@
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi import status
+
+from app.models.hackathon import Hackathon
+from app.models.team import Team, TeamInvite, TeamInviteStatus, TeamMember, TeamStatus
+from app.schemas.hackathon import HackathonStatus
+from app.schemas.team import TeamMemberRole
+from app.utils.concurrency import if_match_version
+
+
+def _hackathon(db_session):
+    hackathon = Hackathon(
+        name=f"Cache Hackathon {uuid.uuid4()}",
+        start_date=datetime.now(),
+        end_date=datetime.now() + timedelta(days=7),
+        status=HackathonStatus.ACTIVE,
+    )
+    db_session.add(hackathon)
+    db_session.commit()
+    return hackathon
+
+
+def _team(db_session, hackathon_id, owner_id):
+    team = Team(
+        name=f"Cache Team {uuid.uuid4()}",
+        hackathon_id=hackathon_id,
+        status=TeamStatus.active,
+        members=[TeamMember(user_id=owner_id, role=TeamMemberRole.owner)],
+    )
+    db_session.add(team)
+    db_session.commit()
+    return team
+
+
+def _revalidate(client, url, etag, **params):
+    return client.get(url, params=params, headers={"If-None-Match": etag})
+
+
+def test_team_detail_not_modified(
+    client, db_session, created_regular_user, query_budget
+):
+    hackathon = _hackathon(db_session)
+    team = _team(db_session, hackathon.id, created_regular_user.id)
+    url = f"/teams/{team.id}"
+
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+    assert etag.startswith(f'W/"{team.version}.')
+    assert response.headers["Cache-Control"] == "no-cache"
+    # The GET ETag still guards updates
+    assert if_match_version(etag) == team.version
+
+    response = _revalidate(client, url, etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    query_budget(response, 1)
+
+    # An embedded row without updated_at: the invite is tracked by its xmin
+    invite = TeamInvite(
+        team_id=team.id,
+        email=f"{uuid.uuid4()}@example.com",
+        sender_id=created_regular_user.id,
+        token=uuid.uuid4().hex,
+    )
+    db_session.add(invite)
+    db_session.commit()
+    response = _revalidate(client, url, etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["invites"]) == 1
+    invited = response.headers["ETag"]
+    assert invited != etag
+
+    invite.status = TeamInviteStatus.expired
+    db_session.commit()
+    response = _revalidate(client, url, invited)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["invites"][0]["status"] == "expired"
+
+    # Without the invites in the response, their changes do not matter
+    narrow = client.get(url, params={"fields": "name"}).headers["ETag"]
+    db_session.delete(invite)
+    db_session.commit()
+    response = _revalidate(client, url, narrow, fields="name")
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    db_session.query(TeamMember).filter(TeamMember.team_id == team.id).delete()
+    db_session.delete(team)
+    db_session.delete(hackathon)
+    db_session.commit()
+
+
+def test_team_list_not_modified(client, db_session, created_regular_user):
+    hackathon = _hackathon(db_session)
+    first = _team(db_session, hackathon.id, created_regular_user.id)
+    params = {"hackathon_id": str(hackathon.id)}
+
+    response = client.get("/teams/", params=params)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+    assert _revalidate(client, "/teams/", etag, **params).status_code == (
+        status.HTTP_304_NOT_MODIFIED
+    )
+
+    # A team entering the page changes the ETag
+    second = _team(db_session, hackathon.id, created_regular_user.id)
+    response = _revalidate(client, "/teams/", etag, **params)
+    assert response.status_code == status.HTTP_200_OK
+    assert [t["id"] for t in response.json()] == [str(second.id), str(first.id)]
+
+    # So does one leaving it
+    etag = response.headers["ETag"]
+    second.status = TeamStatus.archived
+    db_session.commit()
+    response = _revalidate(client, "/teams/", etag, **params)
+    assert [t["id"] for t in response.json()] == [str(first.id)]
+
+    for team in (first, second):
+        db_session.query(TeamMember).filter(TeamMember.team_id == team.id).delete()
+        db_session.delete(team)
+    db_session.delete(hackathon)
+    db_session.commit()
+
+
+def test_criteria_cache_policy(client):
+    response = client.get("/judging/criteria/")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+    response = _revalidate(client, "/judging/criteria/", response.headers["ETag"])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
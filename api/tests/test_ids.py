@@ -0,0 +1,33 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.models.judging import Criterion
+from app.utils import ids
+from app.utils.ids import uuid7, uuid7_floor, uuid7_time
+
+
+def test_uuid7_layout_and_order():
+    before = datetime.now(timezone.utc).replace(microsecond=0)
+    values = [uuid7() for _ in range(20000)]
+    assert all(v.version == 7 and v.variant == uuid.RFC_4122 for v in values)
+    # Strictly increasing even with many ids per millisecond
+    assert values == sorted(set(values))
+    created = uuid7_time(values[0])
+    assert before <= created <= datetime.now(timezone.utc)
+    assert uuid7_floor(created) <= values[0] < uuid7_floor(created + timedelta(1))
+
+
+def test_uuid7_stays_ordered_when_the_counter_runs_out(monkeypatch):
+    monkeypatch.setattr(ids, "_COUNTER_MAX", 2)
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_700_000_000_000_000_000)
+    values = [uuid7() for _ in range(10)]
+    assert values == sorted(set(values))
+    assert uuid7_time(values[-1]) > uuid7_time(values[0])
+
+
+def test_new_rows_get_uuid7_keys(db_session):
+    criterion = Criterion(name=f"Keys {uuid.uuid4()}", max_score=10)
+    db_session.add(criterion)
+    db_session.flush()
+    assert criterion.id.version == 7
+    db_session.rollback()
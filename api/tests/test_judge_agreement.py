@@ -0,0 +1,97 @@
+import uuid
+
+import numpy as np
+import pytest
+from fastapi import status
+
+from app.services import judge_agreement
+from app.services.judge_agreement import agreement_report, icc_oneway, kendall_w
+
+PROJECTS = [uuid.UUID(int=i) for i in range(1, 7)]
+JUDGES = [uuid.UUID(int=100 + i) for i in range(4)]
+CRITERION = uuid.UUID(int=1000)
+
+
+def _rows(matrix):
+    """(project, judge) matrix of scores out of 10, NaN = not scored."""
+    return [
+        (PROJECTS[p], JUDGES[j], CRITERION, matrix[p][j], 1, 10)
+        for p in range(len(matrix))
+        for j in range(len(matrix[p]))
+        if not np.isnan(matrix[p][j])
+    ]
+
+
+def test_perfect_agreement():
+    verdicts = np.tile(np.linspace(0.1, 0.9, 6)[:, None], (1, 3))
+    assert icc_oneway(verdicts) == pytest.approx(1.0)
+    w, projects = kendall_w(verdicts)
+    assert w == pytest.approx(1.0)
+    assert projects == 6
+
+
+def test_icc_handles_incomplete_designs():
+    # Every project has two of the three judges, who agree up to a little noise
+    truth = np.linspace(0.1, 0.9, 6)
+    verdicts = np.tile(truth[:, None], (1, 3)) + np.array([0.02, -0.02, 0.01])
+    verdicts[np.arange(6), np.arange(6) % 3] = np.nan
+    assert icc_oneway(verdicts) > 0.95
+    # No project was scored by all judges
+    assert kendall_w(verdicts) == (None, 0)
+
+
+def test_kendall_w_with_ties_and_disagreement():
+    opposed = np.array([[1.0, 3.0], [2.0, 2.0], [3.0, 1.0]])
+    w, _ = kendall_w(opposed)
+    assert w == pytest.approx(0.0)
+    tied = np.array([[1.0, 1.0], [1.0, 1.0], [2.0, 2.0]])
+    w, _ = kendall_w(tied)
+    assert w == pytest.approx(1.0)
+
+
+def test_contrarian_judge_is_outlier_and_bias_follows_leniency():
+    base = [2, 3, 5, 6, 8, 9]
+    matrix = [[s, s + 0.5, s - 0.5, 10 - s] for s in base]
+    report = agreement_report(_rows(matrix))
+    stats = {s.judge_id: s for s in report.judge_stats}
+    assert report.projects == 6 and report.judges == 4 and report.ratings == 24
+    contrarian = stats[JUDGES[3]]
+    assert contrarian.consensus_correlation < 0
+    assert contrarian.outlier
+    assert not stats[JUDGES[0]].outlier
+    # JUDGES[1] scores half a point (0.05 of max) above JUDGES[0] on every project
+    assert stats[JUDGES[1]].bias > stats[JUDGES[0]].bias > stats[JUDGES[2]].bias
+
+
+def test_empty_report():
+    report = agreement_report([])
+    assert report.icc is None and report.judge_stats == []
+
+
+def test_report_is_cached_per_version():
+    hackathon_id = uuid.uuid4()
+    rows = _rows([[5, 6], [7, 8]])
+    report = judge_agreement.compute_report(hackathon_id, (4, "t1", "t0"), rows)
+    assert judge_agreement.cached_report(hackathon_id, (4, "t1", "t0")) is report
+    assert judge_agreement.cached_report(hackathon_id, (5, "t2", "t0")) is None
+
+
+def test_agreement_endpoint_requires_organizer(
+    client, auth_headers_for_judge_user, test_hackathon
+):
+    response = client.get(
+        f"/judging/results/hackathon/{test_hackathon.id}/agreement",
+        headers=auth_headers_for_judge_user,
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_agreement_endpoint_empty_hackathon(
+    client, auth_headers_for_admin_user, test_hackathon
+):
+    response = client.get(
+        f"/judging/results/hackathon/{test_hackathon.id}/agreement",
+        headers=auth_headers_for_admin_user,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["ratings"] == 0
@@ -0,0 +1,120 @@
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+
+from app.models.hackathon import Hackathon
+from app.models.project import Project
+from app.schemas.hackathon import HackathonMode, HackathonStatus
+from app.services.judge_assignment import plan_assignments
+
+
+def test_plan_balances_load_and_fills_every_project():
+    projects = range(100)
+    judges = [f"judge-{i}" for i in range(7)]
+    plan = plan_assignments(projects, judges, reviews_per_project=3)
+
+    assert not plan.shortfall
+    per_project = Counter(project for _, project in plan.new)
+    assert set(per_project.values()) == {3}
+    assert len(set(plan.new)) == len(plan.new)
+    assert max(plan.load.values()) - min(plan.load.values()) <= 1
+
+
+def test_plan_respects_conflicts_and_reports_shortfall():
+    judges = ["a", "b", "c"]
+    conflicts = [("a", 0), ("b", 0), ("c", 1)]
+    plan = plan_assignments([0, 1, 2], judges, 2, conflicts=conflicts)
+
+    assert not set(conflicts) & set(plan.new)
+    assert plan.shortfall == {0: 1}
+    assert ("c", 0) in plan.new
+
+
+def test_plan_honours_max_per_judge():
+    plan = plan_assignments(range(10), ["a", "b"], 2, max_per_judge=3)
+    assert plan.load == {"a": 3, "b": 3}
+    assert sum(plan.shortfall.values()) == 20 - 6
+
+
+def test_replan_after_judge_drops_only_reassigns_released_reviews():
+    judges = ["a", "b", "c", "d"]
+    first = plan_assignments(range(20), judges, 2)
+    kept = [(j, p) for j, p in first.new if j != "d"]
+    released = len(first.new) - len(kept)
+
+    second = plan_assignments(range(20), judges[:3], 2, existing=kept)
+    assert len(second.new) == released
+    assert not {p for _, p in second.new} & {
+        p for p, n in Counter(p for _, p in kept).items() if n == 2
+    }
+    assert max(second.load.values()) - min(second.load.values()) <= 1
+
+
+@pytest.fixture
+def assignment_hackathon(db_session, created_regular_user):
+    hackathon = Hackathon(
+        name=f"Assignment Hackathon {uuid.uuid4()}",
+        start_date=datetime.now(),
+        end_date=datetime.now() + timedelta(days=2),
+        status=HackathonStatus.ACTIVE,
+        mode=HackathonMode.SOLO_ONLY,
+    )
+    db_session.add(hackathon)
+    db_session.commit()
+    for i in range(3):
+        db_session.add(
+            Project(
+                name=f"Assignment Project {i} {uuid.uuid4()}",
+                hackathon_id=hackathon.id,
+                owner_id=created_regular_user.id,
+            )
+        )
+    db_session.commit()
+    return hackathon
+
+
+def test_plan_endpoint_and_judge_queue(
+    client,
+    auth_headers_for_admin_user,
+    auth_headers_for_judge_user,
+    created_judge_user,
+    assignment_hackathon,
+):
+    base = f"/judging/assignments/{assignment_hackathon.id}"
+    response = client.post(
+        f"{base}/plan",
+        headers=auth_headers_for_admin_user,
+        json={"reviews_per_project": 1, "judge_ids": [str(created_judge_user.id)]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    summary = response.json()
+    assert summary["created"] == 3
+    assert summary["shortfall"] == []
+
+    # Planning again is a no-op: every project already has its review
+    again = client.post(
+        f"{base}/plan",
+        headers=auth_headers_for_admin_user,
+        json={"reviews_per_project": 1, "judge_ids": [str(created_judge_user.id)]},
+    )
+    assert again.json()["created"] == 0
+
+    queue = client.get(f"{base}/my-queue", headers=auth_headers_for_judge_user)
+    assert queue.status_code == status.HTTP_200_OK
+    items = queue.json()
+    assert [item["position"] for item in items] == [1, 2, 3]
+    assert not any(item["reviewed"] for item in items)
+
+
+def test_plan_endpoint_requires_organizer(
+    client, auth_headers_for_judge_user, assignment_hackathon
+):
+    response = client.post(
+        f"/judging/assignments/{assignment_hackathon.id}/plan",
+        headers=auth_headers_for_judge_user,
+        json={"reviews_per_project": 1},
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -761,5 +761,147 @@ def test_list_scores_by_judge_non_existent_judge_id(
     assert response.json() == []
 
 
-# TODO: Consider adding an endpoint to get aggregated results for a project and test it.
-# e.g., /results/project/{project_id}
+# --- Results (leaderboard) ---
+
+
+@pytest.fixture(scope="function")
+def leaderboard_project(
+    db_session: Session,
+    created_regular_user: UserModel,
+    unique_id: uuid.UUID,
+    test_hackathon: Hackathon,
+) -> ProjectModel:
+    project = ProjectModel(
+        name=f"LeaderboardProject_{unique_id}",
+        description="Project on the leaderboard",
+        hackathon_id=test_hackathon.id,
+        owner_id=created_regular_user.id,
+    )
+    db_session.add(project)
+    db_session.commit()
+    return project
+
+
+@pytest.fixture(scope="function")
+def leaderboard_score(
+    client: TestClient,
+    auth_headers_for_judge_user: Dict[str, str],
+    leaderboard_project: ProjectModel,
+    unique_id: uuid.UUID,
+    db_session: Session,
+) -> ScoreModel:
+    criterion = CriterionModel(
+        name=f"Leaderboard Criterion {unique_id}", max_score=10, weight=1.0
+    )
+    db_session.add(criterion)
+    db_session.commit()
+    # Submitted through the API, so the leaderboard is maintained incrementally
+    response = client.post(
+        "/judging/scores/",
+        headers=auth_headers_for_judge_user,
+        json={
+            "project_id": str(leaderboard_project.id),
+            "criteria_id": str(criterion.id),
+            "score": 8,
+        },
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.json()
+    score = db_session.get(ScoreModel, uuid.UUID(response.json()["id"]))
+    assert score is not None
+    return score
+
+
+def test_results_follow_score_submission_and_update(
+    client: TestClient,
+    auth_headers_for_judge_user: Dict[str, str],
+    leaderboard_score: ScoreModel,
+    leaderboard_project: ProjectModel,
+    test_hackathon: Hackathon,
+):
+    url = f"/judging/results/hackathon/{test_hackathon.id}"
+    entry = next(
+        e
+        for e in client.get(url).json()
+        if e["project_id"] == str(leaderboard_project.id)
+    )
+    assert Decimal(entry["weighted_average"]) == leaderboard_score.score
+    assert entry["score_count"] == 1
+    assert entry["project_name"] == leaderboard_project.name
+
+    response = client.put(
+        f"/judging/scores/{leaderboard_score.id}",
+        headers=auth_headers_for_judge_user,
+        json={"score": 3},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    entry = next(
+        e
+        for e in client.get(url).json()
+        if e["project_id"] == str(leaderboard_project.id)
+    )
+    assert Decimal(entry["weighted_average"]) == 3
+    assert entry["score_count"] == 1
+
+
+def test_rebuild_leaderboard_matches_incremental_totals(
+    leaderboard_score: ScoreModel,
+    leaderboard_project: ProjectModel,
+    test_hackathon: Hackathon,
+    db_session: Session,
+):
+    from app.models.judging import LeaderboardEntry
+    from app.services.leaderboard_service import rebuild_leaderboard
+
+    def totals():
+        entry = db_session.get(LeaderboardEntry, leaderboard_project.id)
+        db_session.refresh(entry)
+        return entry.weighted_total, entry.weight_sum, entry.score_count
+
+    incremental = totals()
+    rebuild_leaderboard(db_session, test_hackathon.id)
+    db_session.commit()
+    assert totals() == incremental
+
+
+def test_criterion_changes_rebuild_only_the_scored_hackathons(
+    client: TestClient,
+    auth_headers_for_admin_user: Dict[str, str],
+    leaderboard_score: ScoreModel,
+    leaderboard_project: ProjectModel,
+    test_hackathon: Hackathon,
+    db_session: Session,
+    monkeypatch,
+):
+    from app.models.judging import LeaderboardEntry
+    from app.services import judging_service
+
+    rebuilt = []
+    rebuild = judging_service.rebuild_leaderboard
+
+    def recording_rebuild(db, hackathon_id=None):
+        rebuilt.append(hackathon_id)
+        return rebuild(db, hackathon_id)
+
+    monkeypatch.setattr(judging_service, "rebuild_leaderboard", recording_rebuild)
+    url = f"/judging/criteria/{leaderboard_score.criteria_id}"
+    response = client.put(
+        url,
+        headers=auth_headers_for_admin_user,
+        json={"name": f"Reweighted {uuid.uuid4()}", "max_score": 10, "weight": 2},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert rebuilt == [test_hackathon.id]
+    entry = db_session.get(LeaderboardEntry, leaderboard_project.id)
+    db_session.refresh(entry)
+    assert (entry.weighted_total, entry.weight_sum) == (16, 2)
+
+    response = client.delete(url, headers=auth_headers_for_admin_user)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert rebuilt == [test_hackathon.id, test_hackathon.id]
+    db_session.expire_all()
+    assert db_session.get(LeaderboardEntry, leaderboard_project.id) is None
+
+
+def test_results_hackathon_not_found(client: TestClient):
+    response = client.get(f"/judging/results/hackathon/{uuid.uuid4()}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
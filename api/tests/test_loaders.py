@@ -0,0 +1,164 @@
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi import status
+
+from app.models.hackathon import Hackathon
+from app.models.team import Team, TeamHistory, TeamInvite, TeamMember, TeamStatus
+from app.schemas.hackathon import HackathonMode, HackathonStatus
+from app.schemas.team import TeamMemberRole
+
+# Tables that only full team detail views need; status checks must not touch them
+TEAM_DETAIL_TABLES = ("team_history", "teams.invites", "teams.join_requests")
+
+
+def _hackathon(db_session, organizer_id=None):
+    hackathon = Hackathon(
+        name=f"Loader Hackathon {uuid.uuid4()}",
+        start_date=datetime.now(),
+        end_date=datetime.now() + timedelta(days=7),
+        status=HackathonStatus.ACTIVE,
+        mode=HackathonMode.TEAM_ONLY,
+        organizer_id=organizer_id,
+    )
+    db_session.add(hackathon)
+    db_session.commit()
+    return hackathon
+
+
+def _team_with_history(db_session, hackathon, owner_id):
+    team = Team(
+        name=f"Loader Team {uuid.uuid4()}",
+        hackathon_id=hackathon.id,
+        status=TeamStatus.active,
+        is_open=True,
+    )
+    db_session.add(team)
+    db_session.flush()
+    db_session.add(TeamMember(team_id=team.id, user_id=owner_id, role=TeamMemberRole.owner))
+    db_session.add(
+        TeamHistory(
+            team_id=team.id,
+            hackathon_id=hackathon.id,
+            name=team.name,
+            status=TeamStatus.active,
+        )
+    )
+    db_session.add(
+        TeamInvite(
+            team_id=team.id,
+            email=f"{uuid.uuid4()}@example.com",
+            sender_id=owner_id,
+            token=uuid.uuid4().hex,
+        )
+    )
+    db_session.commit()
+    return team
+
+
+def test_list_hackathons_statement_count_is_constant(
+    client, db_session, admin_user_data, count_queries
+):
+    organizer_id = uuid.UUID(admin_user_data["id"])
+    hackathon = _hackathon(db_session, organizer_id)
+    _team_with_history(db_session, hackathon, organizer_id)
+
+    count_queries.clear()
+    response = client.get("/hackathons/")
+    assert response.status_code == status.HTTP_200_OK
+    baseline = len(count_queries)
+
+    for _ in range(3):
+        _hackathon(db_session, organizer_id)
+    count_queries.clear()
+    response = client.get("/hackathons/")
+    assert response.status_code == status.HTTP_200_OK
+
+    # ETag, hackathons, organizers, organizer roles, registrations
+    assert len(count_queries) == baseline <= 5, count_queries
+    assert not any("teams." in s for s in count_queries), count_queries
+
+
+def test_get_team_loads_only_rendered_relationships(
+    client, db_session, regular_user_data, count_queries
+):
+    hackathon = _hackathon(db_session)
+    team = _team_with_history(db_session, hackathon, uuid.UUID(regular_user_data["id"]))
+
+    count_queries.clear()
+    response = client.get(f"/teams/{team.id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["invites"]) == 1
+    assert not any("team_history" in s for s in count_queries), count_queries
+    assert not any("hackathon_registrations" in s for s in count_queries)
+
+
+def test_join_team_status_check_skips_team_collections(
+    client, db_session, regular_user_data, auth_headers_for_admin_user, count_queries
+):
+    hackathon = _hackathon(db_session)
+    team = _team_with_history(db_session, hackathon, uuid.UUID(regular_user_data["id"]))
+
+    count_queries.clear()
+    response = client.post(f"/teams/{team.id}/join", headers=auth_headers_for_admin_user)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    for table in TEAM_DETAIL_TABLES:
+        assert not any(table in s for s in count_queries), (table, count_queries)
+
+
+def test_team_fieldset_loads_only_selected_fields(
+    client, db_session, regular_user_data, count_queries
+):
+    hackathon = _hackathon(db_session)
+    team = _team_with_history(db_session, hackathon, uuid.UUID(regular_user_data["id"]))
+    expected = {"id": str(team.id), "name": team.name, "member_count": 1}
+    etag = f'W/"{team.version}.'
+
+    count_queries.clear()
+    response = client.get(f"/teams/{team.id}", params={"fields": "name,member_count"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == expected
+    assert response.headers["ETag"].startswith(etag)
+    # The ETag, then the team
+    assert len(count_queries) == 2, count_queries
+    assert "description" not in count_queries[1]
+
+    count_queries.clear()
+    response = client.get(
+        "/teams/",
+        params={
+            "hackathon_id": str(hackathon.id),
+            "fields": "name",
+            "expand": "invites",
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    (card,) = response.json()
+    assert set(card) == {"id", "name", "invites"}
+    assert len(card["invites"]) == 1
+    assert not any("teams.members" in s for s in count_queries), count_queries
+    assert not any("teams.join_requests" in s for s in count_queries)
+
+
+def test_hackathon_fieldset_expands_on_request(client, db_session, count_queries):
+    hackathon = _hackathon(db_session)
+    expected = {"id": str(hackathon.id), "name": hackathon.name}
+
+    count_queries.clear()
+    response = client.get(f"/hackathons/{hackathon.id}", params={"fields": "name"})
+    assert response.json() == expected
+    assert not any("hackathon_registrations" in s for s in count_queries)
+
+    response = client.get(
+        f"/hackathons/{hackathon.id}", params={"expand": "registrations"}
+    )
+    body = response.json()
+    assert body["registrations"] == [] and body["name"] == expected["name"]
+    assert "organizer" not in body
+
+    response = client.get("/hackathons/", params={"fields": "name", "limit": 1})
+    assert response.status_code == status.HTTP_200_OK
+    assert "X-Next-Cursor" in response.headers
+
+    response = client.get("/hackathons/", params={"expand": "teams"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,76 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+
+from app.models.hackathon import Hackathon
+from app.schemas.hackathon import HackathonMode, HackathonStatus
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+
+
+def test_cursor_roundtrip_keeps_column_types():
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    hackathon_id = uuid.uuid4()
+    cursor = encode_cursor(start, hackathon_id)
+    assert decode_cursor(cursor, (Hackathon.start_date, Hackathon.id)) == [
+        start,
+        hackathon_id,
+    ]
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/hackathons/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_hackathon_pages_are_disjoint_and_complete(client, db_session):
+    # Same start date for all rows so the id tie-breaker is exercised
+    start = datetime.now(timezone.utc) + timedelta(days=3650)
+    created = set()
+    for i in range(5):
+        hackathon = Hackathon(
+            name=f"Paged Hackathon {i} {uuid.uuid4()}",
+            start_date=start,
+            end_date=start + timedelta(days=2),
+            status=HackathonStatus.UPCOMING,
+            mode=HackathonMode.SOLO_ONLY,
+        )
+        db_session.add(hackathon)
+        db_session.commit()
+        created.add(str(hackathon.id))
+
+    seen = []
+    params = {"limit": 2, "status_filter": HackathonStatus.UPCOMING.value}
+    while True:
+        response = client.get("/hackathons/", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(h["id"] for h in page)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+        params["cursor"] = cursor
+
+    assert len(seen) == len(set(seen))
+    assert created <= set(seen)
+    everything = client.get("/hackathons/", params={"limit": 500}).json()
+    start_dates = [datetime.fromisoformat(h["start_date"]) for h in everything]
+    assert start_dates == sorted(start_dates, reverse=True)
+
+
+def test_list_users_is_paginated(client, auth_headers_for_admin_user):
+    first = client.get(
+        "/users/", params={"limit": 1}, headers=auth_headers_for_admin_user
+    )
+    assert first.status_code == status.HTTP_200_OK
+    assert len(first.json()) == 1
+    cursor = first.headers.get(NEXT_CURSOR_HEADER)
+    if cursor:
+        second = client.get(
+            "/users/",
+            params={"limit": 1, "cursor": cursor},
+            headers=auth_headers_for_admin_user,
+        )
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()[0]["id"] != first.json()[0]["id"]
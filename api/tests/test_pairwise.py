@@ -0,0 +1,185 @@
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from fastapi import status
+
+from app.models.hackathon import Hackathon
+from app.models.project import Project
+from app.models.team import Team, TeamMember
+from app.schemas.hackathon import HackathonMode, HackathonStatus, VotingType
+from app.schemas.team import TeamMemberRole
+from app.services import bradley_terry, pairwise_service
+
+
+def _simulate(strengths, n_comparisons, judges=3, liar=None, seed=0):
+    """Comparisons drawn from the BT model; judge `liar` always inverts."""
+    rng = np.random.default_rng(seed)
+    n = len(strengths)
+    a = rng.integers(0, n, n_comparisons)
+    b = (a + rng.integers(1, n, n_comparisons)) % n
+    p = 1 / (1 + np.exp(strengths[b] - strengths[a]))
+    a_wins = rng.uniform(size=n_comparisons) < p
+    judge = rng.integers(0, judges, n_comparisons)
+    if liar is not None:
+        a_wins = np.where(judge == liar, ~a_wins, a_wins)
+    return np.where(a_wins, a, b), np.where(a_wins, b, a), judge
+
+
+def test_fit_recovers_order_and_discounts_unreliable_judge():
+    strengths = np.linspace(-2, 2, 8)
+    winners, losers, judges = _simulate(strengths, 3000, judges=4, liar=3)
+    result = bradley_terry.fit(winners, losers, judges, n_items=8, n_judges=4)
+    assert list(np.argsort(result.log_strength)) == list(range(8))
+    assert result.reliability[3] < 0.5 < result.reliability[:3].min()
+
+
+def test_warm_start_converges_faster():
+    strengths = np.linspace(-1, 1, 20)
+    winners, losers, judges = _simulate(strengths, 2000)
+    cold = bradley_terry.fit(winners[:-10], losers[:-10], judges[:-10], 20, 3)
+    warm = bradley_terry.fit(
+        winners,
+        losers,
+        judges,
+        20,
+        3,
+        init_log_strength=cold.log_strength,
+        init_reliability=cold.reliability,
+    )
+    full = bradley_terry.fit(winners, losers, judges, 20, 3)
+    assert full.converged
+    assert warm.iterations < full.iterations
+    assert warm.log_strength == pytest.approx(full.log_strength, abs=1e-3)
+
+
+def test_select_pair_skips_compared_and_ineligible():
+    result = bradley_terry.fit([], [], [], n_items=3, n_judges=0)
+    eligible = np.array([True, True, False])
+    pair = bradley_terry.select_pair(result, eligible, np.array([], dtype=np.int64))
+    assert sorted(pair) == [0, 1]
+    compared = np.array([0 * 3 + 1])
+    assert bradley_terry.select_pair(result, eligible, compared) is None
+
+
+def test_cached_fit_follows_replaced_comparisons():
+    hackathon_id = uuid.uuid4()
+    p1, p2, p3 = projects = sorted(uuid.uuid4() for _ in range(3))
+    j1, j2 = uuid.uuid4(), uuid.uuid4()
+    rows = [
+        (p1, p2, j1, uuid.uuid4()),
+        (p1, p3, j1, uuid.uuid4()),
+        (p2, p3, j2, uuid.uuid4()),
+    ]
+    _, first = pairwise_service.fit_hackathon(hackathon_id, projects, rows)
+    _, again = pairwise_service.fit_hackathon(hackathon_id, projects, rows)
+    assert again is first
+    assert first.log_strength[1] > first.log_strength[2]
+
+    # j2 is deleted (with their comparison) and another judge disagrees: same count
+    rows[2] = (p3, p2, uuid.uuid4(), uuid.uuid4())
+    _, refit = pairwise_service.fit_hackathon(hackathon_id, projects, rows)
+    assert refit is not first
+    assert refit.log_strength[2] > refit.log_strength[1]
+
+
+@pytest.fixture
+def pairwise_hackathon(db_session, created_regular_user):
+    hackathon = Hackathon(
+        name=f"Pairwise Hackathon {uuid.uuid4()}",
+        start_date=datetime.now(),
+        end_date=datetime.now() + timedelta(days=2),
+        status=HackathonStatus.ACTIVE,
+        mode=HackathonMode.SOLO_ONLY,
+        voting_type=VotingType.pairwise.value,
+        judging_criteria=[{"name": "Overall", "description": "Which is better?"}],
+    )
+    db_session.add(hackathon)
+    db_session.commit()
+    for i in range(2):
+        db_session.add(
+            Project(
+                name=f"Pairwise Project {i} {uuid.uuid4()}",
+                hackathon_id=hackathon.id,
+                owner_id=created_regular_user.id,
+            )
+        )
+    db_session.commit()
+    return hackathon
+
+
+def test_pairwise_round_trip(client, auth_headers_for_judge_user, pairwise_hackathon):
+    base = f"/judging/pairwise/{pairwise_hackathon.id}"
+    response = client.get(f"{base}/next-pair", headers=auth_headers_for_judge_user)
+    assert response.status_code == status.HTTP_200_OK
+    pair = response.json()
+    assert pair["prompt"] == "Which is better?"
+
+    comparison = {"winner_id": pair["project_b_id"], "loser_id": pair["project_a_id"]}
+    response = client.post(
+        f"{base}/comparisons", headers=auth_headers_for_judge_user, json=comparison
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    duplicate = client.post(
+        f"{base}/comparisons",
+        headers=auth_headers_for_judge_user,
+        json={"winner_id": pair["project_a_id"], "loser_id": pair["project_b_id"]},
+    )
+    assert duplicate.status_code == status.HTTP_400_BAD_REQUEST
+
+    # The only pair has been answered by this judge
+    response = client.get(f"{base}/next-pair", headers=auth_headers_for_judge_user)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    ranking = client.get(f"{base}/ranking").json()
+    assert ranking[0]["project_id"] == pair["project_b_id"]
+    assert ranking[0]["comparisons"] == 1
+
+
+def test_judges_never_compare_their_teams_projects(
+    client,
+    db_session,
+    auth_headers_for_judge_user,
+    created_judge_user,
+    created_regular_user,
+    pairwise_hackathon,
+):
+    team = Team(
+        name=f"Pairwise Team {uuid.uuid4()}",
+        hackathon_id=pairwise_hackathon.id,
+        members=[TeamMember(user_id=created_judge_user.id, role=TeamMemberRole.member)],
+    )
+    db_session.add(team)
+    db_session.commit()
+    team_project = Project(
+        name=f"Pairwise Team Project {uuid.uuid4()}",
+        hackathon_id=pairwise_hackathon.id,
+        owner_id=created_regular_user.id,
+        team_id=team.id,
+    )
+    db_session.add(team_project)
+    db_session.commit()
+
+    base = f"/judging/pairwise/{pairwise_hackathon.id}"
+    response = client.get(f"{base}/next-pair", headers=auth_headers_for_judge_user)
+    assert response.status_code == status.HTTP_200_OK
+    pair = response.json()
+    assert str(team_project.id) not in (pair["project_a_id"], pair["project_b_id"])
+
+    response = client.post(
+        f"{base}/comparisons",
+        headers=auth_headers_for_judge_user,
+        json={"winner_id": str(team_project.id), "loser_id": pair["project_a_id"]},
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_pairwise_requires_pairwise_voting_type(
+    client, auth_headers_for_judge_user, test_hackathon
+):
+    response = client.get(
+        f"/judging/pairwise/{test_hackathon.id}/next-pair",
+        headers=auth_headers_for_judge_user,
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,41 @@
+from fastapi import status
+
+from app.query_stats import (
+    N_PLUS_ONE_HEADER,
+    QUERY_COUNT_HEADER,
+    QUERY_TIME_HEADER,
+    RequestQueryStats,
+)
+
+
+def test_repeated_statement_shapes_are_flagged():
+    stats = RequestQueryStats()
+    stats.record("SELECT 1", 0.001, 1)
+    for _ in range(6):
+        stats.record("SELECT * FROM auth.users WHERE id = %(id)s", 0.002, 1)
+    assert stats.count == 7
+    assert stats.rows == 7
+    assert stats.suspected_n_plus_one(threshold=5) == [
+        ("SELECT * FROM auth.users WHERE id = %(id)s", 6)
+    ]
+    assert stats.headers()[N_PLUS_ONE_HEADER] == "1"
+
+
+def test_headers_report_request_statements(client):
+    response = client.get("/hackathons/", params={"limit": 5})
+    assert response.status_code == status.HTTP_200_OK
+    assert int(response.headers[QUERY_COUNT_HEADER]) >= 1
+    assert response.headers[QUERY_TIME_HEADER].endswith("ms")
+
+
+def test_hot_endpoints_stay_within_query_budget(
+    client, auth_headers_for_regular_user, test_hackathon, query_budget
+):
+    # hackathons, organizers, organizer roles, registrations
+    query_budget(client.get("/hackathons/"), 4)
+    query_budget(client.get(f"/hackathons/{test_hackathon.id}"), 4)
+    # user, roles
+    query_budget(client.get("/users/me", headers=auth_headers_for_regular_user), 2)
+    # teams, members, member users, their roles, join requests, invites
+    teams = client.get("/teams/", params={"hackathon_id": str(test_hackathon.id)})
+    query_budget(teams, 6)
@@ -0,0 +1,156 @@
+import threading
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.hackathon_registration import (
+    REGISTERED,
+    WAITLISTED,
+    HackathonRegistration,
+)
+from app.models.project import Project
+from app.models.team import Team, TeamMember
+from app.models.user import User
+from app.schemas.hackathon import ParticipantRegistrationCreate
+from app.schemas.team import TeamMemberRole
+from app.services import registration_service
+
+
+@pytest.fixture
+def participants(db_session):
+    users = [
+        User(
+            email=f"reg_{n}_{uuid.uuid4()}@example.com",
+            username=f"reg_{n}_{uuid.uuid4()}",
+            hashed_password="x",
+        )
+        for n in range(12)
+    ]
+    db_session.add_all(users)
+    db_session.commit()
+    yield [user.id for user in users]
+    for user in users:
+        db_session.delete(user)
+    db_session.commit()
+
+
+def _register_concurrently(session_factory, hackathon_id, requests):
+    """Run (user_id, registration) pairs in parallel; returns statuses or errors."""
+    results = []
+    start = threading.Barrier(len(requests))
+
+    def register(user_id, registration_in):
+        with session_factory() as db:
+            current_user = db.get(User, user_id)
+            start.wait()
+            try:
+                registration = registration_service.register(
+                    db, hackathon_id, registration_in, current_user
+                )
+                results.append(registration.status)
+            except HTTPException as e:
+                results.append(e.status_code)
+
+    threads = [threading.Thread(target=register, args=args) for args in requests]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def _cleanup(db_session, hackathon_id):
+    registrations = (
+        db_session.query(HackathonRegistration)
+        .filter(HackathonRegistration.hackathon_id == hackathon_id)
+        .all()
+    )
+    project_ids = [registration.project_id for registration in registrations]
+    for registration in registrations:
+        db_session.delete(registration)
+    db_session.flush()
+    db_session.query(Project).filter(Project.id.in_(project_ids)).delete()
+    db_session.commit()
+
+
+def test_concurrent_duplicates_register_once(
+    db_session, session_factory, test_hackathon, participants
+):
+    user_id = participants[0]
+    team = Team(
+        name=f"Reg Team {uuid.uuid4()}",
+        hackathon_id=test_hackathon.id,
+        members=[TeamMember(user_id=user_id, role=TeamMemberRole.owner)],
+    )
+    db_session.add(team)
+    db_session.commit()
+    hackathon_id = test_hackathon.id
+    # The same user solo and as the team's only member, four times each
+    requests = [
+        (user_id, ParticipantRegistrationCreate(user_id=user_id)),
+        (user_id, ParticipantRegistrationCreate(team_id=team.id)),
+    ] * 4
+
+    results = _register_concurrently(session_factory, hackathon_id, requests)
+    assert sorted(results, key=str) == [400] * 7 + [REGISTERED]
+    db_session.expire_all()
+    assert test_hackathon.registration_count == 1
+
+    _cleanup(db_session, hackathon_id)
+    db_session.delete(team)
+    db_session.commit()
+
+
+def test_capacity_waitlists_and_promotes(
+    db_session, session_factory, test_hackathon, participants
+):
+    test_hackathon.max_participants = 5
+    db_session.commit()
+    hackathon_id = test_hackathon.id
+    requests = [
+        (user_id, ParticipantRegistrationCreate(user_id=user_id))
+        for user_id in participants
+    ]
+
+    results = _register_concurrently(session_factory, hackathon_id, requests)
+    assert results.count(REGISTERED) == 5
+    assert results.count(WAITLISTED) == 7
+    db_session.expire_all()
+    assert test_hackathon.registration_count == 5
+
+    registered = (
+        db_session.query(HackathonRegistration)
+        .filter(
+            HackathonRegistration.hackathon_id == hackathon_id,
+            HackathonRegistration.status == REGISTERED,
+        )
+        .first()
+    )
+    first_waitlisted = (
+        db_session.query(HackathonRegistration)
+        .filter(
+            HackathonRegistration.hackathon_id == hackathon_id,
+            HackathonRegistration.status == WAITLISTED,
+        )
+        .order_by(HackathonRegistration.registered_at, HackathonRegistration.id)
+        .first()
+    )
+    project_id = registered.project_id
+    registration_service.withdraw(
+        db_session, hackathon_id, db_session.get(User, registered.user_id)
+    )
+    db_session.expire_all()
+    assert first_waitlisted.status == REGISTERED
+    assert test_hackathon.registration_count == 5
+
+    # Lifting the limit lets the rest in
+    test_hackathon.max_participants = None
+    db_session.flush()
+    assert registration_service.promote_waitlisted(db_session, hackathon_id) == 6
+    db_session.commit()
+    assert test_hackathon.registration_count == 11
+
+    _cleanup(db_session, hackathon_id)
+    db_session.query(Project).filter(Project.id == project_id).delete()
+    db_session.commit()
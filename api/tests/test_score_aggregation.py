@@ -0,0 +1,79 @@
+import uuid
+
+import numpy as np
+import pytest
+
+from app.services.score_aggregation import (
+    aggregate,
+    build_tensor,
+    normalize,
+    t_quantile,
+    tensor_from_rows,
+)
+
+
+def _rows(scores_by_judge, weights=(1, 1), max_score=10):
+    """{judge: {project: [score per criterion]}} -> flat score rows."""
+    criteria = [uuid.UUID(int=1000 + i) for i in range(len(weights))]
+    rows = []
+    for judge, by_project in scores_by_judge.items():
+        for project, scores in by_project.items():
+            for criterion, weight, score in zip(criteria, weights, scores):
+                rows.append((project, judge, criterion, score, weight, max_score))
+    return rows
+
+
+P1, P2, P3 = (uuid.UUID(int=i) for i in (1, 2, 3))
+HARSH, LENIENT = uuid.UUID(int=10), uuid.UUID(int=11)
+
+
+def test_build_tensor_scatters_flat_rows():
+    rows = _rows({HARSH: {P1: [5, 10]}, LENIENT: {P2: [2, 4]}})
+    tensor = build_tensor(*zip(*rows))
+    assert tensor.values.shape == (2, 2, 2)
+    assert np.isnan(tensor.values).sum() == 4
+    p1, harsh = list(tensor.project_ids).index(P1), list(tensor.judge_ids).index(HARSH)
+    assert tensor.values[p1, harsh].tolist() == [0.5, 1.0]
+
+
+def test_zscore_removes_judge_leniency():
+    # Same opinion (P1 > P2 > P3), but LENIENT scores everything 5 points higher
+    rows = _rows(
+        {
+            HARSH: {P1: [4, 4], P2: [2, 2], P3: [0, 0]},
+            LENIENT: {P1: [9, 9], P2: [7, 7], P3: [5, 5]},
+        }
+    )
+    results = aggregate(tensor_from_rows(rows), "zscore")
+    assert [r.project_id for r in results] == [P1, P2, P3]
+    # Both judges agree exactly after normalization: zero-width intervals
+    assert all(r.ci_low == pytest.approx(r.ci_high) for r in results)
+    assert all(r.judge_count == 2 for r in results)
+
+
+def test_minmax_keeps_missing_scores_missing():
+    values = np.array([[[0.2, np.nan]], [[0.6, 1.0]]])
+    normalized = normalize(values, "minmax")
+    assert np.isnan(normalized[0, 0, 1])
+    assert normalized[0, 0, 0] == 0.0
+    assert normalized[1, 0, 1] == 1.0
+
+
+def test_criterion_weights_decide_between_projects():
+    rows = _rows({HARSH: {P1: [10, 0], P2: [0, 10]}}, weights=(3, 1))
+    results = aggregate(tensor_from_rows(rows), "none")
+    assert [r.project_id for r in results] == [P1, P2]
+    assert results[0].score == pytest.approx(0.75)
+    assert results[0].ci_low is None  # a single judge gives no interval
+
+
+def test_t_quantile_matches_tables():
+    assert t_quantile(0.975, np.array([1, 2, 4, 30])) == pytest.approx(
+        [12.706, 4.303, 2.776, 2.042], rel=0.01
+    )
+
+
+def test_unknown_method_and_empty_input():
+    with pytest.raises(ValueError):
+        normalize(np.zeros((1, 1, 1)), "rank")
+    assert aggregate(tensor_from_rows([])) == []
@@ -0,0 +1,101 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+from sqlalchemy import text
+
+from app.models.hackathon import Hackathon
+from app.models.project import Project
+from app.schemas.hackathon import HackathonStatus
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+def _hackathon(db_session, name, description="", **fields):
+    hackathon = Hackathon(
+        name=f"{name} {uuid.uuid4()}",
+        description=description,
+        start_date=datetime.now(),
+        end_date=datetime.now() + timedelta(days=7),
+        status=HackathonStatus.ACTIVE,
+        **fields,
+    )
+    db_session.add(hackathon)
+    db_session.commit()
+    return hackathon
+
+
+def test_search_hackathons_ranks_and_pages(client, db_session):
+    word = f"zq{uuid.uuid4().hex[:8]}"
+    in_name = _hackathon(db_session, f"{word} Challenge")
+    in_tags = _hackathon(db_session, "Tagged", tags=[word], category="Health")
+    in_description = _hackathon(db_session, "Described", f"All about {word} and more")
+    hidden = _hackathon(db_session, word, is_public=False)
+    ids = [str(h.id) for h in (in_name, in_tags, in_description)]
+
+    response = client.get("/search/hackathons", params={"q": word})
+    assert response.status_code == status.HTTP_200_OK
+    hits = response.json()
+    assert [hit["id"] for hit in hits] == ids
+    assert hits[0]["rank"] > hits[1]["rank"] > hits[2]["rank"]
+
+    first = client.get("/search/hackathons", params={"q": word, "limit": 2})
+    assert [hit["id"] for hit in first.json()] == ids[:2]
+    rest = client.get(
+        "/search/hackathons",
+        params={"q": word, "limit": 2, "cursor": first.headers[NEXT_CURSOR_HEADER]},
+    )
+    assert [hit["id"] for hit in rest.json()] == ids[2:]
+    assert NEXT_CURSOR_HEADER not in rest.headers
+
+    # Web search syntax: exclusions
+    response = client.get("/search/hackathons", params={"q": f"{word} -challenge"})
+    assert str(in_name.id) not in [hit["id"] for hit in response.json()]
+
+    for hackathon in (in_name, in_tags, in_description, hidden):
+        db_session.delete(hackathon)
+    db_session.commit()
+
+
+def test_search_projects_within_hackathon(client, db_session, created_regular_user):
+    word = f"zq{uuid.uuid4().hex[:8]}"
+    hackathon = _hackathon(db_session, "Project Search")
+    other = _hackathon(db_session, "Other Search")
+    projects = [
+        Project(
+            name=f"{word} robot",
+            description="Drives around",
+            hackathon_id=hackathon_id,
+            owner_id=created_regular_user.id,
+        )
+        for hackathon_id in (hackathon.id, other.id)
+    ]
+    db_session.add_all(projects)
+    db_session.commit()
+
+    response = client.get(
+        "/search/projects",
+        params={"q": f"{word} robots", "hackathon_id": str(hackathon.id)},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [hit["id"] for hit in response.json()] == [str(projects[0].id)]
+
+    for row in projects + [hackathon, other]:
+        db_session.delete(row)
+    db_session.commit()
+
+
+def test_search_users_is_fuzzy(
+    client, db_session, created_regular_user, auth_headers_for_admin_user
+):
+    has_trgm = db_session.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    ).first()
+    if not has_trgm:
+        pytest.skip("pg_trgm is not installed")
+    # A typo still finds the user
+    response = client.get(
+        "/search/users", params={"q": "partcipant"}, headers=auth_headers_for_admin_user
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert str(created_regular_user.id) in [hit["id"] for hit in response.json()]
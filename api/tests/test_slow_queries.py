@@ -0,0 +1,87 @@
+import uuid
+
+from fastapi import status
+
+from app.slow_queries import (
+    SlowQueryLog,
+    fingerprint,
+    normalize_statement,
+    parameter_shapes,
+    route_template,
+)
+
+
+def test_fingerprint_ignores_parameters_and_in_list_length():
+    a = "SELECT * FROM auth.users WHERE id IN (%(id_1_1)s, %(id_1_2)s)"
+    b = "SELECT *\n FROM auth.users WHERE id IN ($1, $2, $3)"
+    assert normalize_statement(a) == "SELECT * FROM auth.users WHERE id IN (?, ...)"
+    assert fingerprint(a) == fingerprint(b)
+
+
+def test_parameter_shapes_drop_values():
+    user_id = uuid.uuid4()
+    assert parameter_shapes({"id_1": user_id, "limit": 5}) == {
+        "id_1": "UUID",
+        "limit": "int",
+    }
+    assert parameter_shapes([{"a": "x"}, {"a": "y"}], executemany=True) == {
+        "executemany": 2,
+        "row": {"a": "str"},
+    }
+    assert route_template(f"GET /teams/{user_id}") == "GET /teams/{id}"
+
+
+def test_log_aggregates_by_fingerprint_and_evicts_cheapest():
+    log = SlowQueryLog(threshold_ms=10, max_fingerprints=2)
+    log.observe("SELECT 1 FROM a WHERE x = %(x)s", {"x": 1}, 0.005, False)
+    assert log.top() == []
+
+    log.observe("SELECT 1 FROM a WHERE x = %(x)s", {"x": 1}, 0.050, False)
+    log.observe("SELECT 1 FROM a WHERE x = %(x)s", {"x": 2}, 0.030, False)
+    log.observe("SELECT 1 FROM b", {}, 0.020, False)
+    log.observe("SELECT 1 FROM c", {}, 0.040, False)
+
+    top = log.top()
+    assert [q["count"] for q in top] == [2, 1]
+    assert top[0]["statement"] == "SELECT ? FROM a WHERE x = ?"
+    assert top[0]["max_ms"] == 50.0
+    assert all("FROM b" not in q["statement"] for q in top)
+
+
+def test_plan_is_captured_for_select(db_session):
+    log = SlowQueryLog(
+        threshold_ms=0, sample_rate=1.0, explain_engine=db_session.get_bind()
+    )
+    statement = "SELECT id FROM auth.users WHERE email = %(email)s"
+    entry = log.record(statement, {"email": "nobody@example.com"}, 1.0)
+    log._capture_plan(entry, statement, {"email": "nobody@example.com"})
+    assert entry.plan is not None and "actual time" in entry.plan
+
+
+def test_only_side_effect_free_selects_are_explained():
+    log = SlowQueryLog(threshold_ms=0, sample_rate=1.0, explain_engine=object())
+    entry = log.record("SELECT 1", {}, 1.0)
+    assert log._should_explain(entry, "SELECT id FROM a WHERE x = %(x)s", False)
+    for statement in [
+        "UPDATE a SET x = 1",
+        "SELECT id FROM a FOR UPDATE",
+        "SELECT id FROM a FOR NO KEY UPDATE",
+        "SELECT id FROM a FOR SHARE",
+        "SELECT id FROM a for key share skip locked",
+        "SELECT pg_advisory_xact_lock(%(key)s)",
+        "SELECT pg_try_advisory_lock(1)",
+        "SELECT pg_notify('leaderboard', %(payload)s)",
+        "SELECT nextval('seq')",
+    ]:
+        assert not log._should_explain(entry, statement, False), statement
+
+
+def test_slow_query_endpoint_requires_admin(
+    client, auth_headers_for_admin_user, auth_headers_for_regular_user
+):
+    response = client.get("/admin/slow-queries", headers=auth_headers_for_admin_user)
+    assert response.status_code == status.HTTP_200_OK
+    assert {"threshold_ms", "queries"} <= response.json().keys()
+
+    response = client.get("/admin/slow-queries", headers=auth_headers_for_regular_user)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
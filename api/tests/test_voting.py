@@ -0,0 +1,181 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.hackathon import Hackathon
+from app.models.judging import Vote, VoteTally
+from app.models.project import Project
+from app.schemas.hackathon import HackathonMode, HackathonStatus, VotingType
+from app.services import voting_service
+from app.services.voting_service import VoteBuffer, VotingConfig
+
+
+def _make_hackathon(db_session, owner, voting_type, **settings):
+    now = datetime.now(timezone.utc)
+    hackathon = Hackathon(
+        name=f"Voting Hackathon {uuid.uuid4()}",
+        start_date=now,
+        end_date=now + timedelta(days=2),
+        status=HackathonStatus.ACTIVE,
+        mode=HackathonMode.SOLO_ONLY,
+        voting_type=voting_type.value,
+        **settings,
+    )
+    db_session.add(hackathon)
+    db_session.commit()
+    projects = [
+        Project(
+            name=f"Voting Project {i} {uuid.uuid4()}",
+            hackathon_id=hackathon.id,
+            owner_id=owner.id,
+        )
+        for i in range(2)
+    ]
+    db_session.add_all(projects)
+    db_session.commit()
+    return hackathon, projects
+
+
+@pytest.fixture
+def anonymous_client(client):
+    # A client of its own, so the voter cookie does not leak between tests
+    return TestClient(app)
+
+
+def test_voting_window():
+    now = datetime.now(timezone.utc)
+    config = VotingConfig(
+        voting_type="public",
+        voting_start=now,
+        voting_end=now + timedelta(hours=1),
+        anonymous_votes=True,
+        allow_multiple_votes=False,
+        project_ids=frozenset(),
+        loaded_at=0.0,
+    )
+    assert config.is_open(now + timedelta(minutes=5))
+    assert not config.is_open(now - timedelta(seconds=1))
+    assert not config.is_open(now + timedelta(hours=1))
+
+
+def test_anonymous_vote_is_deduplicated_and_tallied(
+    anonymous_client, db_session, created_regular_user
+):
+    hackathon, projects = _make_hackathon(
+        db_session, created_regular_user, VotingType.public
+    )
+    url = f"/voting/{hackathon.id}/votes"
+    response = anonymous_client.post(url, json={"project_id": str(projects[0].id)})
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert "voter_id" in response.cookies
+
+    # One vote per hackathon unless allow_multiple_votes is set
+    again = anonymous_client.post(url, json={"project_id": str(projects[1].id)})
+    assert again.status_code == status.HTTP_400_BAD_REQUEST
+
+    tallies = anonymous_client.get(f"/voting/{hackathon.id}/tallies").json()
+    assert tallies == [{"project_id": str(projects[0].id), "votes": 1}]
+
+
+def test_users_voting_requires_login_and_allows_multiple(
+    anonymous_client,
+    db_session,
+    created_regular_user,
+    auth_headers_for_regular_user,
+):
+    hackathon, projects = _make_hackathon(
+        db_session,
+        created_regular_user,
+        VotingType.users,
+        allow_multiple_votes=True,
+        anonymous_votes=False,
+    )
+    url = f"/voting/{hackathon.id}/votes"
+    body = {"project_id": str(projects[0].id)}
+    assert anonymous_client.post(url, json=body).status_code == 401
+
+    for project in projects:
+        response = anonymous_client.post(
+            url,
+            json={"project_id": str(project.id)},
+            headers=auth_headers_for_regular_user,
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+    duplicate = anonymous_client.post(
+        url, json=body, headers=auth_headers_for_regular_user
+    )
+    assert duplicate.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_votes_outside_window_or_for_judged_hackathons_are_refused(
+    anonymous_client, db_session, created_regular_user
+):
+    closed, projects = _make_hackathon(
+        db_session,
+        created_regular_user,
+        VotingType.public,
+        voting_end=datetime.now(timezone.utc) - timedelta(minutes=1),
+    )
+    response = anonymous_client.post(
+        f"/voting/{closed.id}/votes", json={"project_id": str(projects[0].id)}
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    judged, projects = _make_hackathon(
+        db_session, created_regular_user, VotingType.judges_only
+    )
+    response = anonymous_client.post(
+        f"/voting/{judged.id}/votes", json={"project_id": str(projects[0].id)}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_flush_writes_votes_and_tallies(
+    anonymous_client, db_session, created_regular_user, async_session_factory
+):
+    hackathon, projects = _make_hackathon(
+        db_session, created_regular_user, VotingType.public
+    )
+    response = anonymous_client.post(
+        f"/voting/{hackathon.id}/votes", json={"project_id": str(projects[1].id)}
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+
+    assert asyncio.run(voting_service.buffer.flush(async_session_factory)) >= 1
+    assert voting_service.buffer.pending_tallies(hackathon.id) == {}
+    stored = db_session.query(Vote).filter(Vote.hackathon_id == hackathon.id).one()
+    assert stored.project_id == projects[1].id
+    assert stored.user_id is None
+    tally = db_session.get(VoteTally, projects[1].id)
+    db_session.refresh(tally)
+    assert tally.votes == 1
+
+
+class _StalledSession:
+    """Session factory whose sessions never open: the write hangs until cancelled."""
+
+    async def __aenter__(self):
+        await asyncio.Event().wait()
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def test_cancelled_flush_keeps_the_votes():
+    buffer = VoteBuffer()
+    buffer._pending.extend({"id": uuid.uuid4()} for _ in range(5))
+
+    async def cancel_mid_write():
+        flush = asyncio.create_task(buffer.flush(_StalledSession))
+        await asyncio.sleep(0)
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+
+    asyncio.run(cancel_mid_write())
+    assert len(buffer._pending) == 5
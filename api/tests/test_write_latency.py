@@ -0,0 +1,57 @@
+import uuid
+
+from fastapi import status
+
+from app import write_latency
+from app.models.user import User
+from app.write_latency import WriteLatencyLog, percentile, write_latency_log
+
+
+def test_percentiles_cover_the_recent_window(monkeypatch):
+    monkeypatch.setattr(write_latency, "WRITE_LATENCY_WINDOW", 100)
+    log = WriteLatencyLog()
+    for ms in range(1, 201):
+        log.record("PUT", "/teams/{team_id}", ms / 1000, 200)
+    log.record("GET", "/teams/", 5.0, 200)
+    log.record("PUT", "/teams/{team_id}", 0.001, 503)
+
+    (entry,) = log.top()
+    assert entry["route"] == "PUT /teams/{team_id}"
+    assert (entry["count"], entry["errors"]) == (201, 1)
+    assert entry["max_ms"] == 200
+    # The window holds 102..200 and the 1ms error, not the first hundred writes
+    assert entry["p50_ms"] == 150
+    assert entry["p99_ms"] == 199
+    assert percentile([], 95) == 0.0
+
+
+def test_least_used_route_is_evicted():
+    log = WriteLatencyLog(max_routes=2)
+    log.record("POST", "/a", 0.01, 201)
+    log.record("POST", "/a", 0.01, 201)
+    log.record("POST", "/b", 0.01, 201)
+    log.record("POST", "/c", 0.01, 201)
+    assert {e["route"] for e in log.top()} == {"POST /a", "POST /c"}
+
+
+def test_register_is_one_transaction_and_measured(client, db_session):
+    write_latency_log.reset()
+    name = f"latency_{uuid.uuid4().hex[:8]}"
+    response = client.post(
+        "/users/register",
+        json={"email": f"{name}@example.com", "username": name, "password": "pw123456"},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    body = response.json()
+    # created_at / updated_at are server defaults, returned by the INSERT itself
+    assert body["roles"] == ["participant"] and body["created_at"]
+    # existing email, INSERT user ... RETURNING, INSERT role
+    assert int(response.headers["X-DB-Queries"]) == 3
+
+    (entry,) = [
+        e for e in write_latency_log.top() if e["route"] == "POST /users/register"
+    ]
+    assert entry["count"] == 1 and entry["avg_queries"] == 3
+
+    db_session.delete(db_session.query(User).filter(User.username == name).one())
+    db_session.commit()
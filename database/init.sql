@@ -1,3 +1,6 @@
+-- Trigram matching for the fuzzy user search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Create schemas
 CREATE SCHEMA IF NOT EXISTS auth;
 CREATE SCHEMA IF NOT EXISTS projects;
@@ -5,9 +8,33 @@ CREATE SCHEMA IF NOT EXISTS teams;
 CREATE SCHEMA IF NOT EXISTS judging;
 CREATE SCHEMA IF NOT EXISTS hackathons;
 
+-- UUIDv7 (RFC 9562) primary keys: 48-bit Unix time in ms, then random bits, so
+-- new rows append to the right edge of the primary key index. Same layout as
+-- api/app/utils/ids.py, which generates the ids of rows inserted by the API.
+CREATE OR REPLACE FUNCTION uuid_generate_v7()
+RETURNS UUID AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(
+                        int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::BIGINT)
+                        FROM 3
+                    )
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::UUID;
+$$ LANGUAGE sql VOLATILE;
+
 -- Auth schema
 CREATE TABLE auth.users (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     email VARCHAR(255) NOT NULL UNIQUE,
     username VARCHAR(255) NOT NULL UNIQUE,
     hashed_password VARCHAR(100) NOT NULL,
@@ -26,7 +53,7 @@ CREATE TABLE auth.user_roles (
 );
 
 CREATE TABLE auth.sessions (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE,
     token VARCHAR(255) NOT NULL UNIQUE,
     expires_at TIMESTAMPTZ NOT NULL,
@@ -36,7 +63,7 @@ CREATE TABLE auth.sessions (
 
 -- Hackathons schema
 CREATE TABLE hackathons.hackathons (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     name VARCHAR(255) NOT NULL UNIQUE,
     description TEXT,
     start_date TIMESTAMPTZ NOT NULL,
@@ -47,6 +74,7 @@ CREATE TABLE hackathons.hackathons (
     category VARCHAR(64),
     tags JSONB DEFAULT '[]'::jsonb,
     max_team_size INTEGER,
+    max_participants INTEGER CHECK (max_participants > 0),
     min_team_size INTEGER,
     registration_deadline TIMESTAMPTZ,
     is_public BOOLEAN DEFAULT TRUE,
@@ -67,19 +95,34 @@ CREATE TABLE hackathons.hackathons (
     location VARCHAR(255),
     organizer_id UUID REFERENCES auth.users(id) ON DELETE SET NULL,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    version INTEGER NOT NULL DEFAULT 1,
+    registration_count INTEGER NOT NULL DEFAULT 0,
+    -- Full-text search document (api/app/routers/search.py)
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(category, '')), 'B') ||
+        setweight(jsonb_to_tsvector('english', coalesce(tags, '[]'::jsonb), '["string"]'), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED
 );
 
 -- Teams schema (All teams are hackathon-specific)
 CREATE TABLE teams.teams (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     hackathon_id UUID REFERENCES hackathons.hackathons(id) ON DELETE CASCADE NOT NULL,
     name VARCHAR(255) NOT NULL,
     description TEXT,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    version INTEGER NOT NULL DEFAULT 1,
+    member_count INTEGER NOT NULL DEFAULT 0,
     is_open BOOLEAN NOT NULL DEFAULT TRUE,
     status VARCHAR(50) NOT NULL DEFAULT 'active',
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED,
     UNIQUE(hackathon_id, name)
 );
 
@@ -92,7 +135,7 @@ CREATE TABLE teams.members (
 );
 
 CREATE TABLE teams.team_history (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     team_id UUID REFERENCES teams.teams(id) ON DELETE CASCADE,
     hackathon_id UUID REFERENCES hackathons.hackathons(id) ON DELETE CASCADE,
     name VARCHAR(255) NOT NULL,
@@ -103,7 +146,7 @@ CREATE TABLE teams.team_history (
 );
 
 CREATE TABLE teams.member_history (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     team_history_id UUID REFERENCES teams.team_history(id) ON DELETE CASCADE,
     user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE,
     role VARCHAR(50) NOT NULL,
@@ -133,7 +176,7 @@ CREATE TABLE teams.invites (
 
 -- Projects schema
 CREATE TABLE projects.templates (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     name VARCHAR(255) NOT NULL UNIQUE,
     description TEXT,
     tech_stack JSONB NOT NULL,
@@ -145,7 +188,7 @@ CREATE TABLE projects.templates (
 );
 
 CREATE TABLE projects.projects (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     project_template_id UUID REFERENCES projects.templates(id),
     name VARCHAR(255) NOT NULL,
     description TEXT,
@@ -185,11 +228,17 @@ CREATE TABLE projects.projects (
     owner_id UUID NOT NULL REFERENCES auth.users(id),
     team_id UUID REFERENCES teams.teams(id),
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    version INTEGER NOT NULL DEFAULT 1,
+    version_seq INTEGER NOT NULL DEFAULT 0,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
 );
 
 CREATE TABLE projects.submissions (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     project_id UUID REFERENCES projects.projects(id) ON DELETE CASCADE NOT NULL,
     user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE NOT NULL,
     content_type VARCHAR(50) NOT NULL,
@@ -201,7 +250,7 @@ CREATE TABLE projects.submissions (
 
 -- Judging schema
 CREATE TABLE judging.criteria (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     name VARCHAR(255) NOT NULL,
     description TEXT,
     max_score INTEGER NOT NULL,
@@ -211,7 +260,7 @@ CREATE TABLE judging.criteria (
 );
 
 CREATE TABLE judging.scores (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     project_id UUID REFERENCES projects.projects(id) ON DELETE CASCADE,
     criteria_id UUID REFERENCES judging.criteria(id) ON DELETE CASCADE,
     judge_id UUID REFERENCES auth.users(id) ON DELETE CASCADE,
@@ -219,11 +268,64 @@ CREATE TABLE judging.scores (
     comment TEXT,
     submitted_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    version INTEGER NOT NULL DEFAULT 1,
     UNIQUE (project_id, criteria_id, judge_id)
 );
 
+-- Per-project weighted totals, maintained incrementally by the score endpoints
+CREATE TABLE judging.leaderboard (
+    project_id UUID PRIMARY KEY REFERENCES projects.projects(id) ON DELETE CASCADE,
+    hackathon_id UUID NOT NULL REFERENCES hackathons.hackathons(id) ON DELETE CASCADE,
+    weighted_total NUMERIC NOT NULL DEFAULT 0,
+    weight_sum NUMERIC NOT NULL DEFAULT 0,
+    weighted_average NUMERIC GENERATED ALWAYS AS (weighted_total / NULLIF(weight_sum, 0)) STORED,
+    score_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Pairwise judging (voting_type 'pairwise'): one row per judge verdict
+CREATE TABLE judging.pairwise_comparisons (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
+    hackathon_id UUID NOT NULL REFERENCES hackathons.hackathons(id) ON DELETE CASCADE,
+    judge_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    winner_id UUID NOT NULL REFERENCES projects.projects(id) ON DELETE CASCADE,
+    loser_id UUID NOT NULL REFERENCES projects.projects(id) ON DELETE CASCADE,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT chk_pairwise_distinct CHECK (winner_id <> loser_id)
+);
+
+-- Per-judge review queues planned by app/services/judge_assignment.py
+CREATE TABLE judging.judge_assignments (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
+    hackathon_id UUID NOT NULL REFERENCES hackathons.hackathons(id) ON DELETE CASCADE,
+    judge_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    project_id UUID NOT NULL REFERENCES projects.projects(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_judge_assignment UNIQUE (judge_id, project_id)
+);
+
+-- Audience votes (voting_type users / public / mixed), written in batches
+CREATE TABLE judging.votes (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
+    hackathon_id UUID NOT NULL REFERENCES hackathons.hackathons(id) ON DELETE CASCADE,
+    project_id UUID NOT NULL REFERENCES projects.projects(id) ON DELETE CASCADE,
+    voter_key VARCHAR(64) NOT NULL,
+    ballot_id UUID NOT NULL,
+    user_id UUID REFERENCES auth.users(id) ON DELETE SET NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_vote_ballot UNIQUE (hackathon_id, voter_key, ballot_id)
+);
+
+CREATE TABLE judging.vote_tallies (
+    project_id UUID PRIMARY KEY REFERENCES projects.projects(id) ON DELETE CASCADE,
+    hackathon_id UUID NOT NULL REFERENCES hackathons.hackathons(id) ON DELETE CASCADE,
+    votes INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 CREATE TABLE hackathons.hackathon_registrations (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     hackathon_id UUID REFERENCES hackathons.hackathons(id) ON DELETE CASCADE NOT NULL,
     project_id UUID REFERENCES projects.projects(id) ON DELETE RESTRICT NOT NULL UNIQUE,
     user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE,
@@ -238,7 +340,7 @@ CREATE TABLE hackathons.hackathon_registrations (
 
 -- Create project versions table
 CREATE TABLE projects.project_versions (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v7(),
     project_id UUID NOT NULL REFERENCES projects.projects(id) ON DELETE CASCADE,
     version_number INTEGER NOT NULL,
     file_path VARCHAR(255) NOT NULL,
@@ -267,9 +369,49 @@ CREATE INDEX idx_hackathon_registrations_hackathon_id ON hackathons.hackathon_re
 CREATE INDEX idx_hackathon_registrations_project_id ON hackathons.hackathon_registrations(project_id);
 CREATE INDEX idx_hackathon_registrations_user_id ON hackathons.hackathon_registrations(user_id);
 CREATE INDEX idx_hackathon_registrations_team_id ON hackathons.hackathon_registrations(team_id);
+CREATE UNIQUE INDEX uq_registrations_hackathon_user ON hackathons.hackathon_registrations(hackathon_id, user_id) WHERE user_id IS NOT NULL;
+CREATE UNIQUE INDEX uq_registrations_hackathon_team ON hackathons.hackathon_registrations(hackathon_id, team_id) WHERE team_id IS NOT NULL;
+CREATE INDEX idx_registrations_waitlist ON hackathons.hackathon_registrations(hackathon_id, registered_at, id) WHERE status = 'waitlisted';
 CREATE INDEX idx_project_versions_project_id ON projects.project_versions(project_id);
 CREATE INDEX idx_project_versions_submitted_by ON projects.project_versions(submitted_by);
 
+-- Search (api/app/routers/search.py): full text and trigram user lookup
+CREATE INDEX idx_hackathons_search ON hackathons.hackathons USING GIN (search_vector);
+CREATE INDEX idx_projects_search ON projects.projects USING GIN (search_vector);
+CREATE INDEX idx_teams_search ON teams.teams USING GIN (search_vector);
+CREATE INDEX idx_users_username_trgm ON auth.users USING GIN (username gin_trgm_ops);
+CREATE INDEX idx_users_email_trgm ON auth.users USING GIN (email gin_trgm_ops);
+
+-- Hackathon list filters (GET /hackathons/?tag=&requirement=&category=)
+CREATE INDEX idx_hackathons_tags ON hackathons.hackathons USING GIN (tags jsonb_path_ops);
+CREATE INDEX idx_hackathons_requirements ON hackathons.hackathons USING GIN (requirements jsonb_path_ops);
+
+-- Keyset pagination: (sort column, id) per list endpoint
+CREATE INDEX idx_users_created_at_id ON auth.users(created_at, id);
+CREATE INDEX idx_hackathons_start_date_id ON hackathons.hackathons(start_date, id);
+CREATE INDEX idx_hackathons_status_start_date_id ON hackathons.hackathons(status, start_date, id);
+CREATE INDEX idx_hackathons_category_start_date_id ON hackathons.hackathons(category, start_date, id);
+CREATE INDEX idx_teams_hackathon_status_created_at_id ON teams.teams(hackathon_id, status, created_at, id);
+CREATE INDEX idx_project_templates_created_at_id ON projects.templates(created_at, id);
+CREATE INDEX idx_projects_created_at_id ON projects.projects(created_at, id);
+CREATE INDEX idx_projects_hackathon_created_at_id ON projects.projects(hackathon_id, created_at, id);
+CREATE INDEX idx_project_versions_project_created_at_id ON projects.project_versions(project_id, created_at, id);
+CREATE INDEX idx_criteria_created_at_id ON judging.criteria(created_at, id);
+
+-- Foreign-key filters of the membership / judging / submission lookups
+CREATE INDEX idx_projects_team_id ON projects.projects(team_id) WHERE team_id IS NOT NULL;
+CREATE INDEX idx_members_user_id ON teams.members(user_id);
+CREATE INDEX idx_submissions_project_id_id ON projects.submissions(project_id, id);
+CREATE INDEX idx_scores_judge_id_id ON judging.scores(judge_id, id);
+CREATE INDEX idx_join_requests_sender_id ON teams.join_requests(sender_id);
+CREATE INDEX idx_join_requests_team_pending ON teams.join_requests(team_id) WHERE status = 'pending';
+
+-- Ranking pages of GET /judging/results/hackathon/{id}
+CREATE INDEX idx_leaderboard_hackathon_average_project ON judging.leaderboard(hackathon_id, weighted_average, project_id);
+CREATE UNIQUE INDEX uq_pairwise_judge_pair ON judging.pairwise_comparisons(hackathon_id, judge_id, LEAST(winner_id, loser_id), GREATEST(winner_id, loser_id));
+CREATE INDEX idx_judge_assignments_hackathon_judge_position ON judging.judge_assignments(hackathon_id, judge_id, position);
+CREATE INDEX idx_vote_tallies_hackathon_votes ON judging.vote_tallies(hackathon_id, votes);
+
 -- Create functions
 CREATE OR REPLACE FUNCTION update_updated_at()
 RETURNS TRIGGER AS $$
@@ -0,0 +1,14 @@
+-- Composite (sort column, id) indexes backing the cursor pagination of the list
+-- endpoints. Fresh databases get them from init.sql; run this against existing
+-- ones. CONCURRENTLY avoids blocking writes, so run it outside a transaction:
+--   psql "$DATABASE_URL" -f database/migrations/001_keyset_pagination_indexes.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_at_id ON auth.users(created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_hackathons_start_date_id ON hackathons.hackathons(start_date, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_hackathons_status_start_date_id ON hackathons.hackathons(status, start_date, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_teams_hackathon_status_created_at_id ON teams.teams(hackathon_id, status, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_project_templates_created_at_id ON projects.templates(created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_projects_created_at_id ON projects.projects(created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_projects_hackathon_created_at_id ON projects.projects(hackathon_id, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_project_versions_project_created_at_id ON projects.project_versions(project_id, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_criteria_created_at_id ON judging.criteria(created_at, id);
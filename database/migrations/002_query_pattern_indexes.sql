@@ -0,0 +1,14 @@
+-- Indexes for the foreign-key filters the routers and services issue on every
+-- request (membership checks, a judge's scores, a project's submissions, join
+-- requests), as proposed by api/scripts/index_advisor.py against a seeded
+-- dataset. projects(hackathon_id) and teams(hackathon_id, status) are already
+-- served by the leading columns of the 001 keyset indexes. Fresh databases get
+-- these from init.sql; run this against existing ones, outside a transaction:
+--   psql "$DATABASE_URL" -f database/migrations/002_query_pattern_indexes.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_projects_team_id ON projects.projects(team_id) WHERE team_id IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_members_user_id ON teams.members(user_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_submissions_project_id ON projects.submissions(project_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_scores_judge_id ON judging.scores(judge_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_join_requests_sender_id ON teams.join_requests(sender_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_join_requests_team_pending ON teams.join_requests(team_id) WHERE status = 'pending';
@@ -0,0 +1,17 @@
+-- Materialized judging leaderboard (see app/services/leaderboard_service.py).
+-- Fresh databases get it from init.sql. On existing ones run this, then fill
+-- the table from the scores already submitted:
+--   psql "$DATABASE_URL" -f database/migrations/003_judging_leaderboard.sql
+--   python api/scripts/rebuild_leaderboard.py
+
+CREATE TABLE IF NOT EXISTS judging.leaderboard (
+    project_id UUID PRIMARY KEY REFERENCES projects.projects(id) ON DELETE CASCADE,
+    hackathon_id UUID NOT NULL REFERENCES hackathons.hackathons(id) ON DELETE CASCADE,
+    weighted_total NUMERIC NOT NULL DEFAULT 0,
+    weight_sum NUMERIC NOT NULL DEFAULT 0,
+    weighted_average NUMERIC GENERATED ALWAYS AS (weighted_total / NULLIF(weight_sum, 0)) STORED,
+    score_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_leaderboard_hackathon_average_project ON judging.leaderboard(hackathon_id, weighted_average, project_id);
@@ -0,0 +1,16 @@
+-- Pairwise-comparison judging (Hackathon.voting_type = 'pairwise'). Fresh
+-- databases get this from init.sql; run it against existing ones:
+--   psql "$DATABASE_URL" -f database/migrations/004_pairwise_comparisons.sql
+
+CREATE TABLE IF NOT EXISTS judging.pairwise_comparisons (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    hackathon_id UUID NOT NULL REFERENCES hackathons.hackathons(id) ON DELETE CASCADE,
+    judge_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    winner_id UUID NOT NULL REFERENCES projects.projects(id) ON DELETE CASCADE,
+    loser_id UUID NOT NULL REFERENCES projects.projects(id) ON DELETE CASCADE,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT chk_pairwise_distinct CHECK (winner_id <> loser_id)
+);
+
+-- A judge answers each unordered pair at most once
+CREATE UNIQUE INDEX IF NOT EXISTS uq_pairwise_judge_pair ON judging.pairwise_comparisons(hackathon_id, judge_id, LEAST(winner_id, loser_id), GREATEST(winner_id, loser_id));
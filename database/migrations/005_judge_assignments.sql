@@ -0,0 +1,15 @@
+-- Judge review queues (POST /judging/assignments/{hackathon_id}/plan). Fresh
+-- databases get this from init.sql; run it against existing ones:
+--   psql "$DATABASE_URL" -f database/migrations/005_judge_assignments.sql
+
+CREATE TABLE IF NOT EXISTS judging.judge_assignments (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    hackathon_id UUID NOT NULL REFERENCES hackathons.hackathons(id) ON DELETE CASCADE,
+    judge_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    project_id UUID NOT NULL REFERENCES projects.projects(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_judge_assignment UNIQUE (judge_id, project_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_judge_assignments_hackathon_judge_position ON judging.judge_assignments(hackathon_id, judge_id, position);
@@ -0,0 +1,23 @@
+-- Audience voting (POST /voting/{hackathon_id}/votes). Fresh databases get this
+-- from init.sql; run it against existing ones:
+--   psql "$DATABASE_URL" -f database/migrations/006_votes.sql
+
+CREATE TABLE IF NOT EXISTS judging.votes (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    hackathon_id UUID NOT NULL REFERENCES hackathons.hackathons(id) ON DELETE CASCADE,
+    project_id UUID NOT NULL REFERENCES projects.projects(id) ON DELETE CASCADE,
+    voter_key VARCHAR(64) NOT NULL,
+    ballot_id UUID NOT NULL,
+    user_id UUID REFERENCES auth.users(id) ON DELETE SET NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_vote_ballot UNIQUE (hackathon_id, voter_key, ballot_id)
+);
+
+CREATE TABLE IF NOT EXISTS judging.vote_tallies (
+    project_id UUID PRIMARY KEY REFERENCES projects.projects(id) ON DELETE CASCADE,
+    hackathon_id UUID NOT NULL REFERENCES hackathons.hackathons(id) ON DELETE CASCADE,
+    votes INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_vote_tallies_hackathon_votes ON judging.vote_tallies(hackathon_id, votes);
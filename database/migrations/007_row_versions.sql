@@ -0,0 +1,9 @@
+-- Row versions for optimistic concurrency control (If-Match / ETag on the PUT
+-- endpoints, see api/app/utils/concurrency.py). Fresh databases get this from
+-- init.sql; run it against existing ones:
+--   psql "$DATABASE_URL" -f database/migrations/007_row_versions.sql
+
+ALTER TABLE hackathons.hackathons ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE teams.teams ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE projects.projects ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE judging.scores ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
@@ -0,0 +1,49 @@
+-- Time-ordered UUIDv7 primary keys (see api/app/utils/ids.py). The API generates
+-- the ids itself; the column defaults only matter for rows inserted in SQL.
+-- Existing ids stay as they are. Fresh databases get this from init.sql; run it
+-- against existing ones:
+--   psql "$DATABASE_URL" -f database/migrations/008_uuid7_keys.sql
+
+CREATE OR REPLACE FUNCTION uuid_generate_v7()
+RETURNS UUID AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(
+                        int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::BIGINT)
+                        FROM 3
+                    )
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::UUID;
+$$ LANGUAGE sql VOLATILE;
+
+ALTER TABLE auth.users ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE auth.sessions ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE hackathons.hackathons ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE hackathons.hackathon_registrations ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE teams.teams ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE teams.team_history ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE teams.member_history ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE projects.templates ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE projects.projects ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE projects.project_versions ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE projects.submissions ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE judging.criteria ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE judging.scores ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE judging.pairwise_comparisons ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE judging.judge_assignments ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+ALTER TABLE judging.votes ALTER COLUMN id SET DEFAULT uuid_generate_v7();
+
+-- Keyset pages ordered by id within a judge / a project
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_scores_judge_id_id ON judging.scores(judge_id, id);
+DROP INDEX CONCURRENTLY IF EXISTS judging.idx_scores_judge_id;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_submissions_project_id_id ON projects.submissions(project_id, id);
+DROP INDEX CONCURRENTLY IF EXISTS projects.idx_submissions_project_id;
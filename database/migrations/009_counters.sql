@@ -0,0 +1,24 @@
+-- Denormalized counters maintained by the API (see api/app/counters.py), filled
+-- from the current rows. Fresh databases get the columns from init.sql; run it
+-- against existing ones:
+--   psql "$DATABASE_URL" -f database/migrations/009_counters.sql
+-- Later drift is corrected by api/scripts/reconcile_counters.py.
+
+ALTER TABLE teams.teams ADD COLUMN IF NOT EXISTS member_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE hackathons.hackathons ADD COLUMN IF NOT EXISTS registration_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE projects.projects ADD COLUMN IF NOT EXISTS version_seq INTEGER NOT NULL DEFAULT 0;
+
+UPDATE teams.teams t
+SET member_count = (SELECT count(*) FROM teams.members m WHERE m.team_id = t.id);
+
+UPDATE hackathons.hackathons h
+SET registration_count = (
+    SELECT count(*) FROM hackathons.hackathon_registrations r WHERE r.hackathon_id = h.id
+);
+
+UPDATE projects.projects p
+SET version_seq = (
+    SELECT coalesce(max(v.version_number), 0)
+    FROM projects.project_versions v
+    WHERE v.project_id = p.id
+);
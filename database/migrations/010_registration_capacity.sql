@@ -0,0 +1,25 @@
+-- Registration uniqueness and capacity (see api/app/services/registration_service.py).
+-- Fresh databases get this from init.sql; run it against existing ones:
+--   psql "$DATABASE_URL" -f database/migrations/010_registration_capacity.sql
+-- The unique indexes fail to build while duplicate registrations exist; remove
+-- those first.
+
+ALTER TABLE hackathons.hackathons ADD COLUMN IF NOT EXISTS max_participants INTEGER CHECK (max_participants > 0);
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_registrations_hackathon_user
+    ON hackathons.hackathon_registrations(hackathon_id, user_id) WHERE user_id IS NOT NULL;
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_registrations_hackathon_team
+    ON hackathons.hackathon_registrations(hackathon_id, team_id) WHERE team_id IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_registrations_waitlist
+    ON hackathons.hackathon_registrations(hackathon_id, registered_at, id) WHERE status = 'waitlisted';
+
+-- registration_count now counts the registered (not waitlisted) ones only
+UPDATE hackathons.hackathons h
+SET registration_count = (
+    SELECT count(*) FROM hackathons.hackathon_registrations r
+    WHERE r.hackathon_id = h.id AND r.status = 'registered'
+)
+WHERE registration_count <> (
+    SELECT count(*) FROM hackathons.hackathon_registrations r
+    WHERE r.hackathon_id = h.id AND r.status = 'registered'
+);
@@ -0,0 +1,54 @@
+-- Search (see api/app/routers/search.py): generated tsvector columns with GIN
+-- indexes, and trigram indexes for the fuzzy user lookup. Fresh databases get
+-- this from init.sql; run it against existing ones:
+--   psql "$DATABASE_URL" -f database/migrations/011_search.sql
+-- Adding a stored generated column rewrites the table; run it off-peak.
+-- pg_trgm ships with the standard contrib modules (CREATE needs a superuser or
+-- a trusted-extension capable role).
+-- Databases created before init.sql switched to JSONB may still hold the
+-- hackathon json columns as json; the hackathon search vector reads tags as
+-- JSONB, so they are converted first (also a table rewrite).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+DO $$
+DECLARE
+    col TEXT;
+BEGIN
+    FOREACH col IN ARRAY ARRAY['tags', 'requirements', 'custom_fields', 'judging_criteria'] LOOP
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = 'hackathons' AND table_name = 'hackathons'
+              AND column_name = col AND data_type = 'json'
+        ) THEN
+            EXECUTE format('ALTER TABLE hackathons.hackathons ALTER COLUMN %I DROP DEFAULT', col);
+            EXECUTE format(
+                'ALTER TABLE hackathons.hackathons ALTER COLUMN %I TYPE JSONB USING %I::jsonb',
+                col, col
+            );
+        END IF;
+    END LOOP;
+END $$;
+ALTER TABLE hackathons.hackathons ALTER COLUMN tags SET DEFAULT '[]'::jsonb;
+ALTER TABLE hackathons.hackathons ALTER COLUMN requirements SET DEFAULT '[]'::jsonb;
+
+ALTER TABLE hackathons.hackathons ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(category, '')), 'B') ||
+    setweight(jsonb_to_tsvector('english', coalesce(tags, '[]'::jsonb), '["string"]'), 'B') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'C')
+) STORED;
+ALTER TABLE projects.projects ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+) STORED;
+ALTER TABLE teams.teams ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_hackathons_search ON hackathons.hackathons USING GIN (search_vector);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_projects_search ON projects.projects USING GIN (search_vector);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_teams_search ON teams.teams USING GIN (search_vector);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_username_trgm ON auth.users USING GIN (username gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_trgm ON auth.users USING GIN (email gin_trgm_ops);
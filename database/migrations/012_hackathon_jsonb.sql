@@ -0,0 +1,9 @@
+-- Filtering hackathons by tag, requirement and category (GET /hackathons/).
+-- The indexes need the JSONB columns; databases that still held them as json
+-- were converted by 011_search.sql. Fresh databases get all of this from
+-- init.sql:
+--   psql "$DATABASE_URL" -f database/migrations/012_hackathon_jsonb.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_hackathons_tags ON hackathons.hackathons USING GIN (tags jsonb_path_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_hackathons_requirements ON hackathons.hackathons USING GIN (requirements jsonb_path_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_hackathons_category_start_date_id ON hackathons.hackathons(category, start_date, id);